@@ -1,12 +1,13 @@
 import os
 from dotenv import load_dotenv
+from config.environments import get_environment_config, xdist_worker_index
 
 load_dotenv()
 
 
 class TestConfig:
     
-    YOUTUBE_BASE_URL = "https://www.youtube.com"
+    YOUTUBE_BASE_URL = os.getenv("YOUTUBE_BASE_URL") or get_environment_config().base_url
     
     DEFAULT_TIMEOUT = 10
     
@@ -24,10 +25,201 @@ class TestConfig:
     
     SCREENSHOTS_DIR = os.path.join(REPORTS_DIR, "screenshots")
     
+    RESULTS_DIR = os.path.join(REPORTS_DIR, "test_results")
+    
+    # Result records are appended in batches of this size, or after this many seconds
+    RESULTS_BATCH_SIZE = int(os.getenv("RESULTS_BATCH_SIZE", "50"))
+    
+    RESULTS_FLUSH_SECONDS = float(os.getenv("RESULTS_FLUSH_SECONDS", "5"))
+    
+    # Per-test timing history kept across builds, outside reports/ so
+    # report cleanup does not reset it
+    TIMING_HISTORY = os.getenv("TIMING_HISTORY", "true").lower() == "true"
+    
+    TIMING_HISTORY_DB = os.getenv("TIMING_HISTORY_DB", os.path.join(os.getcwd(), ".test_history", "timings.db"))
+    
+    TIMING_HISTORY_DAYS = int(os.getenv("TIMING_HISTORY_DAYS", "180"))
+    
+    # Hand xdist workers the longest tests first, using the timing history
+    DURATION_SCHEDULING = os.getenv("DURATION_SCHEDULING", "true").lower() == "true"
+    
+    # Passing runs averaged per test, and the estimate for a test with no history at all
+    SCHEDULER_HISTORY_RUNS = int(os.getenv("SCHEDULER_HISTORY_RUNS", "5"))
+    
+    SCHEDULER_DEFAULT_SECONDS = float(os.getenv("SCHEDULER_DEFAULT_SECONDS", "20"))
+    
+    # Live run metrics: Prometheus text on METRICS_PORT (0 keeps only the
+    # snapshots written to METRICS_DIR every METRICS_SNAPSHOT_SECONDS)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+    
+    METRICS_SNAPSHOT_SECONDS = float(os.getenv("METRICS_SNAPSHOT_SECONDS", "15"))
+    
+    METRICS_DIR = os.path.join(REPORTS_DIR, "metrics")
+    
+    # Lightweight HTML report: thumbnail width and count per failed test, and
+    # how much of the failure output each row keeps
+    REPORT_THUMBNAIL_WIDTH = int(os.getenv("REPORT_THUMBNAIL_WIDTH", "160"))
+    
+    REPORT_MAX_THUMBNAILS = int(os.getenv("REPORT_MAX_THUMBNAILS", "12"))
+    
+    REPORT_LOG_CHARS = int(os.getenv("REPORT_LOG_CHARS", "20000"))
+    
+    SCREENSHOT_WORKERS = int(os.getenv("SCREENSHOT_WORKERS", "2"))
+    
+    SCREENSHOT_MAX_PENDING = int(os.getenv("SCREENSHOT_MAX_PENDING", "8"))
+    
+    # Downscale screenshots wider than this in the background pipeline; 0 keeps full size
+    SCREENSHOT_MAX_WIDTH = int(os.getenv("SCREENSHOT_MAX_WIDTH", "0"))
+    
+    # Full-page captures stop at this many CSS pixels; longer pages are captured in bands of the tile height
+    FULL_PAGE_MAX_HEIGHT = int(os.getenv("FULL_PAGE_MAX_HEIGHT", "15000"))
+    
+    FULL_PAGE_TILE_HEIGHT = int(os.getenv("FULL_PAGE_TILE_HEIGHT", "4000"))
+    
+    EVIDENCE_ON_FAILURE = os.getenv("EVIDENCE_ON_FAILURE", "true").lower() == "true"
+    
+    EVIDENCE_DIR = os.path.join(REPORTS_DIR, "evidence")
+    
+    # Seconds to wait for evidence collectors; slower ones are left out of the bundle
+    EVIDENCE_TIME_BUDGET = float(os.getenv("EVIDENCE_TIME_BUDGET", "10"))
+    
+    EVIDENCE_NETWORK_EVENTS = int(os.getenv("EVIDENCE_NETWORK_EVENTS", "500"))
+    
+    # Downscaled screenshot after every page-object action, kept in memory and written only on failure
+    STEP_FRAMES = os.getenv("STEP_FRAMES", "false").lower() == "true"
+    
+    STEP_FRAMES_DIR = os.path.join(REPORTS_DIR, "step_frames")
+    
+    STEP_FRAMES_PER_TEST = int(os.getenv("STEP_FRAMES_PER_TEST", "20"))
+    
+    STEP_FRAMES_MAX_MB = int(os.getenv("STEP_FRAMES_MAX_MB", "64"))
+    
+    STEP_FRAME_WIDTH = int(os.getenv("STEP_FRAME_WIDTH", "480"))
+    
+    STEP_FRAME_QUALITY = int(os.getenv("STEP_FRAME_QUALITY", "50"))
+    
+    # Nested spans for page-object actions, written per test as Chrome trace-event JSON
+    TRACING = os.getenv("TRACING", "false").lower() == "true"
+    
+    TRACES_DIR = os.path.join(REPORTS_DIR, "traces")
+    
+    TRACE_MAX_EVENTS = int(os.getenv("TRACE_MAX_EVENTS", "20000"))
+    
+    # "true"/"false" overrides the environment's reporting_config video_recording flag
+    VIDEO_RECORDING = os.getenv("VIDEO_RECORDING", "").lower()
+    
+    VIDEOS_DIR = os.path.join(REPORTS_DIR, "videos")
+    
+    VIDEO_FPS = int(os.getenv("VIDEO_FPS", "5"))
+    
+    VIDEO_SCALE = float(os.getenv("VIDEO_SCALE", "0.5"))
+    
+    VIDEO_QUALITY = int(os.getenv("VIDEO_QUALITY", "60"))
+    
+    # Only the last this-many seconds of each test are kept in memory
+    VIDEO_BUFFER_SECONDS = int(os.getenv("VIDEO_BUFFER_SECONDS", "30"))
+    
+    ARTIFACT_MANIFEST = os.getenv("ARTIFACT_MANIFEST", os.path.join(REPORTS_DIR, "artifacts.db"))
+    
+    # Artifact retention; 0 disables a limit
+    RETENTION_DAYS = float(os.getenv("RETENTION_DAYS", "7"))
+    
+    RETENTION_MAX_MB = int(os.getenv("RETENTION_MAX_MB", "0"))
+    
+    RETENTION_MAX_PER_TEST = int(os.getenv("RETENTION_MAX_PER_TEST", "0"))
+    
+    ARTIFACT_STORE_DIR = os.getenv("ARTIFACT_STORE_DIR", os.path.join(REPORTS_DIR, "artifacts"))
+    
+    # Store a screenshot only once when it is visually identical to one already stored
+    ARTIFACT_NEAR_DUPLICATES = os.getenv("ARTIFACT_NEAR_DUPLICATES", "false").lower() == "true"
+    
+    ARTIFACT_DHASH_DISTANCE = int(os.getenv("ARTIFACT_DHASH_DISTANCE", "4"))
+    
+    # Convert a run's screenshots to WebP/JPEG variants and thumbnails at session end
+    POSTPROCESS_IMAGES = os.getenv("POSTPROCESS_IMAGES", "false").lower() == "true"
+    
+    IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "webp")
+    
+    IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "80"))
+    
+    THUMBNAIL_WIDTH = int(os.getenv("THUMBNAIL_WIDTH", "320"))
+    
+    IMAGE_MAX_WIDTH = int(os.getenv("IMAGE_MAX_WIDTH", "1280"))
+    
+    IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "0")) or os.cpu_count() or 1
+    
+    # Baselines are kept under version control, per browser
+    VISUAL_BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", os.path.join(os.getcwd(), "baselines"))
+    
+    VISUAL_DIFF_DIR = os.path.join(REPORTS_DIR, "visual_diffs")
+    
+    VISUAL_TILE_SIZE = int(os.getenv("VISUAL_TILE_SIZE", "64"))
+    
+    # Per-channel difference below which a pixel counts as unchanged (anti-aliasing noise)
+    VISUAL_PIXEL_THRESHOLD = int(os.getenv("VISUAL_PIXEL_THRESHOLD", "16"))
+    
+    VISUAL_MAX_DIFF_RATIO = float(os.getenv("VISUAL_MAX_DIFF_RATIO", "0.001"))
+    
+    VISUAL_UPDATE_BASELINES = os.getenv("VISUAL_UPDATE_BASELINES", "false").lower() == "true"
+    
+    VISUAL_WORKERS = int(os.getenv("VISUAL_WORKERS", "0")) or os.cpu_count() or 1
+    
     PARALLEL_TESTS = int(os.getenv("PARALLEL_TESTS", "1"))
     
     RETRY_COUNT = int(os.getenv("RETRY_COUNT", "1"))
     
+    CAPTURE_PAGE_METRICS = os.getenv("CAPTURE_PAGE_METRICS", "true").lower() == "true"
+    
+    EMULATION_PROFILE = os.getenv("EMULATION_PROFILE", "")
+    
+    REQUEST_BLOCK_PROFILE = os.getenv("REQUEST_BLOCK_PROFILE", "")
+    
+    # "http" runs tests marked http_tier without a browser; "browser" forces
+    # them back onto a WebDriver session
+    TEST_TIER = os.getenv("TEST_TIER", "http").lower()
+    
+    EMULATION_MATRIX = [name.strip() for name in os.getenv("EMULATION_MATRIX", "").split(",") if name.strip()]
+    
+    STANDIN_HOST = os.getenv("STANDIN_HOST", "127.0.0.1")
+    
+    STANDIN_PORT = int(os.getenv("STANDIN_PORT", "8765")) + xdist_worker_index()
+    
+    STANDIN_LATENCY_MS = float(os.getenv("STANDIN_LATENCY_MS", "0"))
+    
+    STANDIN_JITTER_MS = float(os.getenv("STANDIN_JITTER_MS", "0"))
+    
+    STANDIN_SEED = int(os.getenv("STANDIN_SEED", "42"))
+    
+    STANDIN_CATALOG_SIZE = int(os.getenv("STANDIN_CATALOG_SIZE", "500"))
+    
+    STANDIN_MEDIA_FILE = os.getenv("STANDIN_MEDIA_FILE", "")
+    
+    USE_PROFILE_TEMPLATE = os.getenv("USE_PROFILE_TEMPLATE", "false").lower() == "true"
+    
+    PROFILE_TEMPLATE_DIR = os.getenv("PROFILE_TEMPLATE_DIR", os.path.join(os.getcwd(), ".profile_templates"))
+    
+    PROFILE_TEMPLATE_MAX_AGE_HOURS = float(os.getenv("PROFILE_TEMPLATE_MAX_AGE_HOURS", "24"))
+    
+    PROFILE_TEMPLATE_SEARCH_TERM = os.getenv("PROFILE_TEMPLATE_SEARCH_TERM", "Python programming")
+    
+    REPLAY_MODE = os.getenv("REPLAY_MODE", "").lower()
+    
+    REPLAY_ARCHIVE = os.getenv("REPLAY_ARCHIVE", os.path.join(os.getcwd(), "recordings", "session.zip"))
+    
+    REPLAY_LATENCY = os.getenv("REPLAY_LATENCY", "recorded").lower()
+    
+    REPLAY_PROXY_PORT = int(os.getenv("REPLAY_PROXY_PORT", "8780")) + xdist_worker_index()
+    
+    # HTTPS is recorded by terminating TLS with certificates from a local CA
+    # kept in REPLAY_CA_DIR (needs the cryptography package)
+    REPLAY_INTERCEPT_HTTPS = os.getenv("REPLAY_INTERCEPT_HTTPS", "true").lower() == "true"
+    
+    REPLAY_CA_DIR = os.getenv("REPLAY_CA_DIR", os.path.join(os.getcwd(), ".replay_ca"))
+    
     @classmethod
     def ensure_directories_exist(cls):
         os.makedirs(cls.REPORTS_DIR, exist_ok=True)
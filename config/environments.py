@@ -2,12 +2,18 @@ import os
 from enum import Enum
 
 
+def xdist_worker_index() -> int:
+    worker = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+    return int(worker[2:]) if worker[2:].isdigit() else 0
+
+
 class Environment(Enum):
     LOCAL = "local"
     DEV = "dev"
     STAGING = "staging"
     PROD = "prod"
     CI = "ci"
+    STANDIN = "standin"
 
 
 class EnvironmentConfig:
@@ -23,10 +29,22 @@ class EnvironmentConfig:
             Environment.DEV: "https://www.youtube.com",
             Environment.STAGING: "https://www.youtube.com",
             Environment.PROD: "https://www.youtube.com",
-            Environment.CI: "https://www.youtube.com"
+            Environment.CI: "https://www.youtube.com",
+            Environment.STANDIN: self._standin_url()
         }
         return urls.get(self.environment, "https://www.youtube.com")
     
+    @staticmethod
+    def _standin_url() -> str:
+        # Each xdist worker runs its own stand-in on the next port up
+        host = os.getenv("STANDIN_HOST", "127.0.0.1")
+        port = int(os.getenv("STANDIN_PORT", "8765")) + xdist_worker_index()
+        return f"http://{host}:{port}"
+    
+    @property
+    def is_standin(self) -> bool:
+        return self.environment == Environment.STANDIN
+    
     @property
     def timeout_config(self) -> dict:
         timeouts = {
@@ -59,6 +77,12 @@ class EnvironmentConfig:
                 "page_load": 60,
                 "video_load": 30,
                 "implicit_wait": 20
+            },
+            Environment.STANDIN: {
+                "element_wait": 5,
+                "page_load": 15,
+                "video_load": 5,
+                "implicit_wait": 5
             }
         }
         return timeouts.get(self.environment, timeouts[Environment.LOCAL])
@@ -90,6 +114,11 @@ class EnvironmentConfig:
                 "headless": True,
                 "window_size": (1920, 1080),
                 "browser": "chrome"
+            },
+            Environment.STANDIN: {
+                "headless": True,
+                "window_size": (1920, 1080),
+                "browser": "chrome"
             }
         }
         return configs.get(self.environment, configs[Environment.LOCAL])
@@ -116,6 +145,10 @@ class EnvironmentConfig:
             Environment.CI: {
                 "max_attempts": 3,
                 "delay": 3
+            },
+            Environment.STANDIN: {
+                "max_attempts": 1,
+                "delay": 0
             }
         }
         return retries.get(self.environment, retries[Environment.LOCAL])
@@ -142,6 +175,10 @@ class EnvironmentConfig:
             Environment.CI: {
                 "enabled": True,
                 "workers": 4
+            },
+            Environment.STANDIN: {
+                "enabled": True,
+                "workers": 4
             }
         }
         return parallel.get(self.environment, parallel[Environment.LOCAL])
@@ -178,10 +215,44 @@ class EnvironmentConfig:
                 "video_recording": False,
                 "html_report": True,
                 "allure_report": True
+            },
+            Environment.STANDIN: {
+                "screenshot_on_failure": True,
+                "video_recording": False,
+                "html_report": True,
+                "allure_report": False
             }
         }
         return reporting.get(self.environment, reporting[Environment.LOCAL])
     
+    @property
+    def emulation_profile(self) -> str:
+        # Named profile from utils.emulation_profiles; empty means unthrottled.
+        # The stand-in answers from localhost, so its timings only mean
+        # something over a user-like link
+        profiles = {
+            Environment.LOCAL: "",
+            Environment.DEV: "",
+            Environment.STAGING: "cable",
+            Environment.PROD: "cable",
+            Environment.CI: "cable",
+            Environment.STANDIN: "4G"
+        }
+        return profiles.get(self.environment, "")
+    
+    @property
+    def request_block_profile(self) -> str:
+        # Named blocklist from utils.request_blocking; empty means no blocking
+        profiles = {
+            Environment.LOCAL: "",
+            Environment.DEV: "",
+            Environment.STAGING: "ads",
+            Environment.PROD: "ads",
+            Environment.CI: "functional",
+            Environment.STANDIN: ""
+        }
+        return profiles.get(self.environment, "")
+    
     def get_all_configs(self) -> dict:
         return {
             "environment": self.env_name,
@@ -190,7 +261,9 @@ class EnvironmentConfig:
             "browser": self.browser_config,
             "retry": self.retry_config,
             "parallel": self.parallel_config,
-            "reporting": self.reporting_config
+            "reporting": self.reporting_config,
+            "emulation_profile": self.emulation_profile,
+            "request_block_profile": self.request_block_profile
         }
 
 
@@ -210,7 +283,8 @@ class EnvironmentTestData:
             Environment.DEV: common_terms + ["dev environment", "testing"],
             Environment.STAGING: common_terms + ["staging test", "pre-production"],
             Environment.PROD: common_terms + ["production test", "live"],
-            Environment.CI: common_terms + ["ci test", "automated"]
+            Environment.CI: common_terms + ["ci test", "automated"],
+            Environment.STANDIN: common_terms + ["standin test", "offline"]
         }
         
         return env_specific.get(environment, common_terms)
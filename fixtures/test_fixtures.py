@@ -6,6 +6,7 @@ from datetime import datetime
 from config.config import TestConfig
 from config.test_data import TestDataProvider
 from utils.test_helpers import TestDataHelpers, ValidationHelpers
+from utils.results_sink import ResultsSink
 
 
 class TestDataFixtures:
@@ -22,16 +23,8 @@ class TestDataFixtures:
     
     @staticmethod
     def save_test_results(test_name: str, results: Dict[str, Any]) -> None:
-        """Save test results for analysis"""
-        results_dir = os.path.join(TestConfig.REPORTS_DIR, "test_results")
-        os.makedirs(results_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{test_name}_{timestamp}.json"
-        filepath = os.path.join(results_dir, filename)
-        
-        with open(filepath, 'w') as file:
-            json.dump(results, file, indent=2)
+        """Append test results to this worker's results file"""
+        ResultsSink.append(dict(results, test_name=test_name))
 
 
 @pytest.fixture(scope="session")
@@ -93,6 +86,12 @@ def test_timeouts(youtube_test_data):
 @pytest.fixture(scope="function")
 def youtube_urls(youtube_test_data):
     """Provide YouTube URL configurations"""
+    if TestConfig.YOUTUBE_BASE_URL != "https://www.youtube.com":
+        return {
+            "base": TestConfig.YOUTUBE_BASE_URL,
+            "trending": f"{TestConfig.YOUTUBE_BASE_URL}/feed/trending",
+            "search_base": f"{TestConfig.YOUTUBE_BASE_URL}/results?search_query="
+        }
     return youtube_test_data.get("youtube_urls", {
         "base": "https://www.youtube.com",
         "trending": "https://www.youtube.com/feed/trending",
@@ -138,6 +137,10 @@ def performance_thresholds():
         "search_response_time": 5.0,  # seconds
         "video_load_time": 15.0,  # seconds
         "element_load_time": 3.0,  # seconds
+        "time_to_first_frame": 5.0,  # seconds
+        "stall_count": 3,
+        "stall_ratio": 0.1,  # fraction of the playback window
+        "dropped_frame_ratio": 0.05,  # fraction of decoded frames
     }
 
 
@@ -259,6 +262,11 @@ def environment_config():
             "base_url": "https://www.youtube.com",
             "timeout_multiplier": 1.5,
             "retry_count": 3
+        },
+        "standin": {
+            "base_url": TestConfig.YOUTUBE_BASE_URL,
+            "timeout_multiplier": 0.5,
+            "retry_count": 0
         }
     }
     
@@ -283,12 +291,15 @@ def session_cleanup():
     # Session-level cleanup
     print("\nCleaning up test session...")
     
-    # Clean old screenshots if configured
-    from utils.screenshot_utils import ScreenshotUtils
+    # Apply artifact retention from the manifest; bounded per session so a
+    # large backlog is worked off over several runs
+    from utils.artifact_manifest import ArtifactManifest
     try:
-        ScreenshotUtils.clean_old_screenshots(days_old=7)
+        result = ArtifactManifest.default().enforce_retention(limit=500)
+        if result["removed"]:
+            print(f"Removed {result['removed']} expired artifacts ({result['freed_bytes'] // 1024} KB)")
     except Exception as e:
-        print(f"Warning: Could not clean old screenshots: {e}")
+        print(f"Warning: Could not apply artifact retention: {e}")
 
 
 # Custom fixture for test reporting integration
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, WebDriverException
+)
+from utils.async_webdriver import AsyncWebDriver, AsyncWebElement
+from utils.wait_stats import WaitStats
+from utils.tracing import Tracer
+
+
+class AsyncBasePage:
+    """Asyncio counterpart of BasePage for AsyncWebDriver sessions.
+    
+    Lookups poll until the page timeout and return None/False/[] on timeout,
+    exactly like the synchronous page objects, but yield to the event loop
+    between polls instead of blocking a thread.
+    """
+    
+    POLL_INTERVAL = 0.25
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Tracer.instrument(cls)
+    
+    def __init__(self, driver: AsyncWebDriver, timeout: int = 10):
+        self.driver = driver
+        self.timeout = timeout
+    
+    async def wait_until(self, condition: Callable[[], Awaitable], timeout: Optional[float] = None):
+        started = time.monotonic()
+        deadline = started + (self.timeout if timeout is None else timeout)
+        if Tracer.enabled:
+            condition = Tracer.counting_retries(condition)
+        while True:
+            try:
+                result = await condition()
+                if result:
+                    WaitStats.add(time.monotonic() - started)
+                    return result
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            if time.monotonic() >= deadline:
+                WaitStats.add(time.monotonic() - started, timed_out=True)
+                return None
+            await asyncio.sleep(self.POLL_INTERVAL)
+    
+    async def navigate_to(self, url: str) -> None:
+        await self.driver.get(url)
+    
+    async def get_current_url(self) -> str:
+        return await self.driver.get_current_url()
+    
+    async def get_page_title(self) -> str:
+        return await self.driver.get_title()
+    
+    async def find_element(self, locator: tuple) -> Optional[AsyncWebElement]:
+        return await self.wait_until(lambda: self.driver.find_element(*locator))
+    
+    async def find_elements(self, locator: tuple) -> List[AsyncWebElement]:
+        return await self.wait_until(lambda: self.driver.find_elements(*locator)) or []
+    
+    async def find_clickable_element(self, locator: tuple) -> Optional[AsyncWebElement]:
+        async def clickable():
+            element = await self.driver.find_element(*locator)
+            if await element.is_displayed() and await element.is_enabled():
+                return element
+            return None
+        return await self.wait_until(clickable)
+    
+    async def click_element(self, locator: tuple) -> bool:
+        element = await self.find_clickable_element(locator)
+        if element:
+            await element.click()
+            return True
+        return False
+    
+    async def send_keys_to_element(self, locator: tuple, text: str) -> bool:
+        element = await self.find_element(locator)
+        if element:
+            await element.clear()
+            await element.send_keys(text)
+            return True
+        return False
+    
+    async def get_element_text(self, locator: tuple) -> str:
+        element = await self.find_element(locator)
+        return await element.get_text() if element else ""
+    
+    async def get_element_attribute(self, locator: tuple, attribute: str) -> str:
+        element = await self.find_element(locator)
+        return await element.get_attribute(attribute) if element else ""
+    
+    async def is_element_visible(self, locator: tuple) -> bool:
+        async def visible():
+            return await (await self.driver.find_element(*locator)).is_displayed()
+        return bool(await self.wait_until(visible))
+    
+    async def is_element_present(self, locator: tuple) -> bool:
+        try:
+            await self.driver.find_element(*locator)
+            return True
+        except NoSuchElementException:
+            return False
+    
+    async def wait_for_element_to_disappear(self, locator: tuple) -> bool:
+        async def invisible():
+            try:
+                return not await (await self.driver.find_element(*locator)).is_displayed()
+            except (NoSuchElementException, StaleElementReferenceException):
+                return True
+        return bool(await self.wait_until(invisible))
+    
+    async def scroll_to_element(self, locator: tuple) -> bool:
+        element = await self.find_element(locator)
+        if element:
+            await self.driver.execute_script("arguments[0].scrollIntoView();", element)
+            return True
+        return False
+    
+    async def scroll_to_bottom(self) -> None:
+        await self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+    
+    async def scroll_to_top(self) -> None:
+        await self.driver.execute_script("window.scrollTo(0, 0);")
+    
+    async def refresh_page(self) -> None:
+        await self.driver.refresh()
+    
+    async def take_screenshot(self, filename: str) -> bool:
+        try:
+            png = await self.driver.get_screenshot_as_png()
+        except WebDriverException:
+            return False
+        await asyncio.to_thread(self._write_file, filename, png)
+        return True
+    
+    @staticmethod
+    def _write_file(filename: str, data: bytes) -> None:
+        with open(filename, "wb") as file:
+            file.write(data)
+    
+    async def wait_for_page_load(self, timeout: int = None) -> bool:
+        async def complete():
+            return await self.driver.execute_script("return document.readyState") == "complete"
+        return bool(await self.wait_until(complete, timeout))
+
+
+Tracer.instrument(AsyncBasePage)
\ No newline at end of file
@@ -4,19 +4,70 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
+from config.config import TestConfig
+from utils.web_vitals import WebVitals, PageMetricsStore
+from utils.action_trail import ActionTrail
+from utils.step_frames import StepFrames
+from utils.wait_stats import WaitStats
+from utils.tracing import Tracer
 import time
 
 
 class BasePage:
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Tracer.instrument(cls)
+    
     def __init__(self, driver: WebDriver, timeout: int = 10):
         self.driver = driver
         self.wait = WebDriverWait(driver, timeout)
         self.timeout = timeout
+        self.navigation_metrics: List[Dict[str, Any]] = []
+    
+    def _record_action(self, action: str, target: Any = "", ok: bool = True,
+                       started: Optional[float] = None, detail: Optional[str] = None) -> None:
+        if isinstance(target, tuple):
+            target = ActionTrail.describe_locator(target)
+        entry = ActionTrail.record(self.driver, type(self).__name__, action, target, ok, started, detail)
+        if StepFrames.enabled:
+            StepFrames.capture(self.driver, entry)
+    
+    def _until(self, condition, timeout: Optional[int] = None):
+        wait = self.wait if timeout is None else WebDriverWait(self.driver, timeout)
+        if Tracer.enabled:
+            condition = Tracer.counting_retries(condition)
+        started = time.perf_counter()
+        timed_out = True
+        try:
+            result = wait.until(condition)
+            timed_out = False
+            return result
+        finally:
+            WaitStats.add(time.perf_counter() - started, timed_out)
     
     def navigate_to(self, url: str) -> None:
+        started = time.time()
+        if TestConfig.CAPTURE_PAGE_METRICS:
+            WebVitals.prepare(self.driver)
         self.driver.get(url)
+        self._record_action("navigate", url, started=started)
+        self.capture_navigation_metrics()
+    
+    def capture_navigation_metrics(self) -> Optional[Dict[str, Any]]:
+        if not TestConfig.CAPTURE_PAGE_METRICS:
+            return None
+        
+        entry = WebVitals.capture(self.driver)
+        if entry:
+            self.navigation_metrics.append(entry)
+            PageMetricsStore.record(entry)
+        return entry
+    
+    @property
+    def last_navigation_metrics(self) -> Optional[Dict[str, Any]]:
+        return self.navigation_metrics[-1] if self.navigation_metrics else None
     
     def get_current_url(self) -> str:
         return self.driver.current_url
@@ -24,38 +75,48 @@ class BasePage:
     def get_page_title(self) -> str:
         return self.driver.title
     
+    # Lookups are only recorded when they time out; successful ones would
+    # crowd the trail
     def find_element(self, locator: tuple) -> Optional[WebElement]:
+        started = time.time()
         try:
-            return self.wait.until(EC.presence_of_element_located(locator))
+            return self._until(EC.presence_of_element_located(locator))
         except TimeoutException:
+            self._record_action("find", locator, False, started)
             return None
     
     def find_elements(self, locator: tuple) -> List[WebElement]:
+        started = time.time()
         try:
-            return self.wait.until(EC.presence_of_all_elements_located(locator))
+            return self._until(EC.presence_of_all_elements_located(locator))
         except TimeoutException:
+            self._record_action("find_all", locator, False, started)
             return []
     
     def find_clickable_element(self, locator: tuple) -> Optional[WebElement]:
+        started = time.time()
         try:
-            return self.wait.until(EC.element_to_be_clickable(locator))
+            return self._until(EC.element_to_be_clickable(locator))
         except TimeoutException:
+            self._record_action("find_clickable", locator, False, started)
             return None
     
     def click_element(self, locator: tuple) -> bool:
+        started = time.time()
         element = self.find_clickable_element(locator)
         if element:
             element.click()
-            return True
-        return False
+        self._record_action("click", locator, element is not None, started)
+        return element is not None
     
     def send_keys_to_element(self, locator: tuple, text: str) -> bool:
+        started = time.time()
         element = self.find_element(locator)
         if element:
             element.clear()
             element.send_keys(text)
-            return True
-        return False
+        self._record_action("type", locator, element is not None, started, f"{len(text)} chars")
+        return element is not None
     
     def get_element_text(self, locator: tuple) -> str:
         element = self.find_element(locator)
@@ -66,10 +127,12 @@ class BasePage:
         return element.get_attribute(attribute) if element else ""
     
     def is_element_visible(self, locator: tuple) -> bool:
+        started = time.time()
         try:
-            self.wait.until(EC.visibility_of_element_located(locator))
+            self._until(EC.visibility_of_element_located(locator))
             return True
         except TimeoutException:
+            self._record_action("wait_visible", locator, False, started)
             return False
     
     def is_element_present(self, locator: tuple) -> bool:
@@ -80,18 +143,21 @@ class BasePage:
             return False
     
     def wait_for_element_to_disappear(self, locator: tuple) -> bool:
+        started = time.time()
         try:
-            self.wait.until(EC.invisibility_of_element_located(locator))
+            self._until(EC.invisibility_of_element_located(locator))
+            self._record_action("wait_gone", locator, True, started)
             return True
         except TimeoutException:
+            self._record_action("wait_gone", locator, False, started)
             return False
     
     def scroll_to_element(self, locator: tuple) -> bool:
         element = self.find_element(locator)
         if element:
             self.driver.execute_script("arguments[0].scrollIntoView();", element)
-            return True
-        return False
+        self._record_action("scroll_to", locator, element is not None)
+        return element is not None
     
     def scroll_to_bottom(self) -> None:
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
@@ -100,10 +166,14 @@ class BasePage:
         self.driver.execute_script("window.scrollTo(0, 0);")
     
     def refresh_page(self) -> None:
+        started = time.time()
         self.driver.refresh()
+        self._record_action("refresh", started=started)
+        self.capture_navigation_metrics()
     
     def switch_to_window(self, window_handle: str) -> None:
         self.driver.switch_to.window(window_handle)
+        self._record_action("switch_window", window_handle)
     
     def get_window_handles(self) -> List[str]:
         return self.driver.window_handles
@@ -118,10 +188,17 @@ class BasePage:
         if timeout is None:
             timeout = self.timeout
         
+        started = time.time()
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            self._until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete",
+                timeout
             )
+            self._record_action("wait_page_load", "", True, started)
             return True
         except TimeoutException:
-            return False
\ No newline at end of file
+            self._record_action("wait_page_load", "", False, started)
+            return False
+
+
+Tracer.instrument(BasePage)
\ No newline at end of file
@@ -1,6 +1,8 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from .base_page import BasePage
+from .async_base_page import AsyncBasePage
+from config.config import TestConfig
 
 
 class HomePage(BasePage):
@@ -20,7 +22,7 @@ class HomePage(BasePage):
     
     def __init__(self, driver: WebDriver):
         super().__init__(driver)
-        self.url = "https://www.youtube.com"
+        self.url = TestConfig.YOUTUBE_BASE_URL
     
     def open(self):
         self.navigate_to(self.url)
@@ -74,4 +76,44 @@ class HomePage(BasePage):
         return self.is_element_visible(self.YOUTUBE_LOGO)
     
     def is_search_box_visible(self) -> bool:
-        return self.is_element_visible(self.SEARCH_BOX)
\ No newline at end of file
+        return self.is_element_visible(self.SEARCH_BOX)
+
+
+class AsyncHomePage(AsyncBasePage):
+    
+    SEARCH_BOX = HomePage.SEARCH_BOX
+    SEARCH_BUTTON = HomePage.SEARCH_BUTTON
+    YOUTUBE_LOGO = HomePage.YOUTUBE_LOGO
+    TRENDING_LINK = HomePage.TRENDING_LINK
+    VIDEO_THUMBNAILS = HomePage.VIDEO_THUMBNAILS
+    VIDEO_TITLES = HomePage.VIDEO_TITLES
+    
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.url = TestConfig.YOUTUBE_BASE_URL
+    
+    async def open(self):
+        await self.navigate_to(self.url)
+        return await self.wait_for_page_load()
+    
+    async def search_for_video(self, search_term: str) -> bool:
+        if await self.send_keys_to_element(self.SEARCH_BOX, search_term):
+            return await self.click_element(self.SEARCH_BUTTON)
+        return False
+    
+    async def click_trending(self) -> bool:
+        return await self.click_element(self.TRENDING_LINK)
+    
+    async def get_video_titles(self) -> list:
+        titles = [await element.get_attribute("title") for element in await self.find_elements(self.VIDEO_TITLES)]
+        return [title for title in titles if title]
+    
+    async def click_first_video(self) -> bool:
+        videos = await self.find_elements(self.VIDEO_THUMBNAILS)
+        if videos:
+            await videos[0].click()
+            return True
+        return False
+    
+    async def is_youtube_logo_visible(self) -> bool:
+        return await self.is_element_visible(self.YOUTUBE_LOGO)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from .base_page import BasePage
+from .async_base_page import AsyncBasePage
 
 
 class SearchPage(BasePage):
@@ -105,4 +106,41 @@ class SearchPage(BasePage):
             if search_term_lower in description.lower():
                 return True
         
+        return False
+
+
+class AsyncSearchPage(AsyncBasePage):
+    
+    SEARCH_RESULTS = SearchPage.SEARCH_RESULTS
+    SEARCH_RESULT_TITLES = SearchPage.SEARCH_RESULT_TITLES
+    SEARCH_RESULT_THUMBNAILS = SearchPage.SEARCH_RESULT_THUMBNAILS
+    SEARCH_BOX = SearchPage.SEARCH_BOX
+    
+    async def get_search_results_count(self) -> int:
+        return len(await self.find_elements(self.SEARCH_RESULTS))
+    
+    async def has_search_results(self) -> bool:
+        return await self.get_search_results_count() > 0
+    
+    async def get_search_result_titles(self) -> list:
+        titles = [await element.get_attribute("title") for element in await self.find_elements(self.SEARCH_RESULT_TITLES)]
+        return [title for title in titles if title]
+    
+    async def click_first_search_result(self) -> bool:
+        return await self.click_search_result_by_index(0)
+    
+    async def click_search_result_by_index(self, index: int) -> bool:
+        thumbnails = await self.find_elements(self.SEARCH_RESULT_THUMBNAILS)
+        if 0 <= index < len(thumbnails):
+            await thumbnails[index].click()
+            return True
+        return False
+    
+    async def search_for_new_term(self, search_term: str) -> bool:
+        search_box = await self.find_element(self.SEARCH_BOX)
+        if search_box:
+            await search_box.clear()
+            await search_box.send_keys(search_term)
+            await search_box.submit()
+            return True
         return False
\ No newline at end of file
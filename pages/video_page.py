@@ -2,6 +2,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.keys import Keys
 from .base_page import BasePage
+from .async_base_page import AsyncBasePage
+from utils.playback_metrics import PlaybackMetricsCollector
+from utils.tracing import Tracer
+from typing import Optional
+import asyncio
 import time
 
 
@@ -162,8 +167,49 @@ class VideoPage(BasePage):
         return self.is_element_visible(self.COMMENTS_SECTION)
     
     def wait_for_video_to_load(self, timeout: int = 15) -> bool:
-        for _ in range(timeout):
+        for attempt in range(timeout):
             if self.is_element_visible(self.VIDEO_PLAYER):
                 return True
+            Tracer.annotate(retries=attempt + 1)
             time.sleep(1)
+        return False
+    
+    def attach_playback_metrics(self, sample_interval_ms: int = PlaybackMetricsCollector.DEFAULT_SAMPLE_INTERVAL_MS) -> Optional[PlaybackMetricsCollector]:
+        video_player = self.find_element(self.VIDEO_PLAYER)
+        if video_player:
+            return PlaybackMetricsCollector.attach(self.driver, video_player, sample_interval_ms)
+        return None
+
+
+class AsyncVideoPage(AsyncBasePage):
+    
+    VIDEO_PLAYER = VideoPage.VIDEO_PLAYER
+    VIDEO_TITLE = VideoPage.VIDEO_TITLE
+    RELATED_VIDEOS = VideoPage.RELATED_VIDEOS
+    
+    async def get_video_title(self) -> str:
+        return await self.get_element_text(self.VIDEO_TITLE)
+    
+    async def is_video_playing(self) -> bool:
+        video_player = await self.find_element(self.VIDEO_PLAYER)
+        if video_player:
+            return not await video_player.get_attribute("paused")
+        return False
+    
+    async def get_related_videos_count(self) -> int:
+        return len(await self.find_elements(self.RELATED_VIDEOS))
+    
+    async def click_related_video(self, index: int = 0) -> bool:
+        related_videos = await self.find_elements(self.RELATED_VIDEOS)
+        if 0 <= index < len(related_videos):
+            await related_videos[index].click()
+            return True
+        return False
+    
+    async def wait_for_video_to_load(self, timeout: int = 15) -> bool:
+        for attempt in range(timeout):
+            if await self.is_element_visible(self.VIDEO_PLAYER):
+                return True
+            Tracer.annotate(retries=attempt + 1)
+            await asyncio.sleep(1)
         return False
\ No newline at end of file
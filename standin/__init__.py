@@ -0,0 +1 @@
+# Standin package for the local YouTube stand-in server
\ No newline at end of file
@@ -0,0 +1,27 @@
+import argparse
+from standin.server import StandinServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local YouTube stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform +/- jitter around the latency")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the catalog and jitter")
+    parser.add_argument("--catalog-size", type=int, default=500)
+    parser.add_argument("--media-file", default=None, help="WebM file served for every watch page")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    
+    server = StandinServer(
+        host=args.host, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        seed=args.seed, catalog_size=args.catalog_size, media_file=args.media_file, verbose=args.verbose
+    )
+    server.start()
+    print(f"YouTube stand-in serving on {server.url} (Ctrl+C to stop)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,151 @@
+import random
+import re
+import zlib
+from typing import Any, Dict, List
+
+
+_TOPICS = [
+    "Python programming", "Selenium automation", "Web development", "Machine learning",
+    "JavaScript frameworks", "Docker containers", "CI/CD pipeline", "Test automation",
+    "React tutorial", "Node.js guide", "Data science", "Cloud computing", "Cybersecurity",
+    "Music", "Technology news", "Documentary", "Nature", "Travel", "Cooking", "Gaming",
+    "Education", "Science", "Sports highlights", "Short clip", "Music video", "Programming"
+]
+
+_TITLE_PATTERNS = [
+    "{topic} for beginners",
+    "Learn {topic} in {minutes} minutes",
+    "{topic} - full course",
+    "Top 10 {topic} tips",
+    "{topic} explained",
+    "The best {topic} of {year}",
+    "{topic} tutorial part {part}",
+    "Why {topic} matters",
+    "{topic} live session",
+    "Advanced {topic} techniques"
+]
+
+_CHANNEL_WORDS = [
+    "Academy", "Labs", "Studio", "Channel", "Hub", "Daily", "Explained", "Official", "TV", "Works"
+]
+
+_DESCRIPTION_PATTERNS = [
+    "In this video we walk through {topic} step by step.",
+    "Everything you need to know about {topic}, with examples.",
+    "A relaxed look at {topic} and where it is heading.",
+    "Questions about {topic}? This covers the most common ones."
+]
+
+_ID_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+
+def _format_views(views: int) -> str:
+    if views >= 1_000_000:
+        return f"{views / 1_000_000:.1f}M views"
+    if views >= 1_000:
+        return f"{views / 1_000:.0f}K views"
+    return f"{views} views"
+
+
+def _format_duration(seconds: int) -> str:
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class VideoCatalog:
+    """Deterministic catalog of fake videos used by the stand-in server.
+    
+    The same seed always produces the same catalog and the same search
+    results, so runs against the stand-in are comparable with each other.
+    """
+    
+    def __init__(self, seed: int = 42, size: int = 500):
+        self.seed = seed
+        self.size = size
+        self.videos = [self._make_video(random.Random(seed * 100003 + index), _TOPICS[index % len(_TOPICS)])
+                       for index in range(size)]
+        self._by_id = {video["id"]: video for video in self.videos}
+        self._search_cache: Dict[str, List[Dict[str, Any]]] = {}
+    
+    def _make_video(self, rng: random.Random, topic: str) -> Dict[str, Any]:
+        title = rng.choice(_TITLE_PATTERNS).format(
+            topic=topic,
+            minutes=rng.choice([5, 10, 15, 30, 60]),
+            year=rng.choice([2021, 2022, 2023, 2024]),
+            part=rng.randint(1, 12)
+        )
+        views = int(rng.lognormvariate(10, 2))
+        duration = rng.randint(15, 3 * 3600)
+        channel = f"{topic.split()[0]} {rng.choice(_CHANNEL_WORDS)}"
+        return {
+            "id": "".join(rng.choice(_ID_ALPHABET) for _ in range(11)),
+            "title": title,
+            "channel": channel,
+            "description": rng.choice(_DESCRIPTION_PATTERNS).format(topic=topic.lower()),
+            "views": views,
+            "views_text": _format_views(views),
+            "view_count_text": f"{views:,} views",
+            "duration": duration,
+            "duration_text": _format_duration(duration),
+            "age_text": f"{rng.randint(1, 11)} {rng.choice(['days', 'weeks', 'months', 'years'])} ago",
+            "likes": views // rng.randint(20, 60),
+            "topic": topic
+        }
+    
+    def get(self, video_id: str) -> Dict[str, Any]:
+        return self._by_id.get(video_id)
+    
+    def home_feed(self, offset: int = 0, limit: int = 24) -> List[Dict[str, Any]]:
+        return self.videos[offset:offset + limit]
+    
+    def trending(self, limit: int = 24) -> List[Dict[str, Any]]:
+        return sorted(self.videos, key=lambda video: video["views"], reverse=True)[:limit]
+    
+    def related(self, video_id: str, limit: int = 12) -> List[Dict[str, Any]]:
+        video = self.get(video_id)
+        if video is None:
+            return self.videos[:limit]
+        same_topic = [v for v in self.videos if v["topic"] == video["topic"] and v["id"] != video_id]
+        others = [v for v in self.videos if v["topic"] != video["topic"]]
+        return (same_topic + others)[:limit]
+    
+    def search(self, query: str, offset: int = 0, limit: int = 20, max_results: int = 200) -> List[Dict[str, Any]]:
+        key = query.strip().lower()
+        if key not in self._search_cache:
+            self._search_cache[key] = self._rank(query, max_results)
+        return self._search_cache[key][offset:offset + limit]
+    
+    def _rank(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        tokens = [token for token in re.split(r"\W+", query.lower()) if token]
+        if not tokens:
+            return []
+        
+        scored = []
+        for index, video in enumerate(self.videos):
+            haystack = f"{video['title']} {video['description']} {video['channel']}".lower()
+            score = sum(1 for token in tokens if token in haystack)
+            if score:
+                scored.append((-score, index, video))
+        matches = [video for _, _, video in sorted(scored)]
+        
+        # Pad with query-themed videos so every sensible query has a full
+        # scrollable result list, just like the real site
+        if len(matches) < max_results:
+            rng = random.Random(self.seed ^ zlib.crc32(query.lower().encode("utf-8")))
+            padding = [self._make_video(rng, query.strip()) for _ in range(max_results - len(matches))]
+            for video in padding:
+                self._by_id.setdefault(video["id"], video)
+            matches.extend(padding)
+        
+        return matches[:max_results]
+    
+    def suggestions(self, prefix: str, limit: int = 8) -> List[str]:
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        topics = [topic for topic in _TOPICS if topic.lower().startswith(prefix)]
+        topics += [topic for topic in _TOPICS if prefix in topic.lower() and topic not in topics]
+        return [topic.lower() for topic in topics][:limit]
\ No newline at end of file
@@ -0,0 +1,253 @@
+from html import escape
+from typing import Any, Dict, List
+from urllib.parse import quote_plus
+
+
+# Markup mirrors the ids, classes and aria labels targeted by the locators
+# in pages/home_page.py, pages/search_page.py and pages/video_page.py.
+
+_STYLE = """
+body { font-family: Roboto, Arial, sans-serif; margin: 0; background: #fff; color: #0f0f0f; }
+#masthead { display: flex; align-items: center; gap: 16px; height: 56px; padding: 0 16px; border-bottom: 1px solid #eee; }
+#logo { font-weight: bold; font-size: 20px; color: #f00; text-decoration: none; }
+#search-form { display: flex; flex: 1; max-width: 640px; position: relative; }
+#search-form input { flex: 1; height: 36px; padding: 0 8px; }
+#search-form ul[role=listbox] { position: absolute; top: 38px; left: 0; right: 40px; margin: 0; padding: 0;
+    list-style: none; background: #fff; border: 1px solid #ccc; }
+#search-form ul[role=listbox]:empty { display: none; }
+#search-form li { padding: 6px 8px; cursor: pointer; }
+#guide { display: flex; gap: 12px; padding: 8px 16px; }
+#contents { display: flex; flex-wrap: wrap; gap: 16px; padding: 16px; }
+#contents.list { flex-direction: column; }
+#dismissible { width: 320px; }
+#thumbnail { display: block; width: 320px; height: 180px; background: #ddd; }
+#thumbnail img { width: 320px; height: 180px; }
+#video-title { display: block; font-weight: 500; color: #0f0f0f; text-decoration: none; margin-top: 6px; }
+#watch { display: flex; gap: 24px; padding: 16px; }
+#primary { flex: 1; }
+#movie_player { position: relative; width: 854px; }
+.video-stream { width: 854px; height: 480px; background: #000; display: block; }
+.ytp-chrome-bottom { display: flex; gap: 8px; align-items: center; padding: 4px 0; }
+.ytp-progress-bar { height: 4px; width: 854px; background: #ccc; }
+.ytp-quality-menu { display: none; }
+#secondary { width: 400px; }
+#filters { display: none; padding: 8px 16px; }
+#filters.open { display: block; }
+"""
+
+_SCRIPT = """
+(function() {
+    var form = document.getElementById('search-form');
+    var box = form.querySelector('input[name=search_query]');
+    var list = form.querySelector('ul[role=listbox]');
+    form.addEventListener('submit', function(event) {
+        if (!box.value.trim()) { event.preventDefault(); }
+    });
+    box.addEventListener('input', function() {
+        fetch('/api/suggest?q=' + encodeURIComponent(box.value)).then(function(response) {
+            return response.json();
+        }).then(function(items) {
+            list.innerHTML = '';
+            items.forEach(function(text) {
+                var li = document.createElement('li');
+                li.textContent = text;
+                li.addEventListener('click', function() { box.value = text; form.submit(); });
+                list.appendChild(li);
+            });
+        });
+    });
+    
+    var contents = document.getElementById('contents');
+    if (contents && contents.dataset.feed) {
+        var loading = false;
+        window.addEventListener('scroll', function() {
+            if (loading || contents.dataset.done) { return; }
+            if (window.innerHeight + window.scrollY < document.body.scrollHeight - 400) { return; }
+            loading = true;
+            var offset = contents.querySelectorAll('#dismissible').length;
+            fetch(contents.dataset.feed + '&offset=' + offset).then(function(response) {
+                return response.text();
+            }).then(function(html) {
+                if (!html.trim()) { contents.dataset.done = '1'; }
+                contents.insertAdjacentHTML('beforeend', html);
+                loading = false;
+            });
+        });
+    }
+    
+    function toggle(id, first, second, onFirst, onSecond) {
+        var button = document.getElementById(id);
+        if (!button) { return; }
+        button.addEventListener('click', function() {
+            if (button.title === first) { button.title = second; onFirst(); }
+            else { button.title = first; onSecond(); }
+        });
+    }
+    
+    var video = document.querySelector('video.video-stream');
+    if (video) {
+        video.addEventListener('click', function() { video.paused ? video.play() : video.pause(); });
+        toggle('play-button', 'Play', 'Pause',
+            function() { video.play(); }, function() { video.pause(); });
+        toggle('mute-button', 'Mute', 'Unmute',
+            function() { video.muted = true; }, function() { video.muted = false; });
+        document.getElementById('volume').addEventListener('input', function(event) {
+            video.volume = event.target.value / 100;
+        });
+    }
+    
+    var filter = document.getElementById('filter-button');
+    if (filter) {
+        filter.addEventListener('click', function() {
+            document.getElementById('filters').classList.toggle('open');
+        });
+    }
+})();
+"""
+
+
+def _layout(title: str, body: str, query: str = "") -> str:
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{escape(title)}</title>
+<style>{_STYLE}</style>
+</head>
+<body>
+<div id="masthead">
+  <button aria-label="Guide">&#9776;</button>
+  <a id="logo" href="/" title="YouTube Home">YouTube</a>
+  <form id="search-form" action="/results" method="get" autocomplete="off">
+    <input name="search_query" type="text" placeholder="Search" value="{escape(query)}">
+    <button id="search-icon-legacy" type="submit" aria-label="Search">&#128269;</button>
+    <ul role="listbox"></ul>
+  </form>
+  <button id="voice-search-button" aria-label="Search with your voice">&#127908;</button>
+</div>
+<div id="guide">
+  <a href="/" title="Home">Home</a>
+  <a href="/feed/trending" title="Trending">Trending</a>
+  <a href="/feed/subscriptions" title="Subscriptions">Subscriptions</a>
+  <a href="/feed/library" title="Library">Library</a>
+  <a href="/feed/history" title="History">History</a>
+</div>
+{body}
+<script>{_SCRIPT}</script>
+</body>
+</html>"""
+
+
+def video_card(video: Dict[str, Any], with_description: bool = False) -> str:
+    href = f"/watch?v={video['id']}"
+    description = (
+        f'<span id="description-text">{escape(video["description"])}</span>' if with_description else ""
+    )
+    return f"""<div id="dismissible" class="style-scope ytd-video-renderer">
+  <a id="thumbnail" href="{href}"><img src="/thumbnail/{video['id']}.svg" alt="" loading="lazy"></a>
+  <div id="meta">
+    <a id="video-title" href="{href}" title="{escape(video['title'])}">{escape(video['title'])}</a>
+    <a class="yt-simple-endpoint style-scope yt-formatted-string" href="/channel/{quote_plus(video['channel'])}">{escape(video['channel'])}</a>
+    <div id="metadata-line">
+      <span class="style-scope ytd-video-meta-block">{video['views_text']}</span>
+      <span class="style-scope ytd-video-meta-block">{video['age_text']}</span>
+    </div>
+    {description}
+  </div>
+</div>"""
+
+
+def video_cards(videos: List[Dict[str, Any]], with_description: bool = False) -> str:
+    return "\n".join(video_card(video, with_description) for video in videos)
+
+
+def home_page(videos: List[Dict[str, Any]]) -> str:
+    body = f"""<div id="contents" data-feed="/api/feed?page=home">
+{video_cards(videos)}
+</div>"""
+    return _layout("YouTube", body)
+
+
+def trending_page(videos: List[Dict[str, Any]]) -> str:
+    body = f"""<h2>Trending</h2>
+<div id="contents">
+{video_cards(videos)}
+</div>"""
+    return _layout("Trending - YouTube", body)
+
+
+def feed_page(name: str) -> str:
+    body = f"""<div id="contents"><p>Sign in to see your {escape(name)}.</p></div>"""
+    return _layout(f"{name.title()} - YouTube", body)
+
+
+def results_page(query: str, videos: List[Dict[str, Any]]) -> str:
+    if videos:
+        results = video_cards(videos, with_description=True)
+    else:
+        results = '<div class="promo-title">No results found</div>'
+    body = f"""<div id="header">
+  <button id="filter-button" aria-label="Search filters">Filters</button>
+  <button aria-label="Sort by">Sort by</button>
+</div>
+<div id="filters"><a href="#">Upload date</a> <a href="#">Type</a> <a href="#">Duration</a></div>
+<div id="contents" class="list" data-feed="/api/results?search_query={quote_plus(query)}">
+{results}
+</div>"""
+    return _layout(f"{query} - YouTube", body, query)
+
+
+def watch_page(video: Dict[str, Any], related: List[Dict[str, Any]]) -> str:
+    body = f"""<div id="watch">
+  <div id="primary">
+    <div id="movie_player">
+      <video class="video-stream html5-main-video" src="/media/{video['id']}.webm" preload="auto" muted autoplay></video>
+      <div class="ytp-progress-bar" role="slider" aria-label="Seek slider"></div>
+      <div class="ytp-chrome-bottom">
+        <button id="play-button" title="Pause">&#9199;</button>
+        <button id="mute-button" title="Mute">&#128263;</button>
+        <input id="volume" type="range" min="0" max="100" value="100" aria-label="Volume">
+        <span class="ytp-time-duration">{video['duration_text']}</span>
+        <button title="Subtitles/closed captions">CC</button>
+        <button title="Playback speed">1x</button>
+        <button title="Settings">&#9881;</button>
+        <button title="Full screen">&#9974;</button>
+      </div>
+      <div class="ytp-quality-menu"></div>
+    </div>
+    <h1 class="title style-scope ytd-video-primary-info-renderer">{escape(video['title'])}</h1>
+    <div id="info">
+      <span class="view-count style-scope ytd-video-view-count-renderer">{video['view_count_text']}</span>
+      <div id="info-strings">{video['age_text']}</div>
+      <button aria-label="Like this video">&#128077; {video['likes']}</button>
+      <button aria-label="Dislike this video">&#128078;</button>
+      <button aria-label="Share">Share</button>
+      <button aria-label="Download">Download</button>
+    </div>
+    <div id="owner">
+      <a class="yt-simple-endpoint style-scope yt-formatted-string" href="/channel/{quote_plus(video['channel'])}">{escape(video['channel'])}</a>
+      <button aria-label="Subscribe to {escape(video['channel'])}.">Subscribe</button>
+    </div>
+    <div id="description">{escape(video['description'])}</div>
+    <div id="comments">
+      <h2>Comments</h2>
+      <div id="placeholder-area">Add a comment...</div>
+    </div>
+  </div>
+  <div id="secondary">
+{video_cards(related)}
+  </div>
+</div>"""
+    return _layout(f"{video['title']} - YouTube", body)
+
+
+def not_found_page() -> str:
+    return _layout("404 Not Found - YouTube", '<div id="contents"><p>This page isn\'t available.</p></div>')
+
+
+def thumbnail_svg(video: Dict[str, Any]) -> str:
+    hue = sum(ord(char) for char in video["id"]) % 360
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="320" height="180">
+<rect width="320" height="180" fill="hsl({hue},60%,45%)"/>
+<text x="12" y="168" fill="#fff" font-family="Arial" font-size="14">{escape(video['duration_text'])}</text>
+</svg>"""
\ No newline at end of file
@@ -0,0 +1,198 @@
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+from standin import pages
+from standin.catalog import VideoCatalog
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    
+    server_version = "YouTubeStandin/1.0"
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def do_GET(self):
+        self.server.apply_latency()
+        
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        path = parsed.path.rstrip("/") or "/"
+        catalog = self.server.catalog
+        
+        if path == "/":
+            self._send_html(pages.home_page(catalog.home_feed(limit=self.server.page_size)))
+        elif path == "/results":
+            query = params.get("search_query", [""])[0]
+            self._send_html(pages.results_page(query, catalog.search(query, limit=self.server.page_size)))
+        elif path == "/watch":
+            video = catalog.get(params.get("v", [""])[0])
+            if video is None:
+                self._send_html(pages.not_found_page(), status=404)
+            else:
+                self._send_html(pages.watch_page(video, catalog.related(video["id"])))
+        elif path == "/feed/trending":
+            self._send_html(pages.trending_page(catalog.trending()))
+        elif path.startswith("/feed/"):
+            self._send_html(pages.feed_page(path.rsplit("/", 1)[-1]))
+        elif path == "/api/results":
+            query = params.get("search_query", [""])[0]
+            offset = self._offset(params)
+            videos = catalog.search(query, offset=offset, limit=self.server.page_size)
+            self._send_html(pages.video_cards(videos, with_description=True))
+        elif path == "/api/feed":
+            offset = self._offset(params)
+            self._send_html(pages.video_cards(catalog.home_feed(offset=offset, limit=self.server.page_size)))
+        elif path == "/api/suggest":
+            self._send(json.dumps(catalog.suggestions(params.get("q", [""])[0])), "application/json")
+        elif path.startswith("/thumbnail/"):
+            video = catalog.get(os.path.splitext(path.rsplit("/", 1)[-1])[0])
+            if video is None:
+                self._send("", "text/plain", status=404)
+            else:
+                self._send(pages.thumbnail_svg(video), "image/svg+xml")
+        elif path.startswith("/media/"):
+            self._send_media()
+        else:
+            self._send_html(pages.not_found_page(), status=404)
+    
+    @staticmethod
+    def _offset(params) -> int:
+        # Infinite-scroll paging; a malformed offset starts from the top
+        try:
+            return max(0, int(params.get("offset", ["0"])[0]))
+        except ValueError:
+            return 0
+    
+    def _send_media(self):
+        media_file = self.server.media_file
+        if not media_file or not os.path.isfile(media_file):
+            self._send("", "text/plain", status=404)
+            return
+        
+        with open(media_file, "rb") as file:
+            data = file.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "video/webm")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _send_html(self, body: str, status: int = 200):
+        self._send(body, "text/html; charset=utf-8", status)
+    
+    def _send(self, body: str, content_type: str, status: int = 200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandinHTTPServer(ThreadingHTTPServer):
+    
+    daemon_threads = True
+    
+    def __init__(self, address, catalog: VideoCatalog, latency_ms: float = 0, jitter_ms: float = 0,
+                 seed: int = 42, page_size: int = 20, media_file: Optional[str] = None, verbose: bool = False):
+        super().__init__(address, StandinRequestHandler)
+        self.catalog = catalog
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.page_size = page_size
+        self.media_file = media_file
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+    
+    def apply_latency(self):
+        if not self.latency_ms and not self.jitter_ms:
+            return
+        with self._rng_lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000.0)
+
+
+class StandinServer:
+    """Local stand-in for the YouTube pages exercised by the page objects.
+    
+    Serves home, search-results, watch and trending pages from a generated
+    catalog, with optional per-request latency and jitter, so the suite can
+    run hermetically and deterministically without network access.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, latency_ms: float = 0, jitter_ms: float = 0,
+                 seed: int = 42, catalog_size: int = 500, media_file: Optional[str] = None, verbose: bool = False):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self.catalog_size = catalog_size
+        self.media_file = media_file
+        self.verbose = verbose
+        self._server: Optional[StandinHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+    
+    def start(self) -> "StandinServer":
+        if self._server is not None:
+            return self
+        
+        catalog = VideoCatalog(seed=self.seed, size=self.catalog_size)
+        self._server = StandinHTTPServer(
+            (self.host, self.port), catalog,
+            latency_ms=self.latency_ms, jitter_ms=self.jitter_ms, seed=self.seed,
+            media_file=self.media_file, verbose=self.verbose
+        )
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+    
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+    
+    @staticmethod
+    def from_config() -> "StandinServer":
+        from config.config import TestConfig
+        return StandinServer(
+            host=TestConfig.STANDIN_HOST,
+            port=TestConfig.STANDIN_PORT,
+            latency_ms=TestConfig.STANDIN_LATENCY_MS,
+            jitter_ms=TestConfig.STANDIN_JITTER_MS,
+            seed=TestConfig.STANDIN_SEED,
+            catalog_size=TestConfig.STANDIN_CATALOG_SIZE,
+            media_file=TestConfig.STANDIN_MEDIA_FILE or None
+        )
\ No newline at end of file
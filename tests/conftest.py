@@ -1,8 +1,28 @@
 import pytest
 import os
-from datetime import datetime
 from utils.driver_manager import DriverManager
+from standin.server import StandinServer
+from utils.replay_proxy import ReplayProxy
 from config.config import TestConfig
+from config.environments import get_environment_config
+from utils.emulation_profiles import EmulationProfiles
+from utils.request_blocking import RequestBlocker
+from utils.web_vitals import PageMetricsStore
+from utils.http_client import BrowserPageFetcher, HttpPageClient, TierTimings
+from utils.artifact_store import safe_name
+from utils.failure_evidence import FailureEvidence
+from utils.image_postprocess import ImagePostProcessor
+from utils.results_sink import ResultsSink
+from utils.run_metrics import RunMetrics, RunMetricsPlugin
+from utils.screencast_recorder import ScreencastRecorder
+from utils.step_frames import StepFrames
+from utils.duration_scheduler import DurationSchedulerPlugin
+from utils.html_report import LightReportPlugin
+from utils.timing_history import TimingHistoryPlugin
+from utils.tracing import Tracer
+from utils.screenshot_pipeline import ScreenshotPipeline
+from utils.screenshot_utils import ScreenshotUtils
+from fixtures.test_fixtures import performance_thresholds
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -10,63 +30,327 @@ def setup_test_environment():
     TestConfig.ensure_directories_exist()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def standin_server():
+    if not get_environment_config().is_standin:
+        yield None
+        return
+    
+    server = StandinServer.from_config()
+    try:
+        server.start()
+        print(f"\nYouTube stand-in serving on {server.url}")
+    except OSError as e:
+        # Port already taken: assume a stand-in started outside pytest
+        print(f"\nUsing existing YouTube stand-in on {server.url}: {e}")
+        server = None
+    
+    yield server
+    
+    if server:
+        server.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def replay_proxy(standin_server):
+    proxy = ReplayProxy.from_config()
+    if proxy is None:
+        yield None
+        return
+    
+    proxy.start()
+    print(f"\nReplay proxy ({proxy.mode}, {proxy.latency} latency) listening on {proxy.address}")
+    
+    yield proxy
+    
+    stats = proxy.stats
+    archive_path = proxy.stop()
+    print(f"\nReplay proxy stats: {stats}")
+    if archive_path:
+        print(f"Recorded session archive: {archive_path}")
+
+
+@pytest.fixture(scope="function", autouse=True)
+def page_metrics(request):
+    PageMetricsStore.begin_test(request.node.nodeid)
+    
+    yield PageMetricsStore
+    
+    metrics_path = PageMetricsStore.end_test()
+    if metrics_path:
+        print(f"\nPage metrics saved: {metrics_path}")
+
+
+@pytest.fixture(scope="function", autouse=True)
+def action_trace(request):
+    if not Tracer.enabled:
+        yield None
+        return
+    
+    Tracer.begin_test(request.node.nodeid)
+    
+    yield Tracer
+    
+    trace_path = Tracer.end_test()
+    if trace_path:
+        print(f"\nTrace saved: {trace_path}")
+
+
+@pytest.fixture(scope="function")
+def emulation_profile(request):
+    if hasattr(request, "param"):
+        return request.param
+    
+    marker = request.node.get_closest_marker("emulation_profile")
+    if marker and marker.args:
+        return marker.args[0]
+    
+    return TestConfig.EMULATION_PROFILE or get_environment_config().emulation_profile
+
+
 @pytest.fixture(scope="function")
-def driver():
+def request_block_profile(request):
+    if request.node.get_closest_marker("no_request_blocking"):
+        return None
+    return TestConfig.REQUEST_BLOCK_PROFILE or get_environment_config().request_block_profile or None
+
+
+def _report_blocked_requests(request, driver_instance):
+    stats = RequestBlocker.collect_stats(driver_instance)
+    if stats:
+        request.node.user_properties.append(("blocked_requests", stats["blocked_requests"]))
+        request.node.user_properties.append(("estimated_bytes_saved", stats["estimated_bytes_saved"]))
+        print(f"\nBlocked {stats['blocked_requests']} requests "
+              f"(~{stats['estimated_bytes_saved'] // 1024} KB saved, profile '{stats['profile']}'): "
+              f"{stats['by_category']}")
+
+
+def _video_recording_enabled():
+    if TestConfig.VIDEO_RECORDING in ("true", "false"):
+        return TestConfig.VIDEO_RECORDING == "true"
+    return get_environment_config().reporting_config["video_recording"]
+
+
+def _start_recording(driver_instance):
+    if not _video_recording_enabled():
+        return None
+    recorder = ScreencastRecorder(driver_instance)
+    return recorder if recorder.start() else None
+
+
+def _call_failed(request):
+    report = request.node.stash.get(call_report_key, None)
+    return report is not None and report.failed
+
+
+def _finish_step_frames(request, driver_instance):
+    if not StepFrames.enabled:
+        return
+    if _call_failed(request):
+        directory = StepFrames.flush(driver_instance, request.node.nodeid)
+        if directory:
+            print(f"\nStep frames saved: {directory}")
+    else:
+        StepFrames.discard(driver_instance)
+
+
+def _finish_recording(request, recorder):
+    if recorder is None:
+        return
+    recorder.stop()
+    # Encode only for failures; passing tests just drop the buffer
+    if _call_failed(request):
+        path = recorder.save(os.path.join(TestConfig.VIDEOS_DIR, safe_name(request.node.nodeid)), request.node.nodeid)
+        if path:
+            print(f"\nScreencast saved: {path}")
+    recorder.discard()
+
+
+@pytest.fixture(scope="function")
+def driver(request, emulation_profile, request_block_profile):
     driver_instance = DriverManager.get_driver(
         browser=TestConfig.BROWSER, 
-        headless=TestConfig.HEADLESS
+        headless=TestConfig.HEADLESS,
+        block_profile=request_block_profile
     )
     driver_instance.implicitly_wait(TestConfig.IMPLICIT_WAIT)
     driver_instance.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+    EmulationProfiles.apply(driver_instance, emulation_profile)
+    recorder = _start_recording(driver_instance)
     
     yield driver_instance
     
+    _finish_recording(request, recorder)
+    _finish_step_frames(request, driver_instance)
+    _report_blocked_requests(request, driver_instance)
     DriverManager.quit_driver(driver_instance)
 
 
 @pytest.fixture(scope="function")
-def chrome_driver():
-    driver_instance = DriverManager.get_driver(browser="chrome", headless=TestConfig.HEADLESS)
+def chrome_driver(request, emulation_profile, request_block_profile):
+    driver_instance = DriverManager.get_driver(browser="chrome", headless=TestConfig.HEADLESS, block_profile=request_block_profile)
     driver_instance.implicitly_wait(TestConfig.IMPLICIT_WAIT)
     driver_instance.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+    EmulationProfiles.apply(driver_instance, emulation_profile)
+    recorder = _start_recording(driver_instance)
     
     yield driver_instance
     
+    _finish_recording(request, recorder)
+    _finish_step_frames(request, driver_instance)
+    _report_blocked_requests(request, driver_instance)
     DriverManager.quit_driver(driver_instance)
 
 
 @pytest.fixture(scope="function")
-def firefox_driver():
-    driver_instance = DriverManager.get_driver(browser="firefox", headless=TestConfig.HEADLESS)
+def firefox_driver(request, emulation_profile, request_block_profile):
+    driver_instance = DriverManager.get_driver(browser="firefox", headless=TestConfig.HEADLESS, block_profile=request_block_profile)
     driver_instance.implicitly_wait(TestConfig.IMPLICIT_WAIT)
     driver_instance.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+    EmulationProfiles.apply(driver_instance, emulation_profile)
+    recorder = _start_recording(driver_instance)
     
     yield driver_instance
     
+    _finish_recording(request, recorder)
+    _finish_step_frames(request, driver_instance)
     DriverManager.quit_driver(driver_instance)
 
 
+@pytest.fixture(scope="session")
+def http_client():
+    client = HttpPageClient()
+    
+    yield client
+    
+    client.close()
+
+
+@pytest.fixture(scope="function")
+def page_fetcher(request):
+    # Tests marked http_tier only read URLs, titles and markup, so they run
+    # over plain HTTP unless TEST_TIER=browser asks for a real browser
+    if request.node.get_closest_marker("http_tier") and TestConfig.TEST_TIER == "http":
+        request.node.user_properties.append(("test_tier", "http"))
+        return request.getfixturevalue("http_client")
+    
+    request.node.user_properties.append(("test_tier", "browser"))
+    return BrowserPageFetcher(request.getfixturevalue("driver"))
+
+
+call_report_key = pytest.StashKey[pytest.TestReport]()
+screenshot_futures_key = pytest.StashKey[list]()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     
+    if rep.when == "call":
+        item.stash[call_report_key] = rep
+    
     if rep.when == "call" and rep.failed:
-        if TestConfig.SCREENSHOT_ON_FAILURE:
-            driver = item.funcargs.get('driver')
-            if driver:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_name = f"{item.name}_{timestamp}.png"
-                screenshot_path = os.path.join(TestConfig.SCREENSHOTS_DIR, screenshot_name)
-                
-                try:
-                    driver.save_screenshot(screenshot_path)
-                    print(f"\nScreenshot saved: {screenshot_path}")
-                except Exception as e:
-                    print(f"\nFailed to save screenshot: {e}")
+        # Any live driver the test received: driver, chrome_driver,
+        # firefox_driver or a custom fixture. Drivers the test opened with
+        # DriverManager.session() were captured as the failure left the block
+        drivers = [value for value in item.funcargs.values() if DriverManager.is_live(value)]
+        if TestConfig.EVIDENCE_ON_FAILURE:
+            # The bundle holds the failure screenshot when SCREENSHOT_ON_FAILURE is on
+            for driver in drivers:
+                path = FailureEvidence.collect(driver, item.nodeid)
+                if path:
+                    print(f"\nFailure evidence saved: {path}")
+        elif TestConfig.SCREENSHOT_ON_FAILURE:
+            # Only the capture blocks; hashing and the disk write overlap
+            # with driver teardown and are awaited once it is done
+            item.stash[screenshot_futures_key] = [
+                ScreenshotUtils.store_screenshot_async(driver, item.nodeid, "FAILURE") for driver in drivers
+            ]
+    
+    if rep.when == "teardown":
+        for future in item.stash.get(screenshot_futures_key, []):
+            try:
+                print(f"\nScreenshot saved: {future.result(timeout=30)}")
+            except Exception as e:
+                print(f"\nFailed to save screenshot: {e}")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # Workers of this session; only their result parts are merged
+    ResultsSink.add_session_worker(node.gateway.id)
+
+
+def pytest_runtest_logreport(report):
+    tier = dict(report.user_properties).get("test_tier")
+    if tier:
+        TierTimings.record(report.nodeid, tier, report.duration)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not ScreenshotPipeline.wait_all(timeout=60):
+        print(f"\n{ScreenshotPipeline.pending_count()} screenshots were still being written at session end")
+    ScreenshotPipeline.shutdown()
+    ResultsSink.flush()
+    
+    # Under xdist only the controller runs these, once every worker is done
+    if hasattr(session.config, "workerinput"):
+        return
+    results_path = ResultsSink.merge()
+    if results_path:
+        print(f"\nTest results: {results_path}")
+    if TestConfig.POSTPROCESS_IMAGES:
+        print(f"\n{ImagePostProcessor.format_summary(ImagePostProcessor().process())}")
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    cache = getattr(config, "cache", None)
+    history = cache.get(TierTimings.CACHE_KEY, {}) if cache else {}
+    summary = TierTimings.summary(history)
+    if cache and summary["browser_durations"]:
+        cache.set(TierTimings.CACHE_KEY, dict(history, **summary["browser_durations"]))
+    
+    if not summary["http_tests"]:
+        return
+    
+    terminalreporter.section("HTTP fast tier")
+    for test in summary["http_tests"]:
+        baseline = "no browser baseline" if test["browser_seconds"] is None else (
+            f"browser {test['browser_seconds']:.2f}s{' (estimated)' if test['estimated'] else ''}"
+        )
+        terminalreporter.write_line(f"{test['nodeid']}: http {test['http_seconds']:.2f}s, {baseline}")
+    terminalreporter.write_line(f"Estimated time saved by the HTTP tier: {summary['time_saved']:.2f}s")
+
+
+def pytest_generate_tests(metafunc):
+    # Tests that use emulation_profile, directly or through a driver
+    # fixture, are run once per profile listed in EMULATION_MATRIX
+    if TestConfig.EMULATION_MATRIX and "emulation_profile" in metafunc.fixturenames:
+        metafunc.parametrize("emulation_profile", TestConfig.EMULATION_MATRIX, indirect=True)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--light-report", action="store", default=None, metavar="PATH",
+        help="Write an incremental HTML report that links artifacts instead of embedding them"
+    )
 
 
 def pytest_configure(config):
+    if not hasattr(config, "workerinput"):
+        # Fix the run id before xdist starts workers, which inherit it
+        ResultsSink.run_id()
+    if TestConfig.TIMING_HISTORY:
+        config.pluginmanager.register(TimingHistoryPlugin(config), "timing_history")
+    if TestConfig.DURATION_SCHEDULING:
+        config.pluginmanager.register(DurationSchedulerPlugin(), "duration_scheduler")
+    if RunMetrics.enabled:
+        config.pluginmanager.register(RunMetricsPlugin(config), "run_metrics")
+    if config.getoption("light_report") and not hasattr(config, "workerinput"):
+        details = {"browser": TestConfig.BROWSER, "environment": get_environment_config().env_name,
+                   "markers": config.getoption("markexpr"), "build": os.getenv("BUILD_NUMBER")}
+        config.pluginmanager.register(LightReportPlugin(config.getoption("light_report"), details), "light_report")
     config.addinivalue_line(
         "markers", "smoke: mark test as smoke test"
     )
@@ -81,4 +365,13 @@ def pytest_configure(config):
     )
     config.addinivalue_line(
         "markers", "youtube_navigation: mark test as YouTube navigation test"
+    )
+    config.addinivalue_line(
+        "markers", "emulation_profile(name): run the test under a named network/CPU emulation profile"
+    )
+    config.addinivalue_line(
+        "markers", "no_request_blocking: load ads, trackers, thumbnails and media even when a block profile is active"
+    )
+    config.addinivalue_line(
+        "markers", "http_tier: non-interactive check that runs over plain HTTP unless TEST_TIER=browser"
     )
\ No newline at end of file
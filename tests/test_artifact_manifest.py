@@ -0,0 +1,111 @@
+import io
+import os
+import time
+import pytest
+from PIL import Image
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import ArtifactStore
+
+
+DAY = 86400
+
+
+class TestArtifactRetention:
+    
+    @pytest.fixture
+    def manifest(self, tmp_path):
+        manifest = ArtifactManifest(str(tmp_path / "manifest.db"))
+        yield manifest
+        manifest.close()
+    
+    @staticmethod
+    def _add(manifest, path, size, age_days, test=None):
+        manifest.record(path, "trace", test, size=size)
+        manifest._connection.execute(
+            "UPDATE artifacts SET created = ?, modified = ? WHERE path = ?",
+            (time.time() - age_days * DAY, time.time() - age_days * DAY, os.path.abspath(path))
+        )
+    
+    def test_age_limit_returns_oldest_first(self, manifest, tmp_path):
+        self._add(manifest, tmp_path / "new.json", 10, 1)
+        self._add(manifest, tmp_path / "old.json", 10, 20)
+        self._add(manifest, tmp_path / "older.json", 10, 30)
+        expired = manifest.expired(max_age_days=7)
+        assert expired == [str(tmp_path / "older.json"), str(tmp_path / "old.json")]
+    
+    def test_reused_object_is_not_expired_by_age(self, manifest, tmp_path):
+        self._add(manifest, tmp_path / "object.png", 10, 30)
+        manifest.touch(tmp_path / "object.png")
+        assert manifest.expired(max_age_days=7) == []
+    
+    def test_per_test_limit_keeps_newest(self, manifest, tmp_path):
+        for age in (1, 2, 3):
+            self._add(manifest, tmp_path / f"a{age}.json", 10, age, test="test_a")
+        self._add(manifest, tmp_path / "b.json", 10, 9, test="test_b")
+        assert manifest.expired(max_per_test=2) == [str(tmp_path / "a3.json")]
+    
+    def test_size_limit_keeps_newest_within_budget(self, manifest, tmp_path):
+        for age in (1, 2, 3, 4):
+            self._add(manifest, tmp_path / f"{age}.json", 100, age)
+        expired = manifest.expired(max_total_bytes=250)
+        assert expired == [str(tmp_path / "4.json"), str(tmp_path / "3.json")]
+    
+    def test_rules_combine_without_duplicates(self, manifest, tmp_path):
+        self._add(manifest, tmp_path / "old.json", 100, 30, test="test_a")
+        self._add(manifest, tmp_path / "new.json", 100, 1, test="test_a")
+        expired = manifest.expired(max_age_days=7, max_total_bytes=150, max_per_test=1)
+        assert expired == [str(tmp_path / "old.json")]
+    
+    def test_no_limits_expire_nothing(self, manifest, tmp_path):
+        self._add(manifest, tmp_path / "old.json", 100, 300)
+        assert manifest.expired() == []
+
+
+class TestStoreAfterRetention:
+    
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TestConfig, "ARTIFACT_MANIFEST", str(tmp_path / "manifest.db"))
+        yield ArtifactStore(str(tmp_path / "store"), near_duplicates=True)
+        ArtifactManifest.default().close()
+        ArtifactManifest._instances.pop(os.path.abspath(TestConfig.ARTIFACT_MANIFEST), None)
+    
+    @staticmethod
+    def _png(marker=0):
+        img = Image.new("L", (64, 32))
+        img.putdata([x * 4 for y in range(32) for x in range(64)])
+        img.putpixel((0, 0), marker)
+        buffer = io.BytesIO()
+        img.save(buffer, "PNG")
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _expire_all(store):
+        manifest = ArtifactManifest.default()
+        manifest._connection.execute("UPDATE artifacts SET modified = ?", (time.time() - 30 * DAY,))
+        assert manifest.enforce_retention(max_age_days=7, max_total_bytes=0, max_per_test=0)["removed"] == 1
+    
+    def test_exact_duplicate_of_removed_object_is_stored_again(self, store):
+        store.put(self._png(), test="test_a")
+        self._expire_all(store)
+        
+        reference = store.put(self._png(), test="test_b")
+        
+        assert not reference["deduplicated"]
+        assert os.path.exists(os.path.join(store.root, reference["path"]))
+    
+    def test_near_duplicate_of_removed_object_is_stored(self, store):
+        first = store.put(self._png(), test="test_a")
+        self._expire_all(store)
+        
+        reference = store.put(self._png(marker=255), test="test_b")
+        
+        assert reference["hash"] != first["hash"]
+        assert not reference["deduplicated"] and reference["near_duplicate_of"] is None
+        assert os.path.exists(os.path.join(store.root, reference["path"]))
+    
+    def test_near_duplicate_of_live_object_is_linked(self, store):
+        first = store.put(self._png(), test="test_a")
+        reference = store.put(self._png(marker=255), test="test_b")
+        assert reference["near_duplicate_of"] == first["hash"]
\ No newline at end of file
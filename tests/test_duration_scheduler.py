@@ -0,0 +1,43 @@
+import pytest
+from utils.duration_scheduler import DurationScheduling
+
+
+class TestDurationEstimates:
+    
+    KNOWN = {
+        "tests/test_a.py::TestA::test_param[1]": 10.0,
+        "tests/test_a.py::TestA::test_param[2]": 20.0,
+        "tests/test_a.py::TestA::test_other": 3.0,
+        "tests/test_b.py::test_module_level": 7.0
+    }
+    
+    def test_own_history_wins_and_group_suffix_is_ignored(self):
+        nodeid = "tests/test_a.py::TestA::test_param[1]@parallel_unsafe"
+        assert DurationScheduling.estimate([nodeid], self.KNOWN, 60)[nodeid] == 10.0
+    
+    def test_new_parametrization_takes_mean_of_the_others(self):
+        nodeid = "tests/test_a.py::TestA::test_param[3]"
+        assert DurationScheduling.estimate([nodeid], self.KNOWN, 60)[nodeid] == 15.0
+    
+    def test_new_test_takes_mean_of_its_class(self):
+        nodeid = "tests/test_a.py::TestA::test_new"
+        assert DurationScheduling.estimate([nodeid], self.KNOWN, 60)[nodeid] == pytest.approx(11.0)
+    
+    def test_new_test_takes_mean_of_its_module(self):
+        nodeid = "tests/test_b.py::test_new"
+        assert DurationScheduling.estimate([nodeid], self.KNOWN, 60)[nodeid] == 7.0
+    
+    def test_unknown_module_takes_median_of_all_known(self):
+        nodeid = "tests/test_c.py::test_new"
+        assert DurationScheduling.estimate([nodeid], self.KNOWN, 60)[nodeid] == 8.5
+    
+    def test_no_history_takes_default(self):
+        nodeid = "tests/test_c.py::test_new"
+        assert DurationScheduling.estimate([nodeid], {}, 60)[nodeid] == 60
+    
+    def test_predict_assigns_longest_first_to_least_loaded(self):
+        assert DurationScheduling.predict([5, 4, 3, 3, 3], 2) == [10, 8]
+        assert DurationScheduling.predict([5, 4, 3], 5) == [5, 4, 3, 0, 0]
+    
+    def test_predict_without_workers_runs_everything_on_one(self):
+        assert DurationScheduling.predict([5, 4, 3], 0) == [12]
\ No newline at end of file
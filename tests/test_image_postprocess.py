@@ -0,0 +1,52 @@
+import os
+import pytest
+from PIL import Image
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import ArtifactStore
+from utils.image_postprocess import ImagePostProcessor
+
+
+class TestImagePostProcessor:
+    
+    @pytest.fixture
+    def manifest(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TestConfig, "ARTIFACT_MANIFEST", str(tmp_path / "manifest.db"))
+        manifest = ArtifactManifest.default()
+        yield manifest
+        manifest.close()
+        ArtifactManifest._instances.pop(os.path.abspath(TestConfig.ARTIFACT_MANIFEST), None)
+    
+    @staticmethod
+    def _screenshot(directory, name, manifest, test=None):
+        path = str(directory / name)
+        Image.new("RGB", (320, 200), (40, 80, 120)).save(path, "PNG")
+        manifest.record(path, "screenshot", test)
+        return path
+    
+    def test_keeps_originals_of_failed_tests_only(self, tmp_path, manifest):
+        screenshots = tmp_path / "screenshots"
+        screenshots.mkdir()
+        failed = self._screenshot(screenshots, "failed.png", manifest, "tests/test_a.py::test_failed")
+        passed = self._screenshot(screenshots, "passed.png", manifest, "tests/test_a.py::test_passed")
+        untracked = self._screenshot(screenshots, "untracked.png", manifest)
+        manifest.record(str(tmp_path / "evidence.zip"), "evidence", "tests/test_a.py::test_failed", size=10)
+        
+        report = ImagePostProcessor(image_format="jpeg", workers=1).process(
+            [str(screenshots)], ArtifactStore(str(tmp_path / "store"))
+        )
+        
+        assert report["images"] == 3 and report["originals_kept"] == 1
+        assert os.path.exists(failed)
+        assert not os.path.exists(passed) and not os.path.exists(untracked)
+        assert manifest.get(failed) is not None and manifest.get(passed) is None
+    
+    def test_skips_store_objects(self, tmp_path, manifest):
+        store = ArtifactStore(str(tmp_path / "store"), near_duplicates=False)
+        Image.new("RGB", (32, 32)).save(tmp_path / "source.png", "PNG")
+        reference = store.put((tmp_path / "source.png").read_bytes(), ".png", "tests/test_a.py::test_one")
+        
+        report = ImagePostProcessor(image_format="jpeg", workers=1).process([store.root], store)
+        
+        assert report["images"] == 0
+        assert os.path.exists(os.path.join(store.root, reference["path"]))
\ No newline at end of file
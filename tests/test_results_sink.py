@@ -0,0 +1,63 @@
+import json
+import pytest
+from config.config import TestConfig
+from utils.results_sink import ResultsSink
+
+
+class TestResultsMerge:
+    
+    @pytest.fixture(autouse=True)
+    def results_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TestConfig, "RESULTS_DIR", str(tmp_path))
+        monkeypatch.setattr(ResultsSink, "_session_workers", set())
+        monkeypatch.setenv("TEST_RUN_ID", "run1")
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        return tmp_path
+    
+    @staticmethod
+    def _write_part(directory, run_id, worker, content):
+        path = directory / f"results-{run_id}-{worker}.jsonl"
+        path.write_text(content)
+        return path
+    
+    def test_merges_parts_of_this_session(self, results_dir):
+        self._write_part(results_dir, "run1", "main", '{"nodeid": "a"}\n')
+        self._write_part(results_dir, "run1", "gw0", '{"nodeid": "b"}\n{"nodeid": "c"}\n')
+        ResultsSink.add_session_worker("gw0")
+        
+        path = ResultsSink.merge()
+        
+        assert path == str(results_dir / "run-run1.jsonl")
+        assert sorted(record["nodeid"] for record in ResultsSink.read_run()) == ["a", "b", "c"]
+        assert not list(results_dir.glob("results-*.jsonl"))
+    
+    def test_leaves_parts_of_other_sessions(self, results_dir):
+        self._write_part(results_dir, "run1", "main", '{"nodeid": "a"}\n')
+        foreign = self._write_part(results_dir, "run1", "gw7", '{"nodeid": "x"}\n')
+        other_run = self._write_part(results_dir, "run2", "main", '{"nodeid": "y"}\n')
+        
+        ResultsSink.merge()
+        
+        assert [record["nodeid"] for record in ResultsSink.read_run()] == ["a"]
+        assert foreign.exists() and other_run.exists()
+    
+    def test_skips_torn_last_line(self, results_dir):
+        self._write_part(results_dir, "run1", "main", '{"nodeid": "a"}\n{"nodeid": "b"')
+        ResultsSink.merge()
+        assert [record["nodeid"] for record in ResultsSink.read_run()] == ["a"]
+    
+    def test_no_parts_returns_none(self):
+        assert ResultsSink.merge() is None
+    
+    def test_flush_writes_one_line_per_record(self, results_dir, monkeypatch):
+        monkeypatch.setattr(ResultsSink, "_buffer", [])
+        monkeypatch.setattr(TestConfig, "RESULTS_BATCH_SIZE", 100)
+        monkeypatch.setattr(TestConfig, "RESULTS_FLUSH_SECONDS", 3600)
+        ResultsSink.append({"nodeid": "a"})
+        ResultsSink.append({"nodeid": "b"})
+        
+        assert ResultsSink.flush() == 2
+        
+        lines = (results_dir / "results-run1-main.jsonl").read_text().splitlines()
+        assert [json.loads(line)["nodeid"] for line in lines] == ["a", "b"]
+        assert json.loads(lines[0])["run_id"] == "run1"
\ No newline at end of file
@@ -0,0 +1,82 @@
+import time
+import pytest
+from utils.timing_history import TimingHistory
+
+
+DAY = 86400
+
+
+class TestTimingHistory:
+    
+    @pytest.fixture
+    def history(self, tmp_path):
+        history = TimingHistory(str(tmp_path / "timings.db"))
+        yield history
+        history.close()
+    
+    @staticmethod
+    def _record(history, run, nodeid, total_ms, browser="chrome", outcome="passed", days_ago=0.0):
+        run_id = f"run{run}"
+        history.record_run(run_id, [{
+            "nodeid": nodeid, "browser": browser, "outcome": outcome, "setup_ms": 0, "call_ms": total_ms,
+            "teardown_ms": 0, "wait_ms": 0, "waits": 0
+        }])
+        # Runs are ordered by start time; make it follow the run number
+        history._connection.execute(
+            "UPDATE runs SET started = ? WHERE run_id = ?", (time.time() - days_ago * DAY + run, run_id)
+        )
+        history._connection.commit()
+    
+    def test_getting_slower_compares_recent_and_previous_windows(self, history):
+        for run in range(10):
+            self._record(history, run, "tests/test_a.py::test_slower", 1000 if run < 5 else 1500)
+            self._record(history, run, "tests/test_a.py::test_steady", 1000)
+            self._record(history, run, "tests/test_a.py::test_fast", 100 if run < 5 else 200)
+        
+        rows = history.getting_slower(window=5, ratio=1.2, min_ms=500)
+        
+        assert [row["nodeid"] for row in rows] == ["tests/test_a.py::test_slower"]
+        assert rows[0]["recent_ms"] == 1500 and rows[0]["previous_ms"] == 1000 and rows[0]["ratio"] == 1.5
+    
+    def test_getting_slower_ignores_failures(self, history):
+        for run in range(10):
+            self._record(history, run, "tests/test_a.py::test_timeout", 1000)
+        self._record(history, 10, "tests/test_a.py::test_timeout", 60000, outcome="failed")
+        assert history.getting_slower(window=5) == []
+    
+    def test_getting_slower_needs_a_previous_window(self, history):
+        for run in range(5):
+            self._record(history, run, "tests/test_a.py::test_new", 1000 * (run + 1))
+        assert history.getting_slower(window=5) == []
+    
+    def test_estimates_average_last_window_of_passing_runs(self, history):
+        for run, total_ms in enumerate([9000, 1000, 2000, 3000]):
+            self._record(history, run, "tests/test_a.py::test_one", total_ms)
+        self._record(history, 4, "tests/test_a.py::test_one", 50000, outcome="failed")
+        assert history.estimates("chrome", window=3) == {"tests/test_a.py::test_one": 2.0}
+    
+    def test_estimates_prefer_the_requested_browser(self, history):
+        self._record(history, 0, "tests/test_a.py::test_both", 1000, browser="chrome")
+        self._record(history, 0, "tests/test_a.py::test_both", 4000, browser="firefox")
+        self._record(history, 0, "tests/test_a.py::test_chrome_only", 2000, browser="chrome")
+        
+        estimates = history.estimates("firefox")
+        
+        assert estimates["tests/test_a.py::test_both"] == 4.0
+        assert estimates["tests/test_a.py::test_chrome_only"] == 2.0
+    
+    def test_same_run_id_in_other_jobs_are_separate_runs(self, history):
+        record = {"nodeid": "tests/test_a.py::test_one", "browser": "chrome", "outcome": "passed",
+                  "setup_ms": 0, "call_ms": 1000, "teardown_ms": 0, "wait_ms": 0, "waits": 0}
+        history.record_run("run1", [record], build="7", job="unit")
+        history.record_run("run1", [dict(record, call_ms=3000)], build="7", job="browser")
+        assert len(history.history("tests/test_a.py::test_one")) == 2
+    
+    def test_prune_removes_old_runs(self, history):
+        self._record(history, 0, "tests/test_a.py::test_old", 1000, days_ago=60)
+        self._record(history, 1, "tests/test_a.py::test_new", 1000)
+        
+        assert history.prune(max_age_days=30) == 1
+        
+        assert history.history("tests/test_a.py::test_old") == []
+        assert len(history.history("tests/test_a.py::test_new")) == 1
\ No newline at end of file
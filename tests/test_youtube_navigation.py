@@ -51,6 +51,7 @@ class TestYouTubeNavigation:
         assert "search_query" in new_url, "Search query not in URL"
         assert search_term.replace(" ", "+") in new_url, "Search term not in URL"
     
+    @pytest.mark.no_request_blocking
     def test_video_thumbnail_navigation(self, driver):
         home_page = HomePage(driver)
         home_page.open()
@@ -71,11 +72,9 @@ class TestYouTubeNavigation:
         
         assert home_page.click_menu_button(), "Failed to click menu button"
     
-    def test_page_title_consistency(self, driver):
-        home_page = HomePage(driver)
-        home_page.open()
-        
-        title = home_page.get_page_title()
+    @pytest.mark.http_tier
+    def test_page_title_consistency(self, page_fetcher):
+        title = page_fetcher.fetch(TestConfig.YOUTUBE_BASE_URL).title
         assert "YouTube" in title, f"Page title '{title}' doesn't contain YouTube"
         assert len(title) > 0, "Page title is empty"
     
@@ -121,7 +120,7 @@ class TestYouTubeNavigation:
         original_handles = driver.window_handles
         assert len(original_handles) == 1, "Expected only one window initially"
         
-        driver.execute_script("window.open('https://www.youtube.com');")
+        driver.execute_script(f"window.open('{TestConfig.YOUTUBE_BASE_URL}');")
         
         new_handles = driver.window_handles
         assert len(new_handles) == 2, "New tab not opened"
@@ -133,14 +132,14 @@ class TestYouTubeNavigation:
         driver.switch_to.window(original_handles[0])
         assert TestConfig.YOUTUBE_BASE_URL in driver.current_url, "Original tab lost focus"
     
-    def test_url_direct_access(self, driver):
+    @pytest.mark.http_tier
+    def test_url_direct_access(self, page_fetcher):
         test_urls = [
             f"{TestConfig.YOUTUBE_BASE_URL}/",
             f"{TestConfig.YOUTUBE_BASE_URL}/feed/trending",
             f"{TestConfig.YOUTUBE_BASE_URL}/results?search_query=test"
         ]
         
-        for url in test_urls:
-            driver.get(url)
-            assert TestConfig.YOUTUBE_BASE_URL in driver.current_url, f"Failed to navigate to {url}"
-            assert "YouTube" in driver.title, f"Title doesn't contain YouTube for {url}"
\ No newline at end of file
+        for url, page in zip(test_urls, page_fetcher.fetch_many(test_urls)):
+            assert TestConfig.YOUTUBE_BASE_URL in page.current_url, f"Failed to navigate to {url}"
+            assert "YouTube" in page.title, f"Title doesn't contain YouTube for {url}"
\ No newline at end of file
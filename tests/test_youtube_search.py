@@ -2,6 +2,8 @@ import pytest
 from pages.home_page import HomePage
 from pages.search_page import SearchPage
 from config.config import TestConfig
+from utils.test_helpers import ValidationHelpers
+from urllib.parse import quote_plus
 
 
 @pytest.mark.youtube_search
@@ -111,6 +113,15 @@ class TestYouTubeSearch:
             results_count = search_page.get_search_results_count()
             assert results_count >= 0, f"Unexpected error for search: '{search_term}'"
     
+    @pytest.mark.http_tier
+    def test_search_url_validation(self, page_fetcher):
+        search_terms = ["Python programming", "C++ programming", "music #trending"]
+        urls = [f"{TestConfig.YOUTUBE_BASE_URL}/results?search_query={quote_plus(term)}" for term in search_terms]
+        
+        for search_term, page in zip(search_terms, page_fetcher.fetch_many(urls)):
+            assert ValidationHelpers.is_search_url(page.current_url), f"Not a search URL for '{search_term}': {page.current_url}"
+            assert "YouTube" in page.title, f"Title doesn't contain YouTube for '{search_term}'"
+    
     @pytest.mark.regression
     def test_search_filters_accessibility(self, driver):
         home_page = HomePage(driver)
@@ -7,6 +7,7 @@ from pages.video_page import VideoPage
 
 @pytest.mark.youtube_video
 @pytest.mark.smoke
+@pytest.mark.no_request_blocking
 class TestYouTubeVideo:
     
     def test_video_page_load(self, driver):
@@ -61,6 +62,27 @@ class TestYouTubeVideo:
             
             assert video_page.pause_video(), "Failed to pause video"
     
+    def test_video_playback_quality(self, driver, performance_thresholds):
+        home_page = HomePage(driver)
+        search_page = SearchPage(driver)
+        video_page = VideoPage(driver)
+        
+        home_page.open()
+        home_page.search_for_video("nature documentary")
+        
+        if search_page.has_search_results():
+            search_page.click_first_search_result()
+            assert video_page.wait_for_video_to_load(), "Video failed to load"
+            
+            collector = video_page.attach_playback_metrics()
+            assert collector is not None, "Could not attach playback metrics to the player"
+            
+            collector.collect_for(10)
+            summary = collector.stop()
+            
+            assert summary["sample_count"] > 0, "No playback samples were collected"
+            collector.assert_within_thresholds(performance_thresholds)
+    
     def test_video_controls_visibility(self, driver):
         home_page = HomePage(driver)
         search_page = SearchPage(driver)
@@ -0,0 +1,59 @@
+import time
+import weakref
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class ActionTrail:
+    """Bounded per-driver history of page-object actions.
+    
+    BasePage records each navigation, click, text entry and wait with its
+    outcome and duration, so a failure report can show what the test did
+    last without any logging in the tests themselves.
+    """
+    
+    MAX_ACTIONS = 200
+    
+    _trails = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def describe_locator(locator: Optional[tuple]) -> str:
+        if not locator:
+            return ""
+        return f"{locator[0]}={locator[1]}"
+    
+    @staticmethod
+    def record(driver, page: str, action: str, target: str = "", ok: bool = True,
+               started: Optional[float] = None, detail: Optional[str] = None) -> Dict[str, Any]:
+        now = time.time()
+        entry = {
+            "time": now,
+            "page": page,
+            "action": action,
+            "target": target,
+            "ok": ok,
+            "elapsed": round(now - started, 3) if started else None
+        }
+        if detail:
+            entry["detail"] = detail
+        try:
+            ActionTrail._trails.setdefault(driver, deque(maxlen=ActionTrail.MAX_ACTIONS)).append(entry)
+        except TypeError:
+            # Drivers that cannot be weakly referenced are not tracked
+            pass
+        return entry
+    
+    @staticmethod
+    def recent(driver, limit: int = MAX_ACTIONS) -> List[Dict[str, Any]]:
+        try:
+            trail = ActionTrail._trails.get(driver)
+        except TypeError:
+            return []
+        return list(trail)[-limit:] if trail else []
+    
+    @staticmethod
+    def clear(driver) -> None:
+        try:
+            ActionTrail._trails.pop(driver, None)
+        except TypeError:
+            pass
\ No newline at end of file
@@ -0,0 +1,254 @@
+import argparse
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from config.config import TestConfig
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_dimensions(header: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """Width and height from the IHDR chunk, which always directly follows
+    the PNG signature; only the first 24 bytes are needed."""
+    if len(header) >= 24 and header[:8] == PNG_SIGNATURE and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    return None, None
+
+
+def read_png_dimensions(path: str) -> Tuple[Optional[int], Optional[int]]:
+    try:
+        with open(path, "rb") as file:
+            return png_dimensions(file.read(24))
+    except OSError:
+        return None, None
+
+
+class ArtifactManifest:
+    """SQLite index of every artifact file the framework writes.
+    
+    Writers record path, size, dimensions, test and timestamps at write
+    time, so retention and lookups are index queries instead of directory
+    scans and image decodes. The database runs in WAL mode so xdist workers
+    can record concurrently.
+    """
+    
+    _instances: Dict[str, "ArtifactManifest"] = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or TestConfig.ARTIFACT_MANIFEST
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                path TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                test TEXT,
+                size INTEGER NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                created REAL NOT NULL,
+                modified REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS artifacts_created ON artifacts (created);
+            CREATE INDEX IF NOT EXISTS artifacts_modified ON artifacts (modified);
+            CREATE INDEX IF NOT EXISTS artifacts_test ON artifacts (test, created);
+        """)
+    
+    @classmethod
+    def default(cls) -> "ArtifactManifest":
+        path = os.path.abspath(TestConfig.ARTIFACT_MANIFEST)
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+    
+    @classmethod
+    def record_file(cls, path: str, kind: str = "screenshot", test: Optional[str] = None,
+                    data: Optional[bytes] = None) -> None:
+        """Record a just-written file in the default manifest. Never raises:
+        a manifest problem must not fail the test that took the screenshot."""
+        try:
+            cls.default().record(path, kind, test, data)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Failed to record artifact {path}: {e}")
+    
+    def record(self, path: str, kind: str = "screenshot", test: Optional[str] = None,
+               data: Optional[bytes] = None, size: Optional[int] = None,
+               width: Optional[int] = None, height: Optional[int] = None) -> None:
+        path = os.path.abspath(path)
+        if size is None:
+            size = len(data) if data is not None else os.path.getsize(path)
+        if width is None and path.lower().endswith(".png"):
+            width, height = png_dimensions(data[:24]) if data is not None else read_png_dimensions(path)
+        
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO artifacts (path, kind, test, size, width, height, created, modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET kind = excluded.kind, test = COALESCE(excluded.test, test), "
+                "size = excluded.size, width = excluded.width, height = excluded.height, modified = excluded.modified",
+                (path, kind, test, size, width, height, now, now)
+            )
+    
+    @classmethod
+    def touch_file(cls, path: str) -> None:
+        """Mark a file in the default manifest as used again. Never raises."""
+        try:
+            cls.default().touch(path)
+        except sqlite3.Error as e:
+            print(f"Failed to update artifact {path}: {e}")
+    
+    def touch(self, path: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE artifacts SET modified = ? WHERE path = ?", (time.time(), os.path.abspath(path))
+            )
+    
+    def forget(self, path: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM artifacts WHERE path = ?", (os.path.abspath(path),))
+    
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT path, kind, test, size, width, height, created, modified FROM artifacts WHERE path = ?",
+                (os.path.abspath(path),)
+            )
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, row)) if row else None
+    
+    def for_test(self, test: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT path, kind, test, size, width, height, created, modified FROM artifacts "
+                "WHERE test = ? ORDER BY created", (test,)
+            )
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def tests_with(self, kinds: Iterable[str]) -> Set[str]:
+        """Tests that have at least one artifact of any of the given kinds."""
+        kinds = list(kinds)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT DISTINCT test FROM artifacts WHERE test IS NOT NULL "
+                f"AND kind IN ({', '.join('?' for _ in kinds)})", kinds
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            count, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        return {"files": count, "bytes": size}
+    
+    def expired(self, max_age_days: Optional[float] = None, max_total_bytes: Optional[int] = None,
+                max_per_test: Optional[int] = None, limit: int = 1000) -> List[str]:
+        """Paths past any of the limits, least recently used first. Each rule
+        is a single indexed query; nothing on disk is touched.
+        
+        Age is taken from `modified`, which a deduplicated store object gets
+        bumped on every reuse, so an object that current records still link
+        to is not removed for having been first written long ago.
+        """
+        queries = []
+        parameters: List[Any] = []
+        if max_age_days:
+            queries.append("SELECT path, modified FROM artifacts WHERE modified < ?")
+            parameters.append(time.time() - max_age_days * 86400)
+        if max_per_test:
+            queries.append(
+                "SELECT path, modified FROM (SELECT path, modified, ROW_NUMBER() OVER "
+                "(PARTITION BY test ORDER BY modified DESC) AS position FROM artifacts WHERE test IS NOT NULL) "
+                "WHERE position > ?"
+            )
+            parameters.append(max_per_test)
+        if max_total_bytes:
+            queries.append(
+                "SELECT path, modified FROM (SELECT path, modified, SUM(size) OVER "
+                "(ORDER BY modified DESC ROWS UNBOUNDED PRECEDING) AS running FROM artifacts) "
+                "WHERE running > ?"
+            )
+            parameters.append(max_total_bytes)
+        if not queries:
+            return []
+        
+        sql = f"SELECT path FROM ({' UNION '.join(queries)}) ORDER BY modified LIMIT ?"
+        with self._lock:
+            return [row[0] for row in self._connection.execute(sql, (*parameters, limit)).fetchall()]
+    
+    def enforce_retention(self, max_age_days: Optional[float] = None, max_total_bytes: Optional[int] = None,
+                          max_per_test: Optional[int] = None, limit: int = 1000) -> Dict[str, int]:
+        """Delete up to `limit` expired files. Arguments left as None take
+        the configured retention."""
+        max_age_days = TestConfig.RETENTION_DAYS if max_age_days is None else max_age_days
+        max_total_bytes = TestConfig.RETENTION_MAX_MB * 1024 * 1024 if max_total_bytes is None else max_total_bytes
+        max_per_test = TestConfig.RETENTION_MAX_PER_TEST if max_per_test is None else max_per_test
+        
+        removed = freed = 0
+        for path in self.expired(max_age_days, max_total_bytes, max_per_test, limit):
+            entry = self.get(path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Failed to remove artifact {path}: {e}")
+                continue
+            self.forget(path)
+            removed += 1
+            freed += entry["size"] if entry else 0
+        return {"removed": removed, "freed_bytes": freed}
+    
+    def backfill(self, directory: str, kind: str = "screenshot") -> int:
+        """One-off import of files written before the manifest existed."""
+        count = 0
+        for current, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(current, name)
+                if self.get(path) is None:
+                    self.record(path, kind)
+                    count += 1
+        return count
+    
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Artifact manifest maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = subparsers.add_parser("backfill", help="Index files written before the manifest existed")
+    backfill_parser.add_argument("dirs", nargs="*")
+    retention_parser = subparsers.add_parser("retention", help="Apply the retention limits")
+    retention_parser.add_argument("--days", type=float, default=None)
+    retention_parser.add_argument("--max-mb", type=int, default=None)
+    retention_parser.add_argument("--per-test", type=int, default=None)
+    subparsers.add_parser("stats", help="Show indexed file count and size")
+    args = parser.parse_args()
+    
+    manifest = ArtifactManifest.default()
+    if args.command == "backfill":
+        for directory in args.dirs or [TestConfig.SCREENSHOTS_DIR]:
+            print(f"{directory}: indexed {manifest.backfill(directory)} files")
+    elif args.command == "retention":
+        max_bytes = args.max_mb * 1024 * 1024 if args.max_mb is not None else None
+        result = manifest.enforce_retention(args.days, max_bytes, args.per_test, limit=1_000_000)
+        print(f"Removed {result['removed']} files, freed {result['freed_bytes'] // 1024} KB")
+    else:
+        totals = manifest.totals()
+        print(f"{totals['files']} files, {totals['bytes'] // 1024} KB indexed in {manifest.path}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
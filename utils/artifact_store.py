@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from PIL import Image
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+
+
+def safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value).strip("_") or "unnamed"
+
+
+def dhash(data: bytes, size: int = 8) -> Optional[int]:
+    """Difference hash: one bit per horizontally adjacent pixel pair of a
+    (size + 1) x size greyscale thumbnail. Visually similar images differ in
+    only a few bits."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            pixels = list(img.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS).getdata())
+    except Exception:
+        return None
+    
+    value = 0
+    for row in range(size):
+        for column in range(size):
+            left = pixels[row * (size + 1) + column]
+            right = pixels[row * (size + 1) + column + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+class ArtifactStore:
+    """Content-addressed store for screenshots and other test artifacts.
+    
+    Blobs live under objects/<first two hex digits>/<sha256><ext>, so the
+    same bytes are only ever stored once. With near-duplicate detection on,
+    an image whose dHash is within ARTIFACT_DHASH_DISTANCE bits of a stored
+    image of the same size is not stored either; the reference points at the
+    existing blob. Per-test records under records/ list the blobs a test
+    produced.
+    """
+    
+    _lock = threading.Lock()
+    
+    # Loaded indexes by store root, shared by every instance in the process
+    _indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    
+    def __init__(self, root: Optional[str] = None, near_duplicates: Optional[bool] = None):
+        self.root = root or TestConfig.ARTIFACT_STORE_DIR
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.records_dir = os.path.join(self.root, "records")
+        self.index_path = os.path.join(self.root, "index.jsonl")
+        self.near_duplicates = TestConfig.ARTIFACT_NEAR_DUPLICATES if near_duplicates is None else near_duplicates
+        self.max_distance = TestConfig.ARTIFACT_DHASH_DISTANCE
+    
+    def object_path(self, digest: str, ext: str = ".png") -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}{ext}")
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        index = ArtifactStore._indexes.get(os.path.abspath(self.root))
+        if index is None:
+            index = ArtifactStore._indexes[os.path.abspath(self.root)] = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path) as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        index[entry["hash"]] = entry
+        return index
+    
+    def _find_near_duplicate(self, image_hash: int, width: int, height: int) -> Optional[Dict[str, Any]]:
+        for entry in self._load_index().values():
+            if entry.get("dhash") is None or (entry.get("width"), entry.get("height")) != (width, height):
+                continue
+            if bin(entry["dhash"] ^ image_hash).count("1") > self.max_distance:
+                continue
+            # Objects removed by retention stay in the index; never link to one
+            if os.path.exists(self.object_path(entry["hash"], entry["ext"])):
+                return entry
+        return None
+    
+    def put(self, data: bytes, ext: str = ".png", test: Optional[str] = None,
+            name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        digest = hashlib.sha256(data).hexdigest()
+        is_image = ext.lower() in (".png", ".jpg", ".jpeg", ".webp")
+        
+        with ArtifactStore._lock:
+            index = self._load_index()
+            entry = index.get(digest)
+            if entry is not None and not os.path.exists(self.object_path(digest, entry["ext"])):
+                # Removed by retention; store it again
+                entry = None
+            reference = {"hash": digest, "deduplicated": entry is not None, "near_duplicate_of": None}
+            
+            if entry is None and is_image and self.near_duplicates:
+                image_hash = dhash(data)
+                width, height = self._image_size(data)
+                match = self._find_near_duplicate(image_hash, width, height) if image_hash is not None else None
+                if match:
+                    entry = match
+                    reference.update(deduplicated=True, near_duplicate_of=match["hash"])
+                else:
+                    entry = self._write_object(digest, data, ext, image_hash, width, height, test)
+            elif entry is None:
+                width, height = self._image_size(data) if is_image else (None, None)
+                entry = self._write_object(digest, data, ext, None, width, height, test)
+        
+        if reference["deduplicated"]:
+            # Retention ages objects by last use, not by first write
+            ArtifactManifest.touch_file(self.object_path(entry["hash"], entry["ext"]))
+        reference.update(
+            path=os.path.relpath(self.object_path(entry["hash"], entry["ext"]), self.root),
+            size=entry["size"],
+            width=entry.get("width"),
+            height=entry.get("height")
+        )
+        if test:
+            self.add_to_record(test, name or digest[:12], dict(reference, **(metadata or {})))
+        return reference
+    
+    def put_file(self, filepath: str, test: Optional[str] = None, name: Optional[str] = None) -> Dict[str, Any]:
+        with open(filepath, "rb") as file:
+            data = file.read()
+        return self.put(data, os.path.splitext(filepath)[1] or ".bin", test, name or os.path.basename(filepath))
+    
+    def _write_object(self, digest: str, data: bytes, ext: str, image_hash: Optional[int],
+                      width: Optional[int], height: Optional[int], test: Optional[str] = None) -> Dict[str, Any]:
+        path = self.object_path(digest, ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+            ArtifactManifest.record_file(path, "object", test, data)
+        
+        entry = {
+            "hash": digest,
+            "ext": ext,
+            "size": len(data),
+            "width": width,
+            "height": height,
+            "dhash": image_hash,
+            "stored_at": time.time()
+        }
+        # One short line per object; appends from several xdist workers do
+        # not interleave within a line
+        with open(self.index_path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+        self._load_index()[digest] = entry
+        return entry
+    
+    @staticmethod
+    def _image_size(data: bytes):
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                return img.size
+        except Exception:
+            return None, None
+    
+    def record_path(self, test: str) -> str:
+        return os.path.join(self.records_dir, f"{safe_name(test)}.json")
+    
+    def add_to_record(self, test: str, name: str, reference: Dict[str, Any]) -> None:
+        path = self.record_path(test)
+        with ArtifactStore._lock:
+            os.makedirs(self.records_dir, exist_ok=True)
+            record = self.read_record(test) or {"test": test, "artifacts": []}
+            record["artifacts"].append(dict(reference, name=name, created=datetime.now().isoformat()))
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w") as file:
+                json.dump(record, file, indent=2)
+            os.replace(temp_path, path)
+    
+    def read_record(self, test: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.record_path(test)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+    
+    def stats(self) -> Dict[str, Any]:
+        index = self._load_index()
+        return {
+            "objects": len(index),
+            "bytes": sum(entry["size"] for entry in index.values())
+        }
+    
+    def archive(self, destination: str) -> Dict[str, int]:
+        """Copy objects the destination store does not have yet, plus the
+        index and per-test records."""
+        copied = skipped = copied_bytes = 0
+        for directory, _, files in os.walk(self.objects_dir):
+            for filename in files:
+                source = os.path.join(directory, filename)
+                target = os.path.join(destination, os.path.relpath(source, self.root))
+                if os.path.exists(target):
+                    skipped += 1
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(source, target)
+                copied += 1
+                copied_bytes += os.path.getsize(source)
+        
+        destination_store = ArtifactStore(destination)
+        known = set(destination_store._load_index())
+        new_entries = [entry for digest, entry in self._load_index().items() if digest not in known]
+        if new_entries:
+            os.makedirs(destination, exist_ok=True)
+            with open(destination_store.index_path, "a") as file:
+                for entry in new_entries:
+                    file.write(json.dumps(entry) + "\n")
+                    destination_store._load_index()[entry["hash"]] = entry
+        
+        if os.path.isdir(self.records_dir):
+            shutil.copytree(self.records_dir, destination_store.records_dir, dirs_exist_ok=True)
+        
+        return {"copied": copied, "skipped": skipped, "copied_bytes": copied_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed artifact store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    archive_parser = subparsers.add_parser("archive", help="Copy new objects to another store")
+    archive_parser.add_argument("destination")
+    subparsers.add_parser("stats", help="Show object count and size")
+    args = parser.parse_args()
+    
+    store = ArtifactStore()
+    if args.command == "archive":
+        result = store.archive(args.destination)
+        print(f"Archived {result['copied']} new objects ({result['copied_bytes'] // 1024} KB), "
+              f"{result['skipped']} already present")
+    else:
+        stats = store.stats()
+        print(f"{stats['objects']} objects, {stats['bytes'] // 1024} KB in {store.root}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,354 @@
+import asyncio
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, InvalidSelectorException,
+    JavascriptException, NoSuchElementException, NoSuchWindowException, StaleElementReferenceException,
+    TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from utils.driver_manager import DriverManager
+from utils.request_blocking import RequestBlocker
+
+
+ELEMENT_KEY = "element-6066-11e4-a52f-4f735466cecf"
+
+_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element not interactable": ElementNotInteractableException,
+    "element click intercepted": ElementClickInterceptedException,
+    "invalid selector": InvalidSelectorException,
+    "javascript error": JavascriptException,
+    "no such window": NoSuchWindowException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException
+}
+
+# Same visibility test as the displayed check Selenium ships, reduced to the
+# cases the page objects rely on
+_IS_DISPLAYED_SCRIPT = """
+var element = arguments[0];
+var style = window.getComputedStyle(element);
+if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') { return false; }
+var rect = element.getBoundingClientRect();
+return rect.width > 0 && rect.height > 0;
+"""
+
+# Selenium's get_attribute semantics: the property when it is a primitive,
+# the attribute otherwise
+_GET_ATTRIBUTE_SCRIPT = """
+var element = arguments[0], name = arguments[1];
+var value = element[name];
+if (value === undefined || value === null || typeof value === 'object' || typeof value === 'function') {
+    value = element.getAttribute(name);
+}
+if (value === undefined || value === null || value === false) { return null; }
+return String(value);
+"""
+
+
+def to_w3c_locator(by: str, value: str) -> Tuple[str, str]:
+    if by == By.ID:
+        return "css selector", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css selector", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css selector", f".{value}"
+    return by, value
+
+
+class AsyncHttpTransport:
+    """Minimal HTTP/1.1 JSON client over one keep-alive asyncio connection.
+    
+    WebDriver commands for a session are strictly sequential, so a single
+    connection guarded by a lock is all a session needs.
+    """
+    
+    def __init__(self, base_url: str, timeout: float = 120):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self._sent = False
+    
+    async def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        async with self._lock:
+            try:
+                return await self._attempt(method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # A command the driver may already have run (click, send
+                # keys, new session) must not run twice; only a request that
+                # never went out, or a GET, is safe to repeat
+                if self._sent and method != "GET":
+                    raise
+                return await self._attempt(method, path, body)
+    
+    async def _attempt(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        self._sent = False
+        try:
+            return await asyncio.wait_for(self._exchange(method, path, body), self.timeout)
+        except BaseException:
+            # Dropped, timed out or cancelled: a response may still be due on
+            # this connection and would be read as the next command's
+            self._abandon_connection()
+            raise
+    
+    async def _exchange(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if self._writer is not None and (self._reader.at_eof() or self._writer.is_closing()):
+            # The driver closed the idle keep-alive connection; reconnect
+            # before writing rather than finding out from a lost response
+            await self._close_connection()
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        
+        head = (
+            f"{method} {self.base_path}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        self._sent = True
+        self._writer.write(head.encode("ascii") + body)
+        await self._writer.drain()
+        
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by driver")
+        status = int(status_line.split()[1])
+        
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = await self._read_chunked()
+        else:
+            data = await self._reader.readexactly(int(headers.get("content-length", "0")))
+        
+        if headers.get("connection", "").lower() == "close":
+            await self._close_connection()
+        return status, json.loads(data) if data else None
+    
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self._reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await self._reader.readline()
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readline()
+    
+    def _abandon_connection(self) -> None:
+        # Synchronous, so it also runs to completion in a cancelled task
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+    
+    async def _close_connection(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self._reader = None
+        self._writer = None
+    
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close_connection()
+
+
+class AsyncWebElement:
+    
+    def __init__(self, driver: "AsyncWebDriver", element_id: str):
+        self.driver = driver
+        self.id = element_id
+    
+    def _path(self, suffix: str = "") -> str:
+        return f"/element/{self.id}{suffix}"
+    
+    async def click(self) -> None:
+        await self.driver.execute("POST", self._path("/click"), {})
+    
+    async def clear(self) -> None:
+        await self.driver.execute("POST", self._path("/clear"), {})
+    
+    async def send_keys(self, text: str) -> None:
+        await self.driver.execute("POST", self._path("/value"), {"text": text, "value": list(text)})
+    
+    async def submit(self) -> None:
+        await self.driver.execute_script(
+            "var form = arguments[0].form || arguments[0].closest('form');"
+            "if (form.requestSubmit) { form.requestSubmit(); } else { form.submit(); }", self
+        )
+    
+    async def get_text(self) -> str:
+        return await self.driver.execute("GET", self._path("/text")) or ""
+    
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return await self.driver.execute_script(_GET_ATTRIBUTE_SCRIPT, self, name)
+    
+    async def is_displayed(self) -> bool:
+        return bool(await self.driver.execute_script(_IS_DISPLAYED_SCRIPT, self))
+    
+    async def is_enabled(self) -> bool:
+        return bool(await self.driver.execute("GET", self._path("/enabled")))
+    
+    async def find_element(self, by: str, value: str) -> "AsyncWebElement":
+        using, selector = to_w3c_locator(by, value)
+        result = await self.driver.execute("POST", self._path("/element"), {"using": using, "value": selector})
+        return AsyncWebElement(self.driver, result[ELEMENT_KEY])
+
+
+class AsyncWebDriver:
+    """W3C WebDriver session driven from asyncio.
+    
+    Talks to a chromedriver/geckodriver/msedgedriver process over plain
+    HTTP without a thread per command, so one event loop can drive many
+    sessions. Method names follow Selenium's WebDriver where they exist.
+    """
+    
+    def __init__(self, transport: AsyncHttpTransport, session_id: str, browser: str,
+                 capabilities: Optional[Dict[str, Any]] = None):
+        self.transport = transport
+        self.session_id = session_id
+        self.browser = browser
+        self.capabilities = capabilities or {}
+    
+    async def execute(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        status, data = await self.transport.request(method, f"/session/{self.session_id}{path}", payload)
+        return AsyncWebDriver._unwrap(status, data)
+    
+    @staticmethod
+    def _unwrap(status: int, data: Any) -> Any:
+        value = data.get("value") if isinstance(data, dict) else data
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            error = value.get("error", "unknown error") if isinstance(value, dict) else "unknown error"
+            message = value.get("message", "") if isinstance(value, dict) else str(value)
+            raise _ERRORS.get(error, WebDriverException)(f"{error}: {message}")
+        return value
+    
+    def _wrap_arguments(self, args) -> List[Any]:
+        return [{ELEMENT_KEY: arg.id} if isinstance(arg, AsyncWebElement) else arg for arg in args]
+    
+    def _unwrap_result(self, value: Any) -> Any:
+        if isinstance(value, dict) and ELEMENT_KEY in value:
+            return AsyncWebElement(self, value[ELEMENT_KEY])
+        if isinstance(value, list):
+            return [self._unwrap_result(item) for item in value]
+        return value
+    
+    async def get(self, url: str) -> None:
+        await self.execute("POST", "/url", {"url": url})
+    
+    async def refresh(self) -> None:
+        await self.execute("POST", "/refresh", {})
+    
+    async def back(self) -> None:
+        await self.execute("POST", "/back", {})
+    
+    async def get_current_url(self) -> str:
+        return await self.execute("GET", "/url")
+    
+    async def get_title(self) -> str:
+        return await self.execute("GET", "/title")
+    
+    async def get_window_handles(self) -> List[str]:
+        return await self.execute("GET", "/window/handles")
+    
+    async def switch_to_window(self, handle: str) -> None:
+        await self.execute("POST", "/window", {"handle": handle})
+    
+    async def set_page_load_timeout(self, seconds: float) -> None:
+        await self.execute("POST", "/timeouts", {"pageLoad": int(seconds * 1000)})
+    
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        using, selector = to_w3c_locator(by, value)
+        result = await self.execute("POST", "/element", {"using": using, "value": selector})
+        return AsyncWebElement(self, result[ELEMENT_KEY])
+    
+    async def find_elements(self, by: str, value: str) -> List[AsyncWebElement]:
+        using, selector = to_w3c_locator(by, value)
+        results = await self.execute("POST", "/elements", {"using": using, "value": selector})
+        return [AsyncWebElement(self, result[ELEMENT_KEY]) for result in results]
+    
+    async def execute_script(self, script: str, *args) -> Any:
+        value = await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap_arguments(args)})
+        return self._unwrap_result(value)
+    
+    async def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(await self.execute("GET", "/screenshot"))
+    
+    async def execute_cdp_cmd(self, cmd: str, params: Dict[str, Any]) -> Any:
+        vendor = {"chrome": "goog", "edge": "ms"}.get(self.browser)
+        if vendor is None:
+            raise WebDriverException(f"DevTools commands are not available for {self.browser}")
+        return await self.execute("POST", f"/{vendor}/cdp/execute", {"cmd": cmd, "params": params})
+    
+    async def quit(self) -> None:
+        try:
+            await self.transport.request("DELETE", f"/session/{self.session_id}")
+        finally:
+            await self.transport.close()
+
+
+class AsyncDriverService:
+    """One driver process hosting many asyncio-driven browser sessions."""
+    
+    def __init__(self, browser: str = "chrome"):
+        self.browser = browser.lower()
+        self._service = None
+    
+    @property
+    def url(self) -> str:
+        return self._service.service_url
+    
+    async def start(self) -> "AsyncDriverService":
+        if self._service is None:
+            service = DriverManager.get_service(self.browser)
+            await asyncio.to_thread(service.start)
+            self._service = service
+        return self
+    
+    async def new_session(self, headless: bool = True, block_profile: Optional[str] = None) -> AsyncWebDriver:
+        await self.start()
+        options = DriverManager.get_options(self.browser, headless=headless, block_profile=block_profile)
+        capabilities = json.loads(json.dumps(options.to_capabilities(), default=str))
+        
+        transport = AsyncHttpTransport(self.url)
+        status, data = await transport.request("POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+        try:
+            value = AsyncWebDriver._unwrap(status, data)
+        except WebDriverException:
+            await transport.close()
+            raise
+        
+        driver = AsyncWebDriver(transport, value["sessionId"], self.browser, value.get("capabilities"))
+        if block_profile and self.browser in ("chrome", "edge"):
+            patterns = RequestBlocker.get_patterns(block_profile)
+            if patterns:
+                await driver.execute_cdp_cmd("Network.enable", {})
+                await driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return driver
+    
+    async def stop(self) -> None:
+        if self._service is not None:
+            await asyncio.to_thread(self._service.stop)
+            self._service = None
\ No newline at end of file
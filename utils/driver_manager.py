@@ -8,27 +8,100 @@ from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
+from utils.network_log import NetworkLog
+from utils.request_blocking import RequestBlocker
+from utils.replay_proxy import ReplayProxy
+from utils.profile_template import ProfileTemplate
+from utils.step_frames import StepFrames
+from utils.run_metrics import RunMetrics
+from config.config import TestConfig
 import os
-from typing import Optional
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 
 class DriverManager:
     
+    _session_profiles = weakref.WeakKeyDictionary()
+    
+    _live_drivers = weakref.WeakSet()
+    
+    @staticmethod
+    def get_driver(browser: str = "chrome", headless: bool = False, block_profile: Optional[str] = None,
+                   user_data_dir: Optional[str] = None) -> webdriver.Remote:
+        browser = browser.lower()
+        if browser not in ("chrome", "firefox", "edge"):
+            raise ValueError(f"Unsupported browser: {browser}")
+        
+        proxy = ReplayProxy.current_address()
+        template = None
+        session_profile = None
+        if user_data_dir is None and TestConfig.USE_PROFILE_TEMPLATE:
+            template = ProfileTemplate(browser)
+            session_profile = template.session_copy()
+            user_data_dir = session_profile
+        
+        started = time.perf_counter()
+        try:
+            if browser == "chrome":
+                driver = DriverManager._get_chrome_driver(headless, block_profile, proxy, user_data_dir)
+            elif browser == "firefox":
+                driver = DriverManager._get_firefox_driver(headless, block_profile, proxy, user_data_dir)
+            else:
+                driver = DriverManager._get_edge_driver(headless, block_profile, proxy, user_data_dir)
+        except Exception:
+            ProfileTemplate.remove_session_copy(session_profile)
+            RunMetrics.inc("selenium_driver_start_failures_total", browser=browser)
+            raise
+        RunMetrics.inc("selenium_driver_starts_total", browser=browser)
+        RunMetrics.inc("selenium_driver_start_seconds_total", time.perf_counter() - started, browser=browser)
+        
+        if session_profile:
+            DriverManager._session_profiles[driver] = session_profile
+            template.check_browser_version(driver.capabilities.get("browserVersion", ""))
+        DriverManager._live_drivers.add(driver)
+        RunMetrics.set("selenium_drivers_active", len(DriverManager._live_drivers))
+        return driver
+    
+    @staticmethod
+    def is_live(driver) -> bool:
+        try:
+            return driver in DriverManager._live_drivers
+        except TypeError:
+            return False
+    
+    @staticmethod
+    def get_options(browser: str = "chrome", headless: bool = False, block_profile: Optional[str] = None):
+        browser = browser.lower()
+        proxy = ReplayProxy.current_address()
+        
+        if browser == "chrome":
+            return DriverManager._chrome_options(headless, block_profile, proxy)
+        elif browser == "firefox":
+            return DriverManager._firefox_options(headless, block_profile, proxy)
+        elif browser == "edge":
+            return DriverManager._edge_options(headless, block_profile, proxy)
+        else:
+            raise ValueError(f"Unsupported browser: {browser}")
+    
     @staticmethod
-    def get_driver(browser: str = "chrome", headless: bool = False) -> webdriver.Remote:
+    def get_service(browser: str = "chrome"):
         browser = browser.lower()
         
         if browser == "chrome":
-            return DriverManager._get_chrome_driver(headless)
+            return ChromeService(ChromeDriverManager().install())
         elif browser == "firefox":
-            return DriverManager._get_firefox_driver(headless)
+            return FirefoxService(GeckoDriverManager().install())
         elif browser == "edge":
-            return DriverManager._get_edge_driver(headless)
+            return EdgeService(EdgeChromiumDriverManager().install())
         else:
             raise ValueError(f"Unsupported browser: {browser}")
     
     @staticmethod
-    def _get_chrome_driver(headless: bool = False) -> webdriver.Chrome:
+    def _chrome_options(headless: bool = False, block_profile: Optional[str] = None, proxy: Optional[str] = None,
+                        user_data_dir: Optional[str] = None) -> ChromeOptions:
         options = ChromeOptions()
         
         if headless:
@@ -42,11 +115,22 @@ class DriverManager:
         options.add_argument("--disable-web-security")
         options.add_argument("--allow-running-insecure-content")
         
-        service = ChromeService(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+        
+        if proxy:
+            for argument in ReplayProxy.chromium_arguments(proxy):
+                options.add_argument(argument)
+            # HTTPS through the proxy is signed by its local CA
+            options.accept_insecure_certs = True
+        
+        if block_profile:
+            NetworkLog.enable_capability(options)
+        return options
     
     @staticmethod
-    def _get_firefox_driver(headless: bool = False) -> webdriver.Firefox:
+    def _firefox_options(headless: bool = False, block_profile: Optional[str] = None, proxy: Optional[str] = None,
+                        user_data_dir: Optional[str] = None) -> FirefoxOptions:
         options = FirefoxOptions()
         
         if headless:
@@ -55,11 +139,26 @@ class DriverManager:
         options.add_argument("--width=1920")
         options.add_argument("--height=1080")
         
-        service = FirefoxService(GeckoDriverManager().install())
-        return webdriver.Firefox(service=service, options=options)
+        if user_data_dir:
+            options.add_argument("-profile")
+            options.add_argument(user_data_dir)
+            # Firefox keeps its disk cache outside the profile by default
+            options.set_preference("browser.cache.disk.parent_directory", user_data_dir)
+        
+        if proxy:
+            ReplayProxy.apply_firefox_preferences(options, proxy)
+            options.accept_insecure_certs = True
+        
+        if block_profile:
+            # The PAC script replaces the manual proxy settings, so it has to
+            # route unblocked requests through the replay proxy itself
+            upstream = f"PROXY {proxy}" if proxy else "DIRECT"
+            RequestBlocker.apply_firefox_preferences(options, block_profile, upstream)
+        return options
     
     @staticmethod
-    def _get_edge_driver(headless: bool = False) -> webdriver.Edge:
+    def _edge_options(headless: bool = False, block_profile: Optional[str] = None, proxy: Optional[str] = None,
+                        user_data_dir: Optional[str] = None) -> EdgeOptions:
         options = EdgeOptions()
         
         if headless:
@@ -70,13 +169,90 @@ class DriverManager:
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
         
-        service = EdgeService(EdgeChromiumDriverManager().install())
-        return webdriver.Edge(service=service, options=options)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+        
+        if proxy:
+            for argument in ReplayProxy.chromium_arguments(proxy):
+                options.add_argument(argument)
+            # HTTPS through the proxy is signed by its local CA
+            options.accept_insecure_certs = True
+        
+        if block_profile:
+            NetworkLog.enable_capability(options)
+        return options
+    
+    @staticmethod
+    def _get_chrome_driver(headless: bool = False, block_profile: Optional[str] = None, proxy: Optional[str] = None,
+                           user_data_dir: Optional[str] = None) -> webdriver.Chrome:
+        options = DriverManager._chrome_options(headless, block_profile, proxy, user_data_dir)
+        driver = webdriver.Chrome(service=DriverManager.get_service("chrome"), options=options)
+        
+        if block_profile:
+            RequestBlocker.apply_chromium(driver, block_profile)
+        return driver
+    
+    @staticmethod
+    def _get_firefox_driver(headless: bool = False, block_profile: Optional[str] = None, proxy: Optional[str] = None,
+                           user_data_dir: Optional[str] = None) -> webdriver.Firefox:
+        options = DriverManager._firefox_options(headless, block_profile, proxy, user_data_dir)
+        return webdriver.Firefox(service=DriverManager.get_service("firefox"), options=options)
+    
+    @staticmethod
+    def _get_edge_driver(headless: bool = False, block_profile: Optional[str] = None, proxy: Optional[str] = None,
+                           user_data_dir: Optional[str] = None) -> webdriver.Edge:
+        options = DriverManager._edge_options(headless, block_profile, proxy, user_data_dir)
+        driver = webdriver.Edge(service=DriverManager.get_service("edge"), options=options)
+        
+        if block_profile:
+            RequestBlocker.apply_chromium(driver, block_profile)
+        return driver
+    
+    @staticmethod
+    @contextmanager
+    def session(browser: str = "chrome", headless: bool = False, block_profile: Optional[str] = None,
+                user_data_dir: Optional[str] = None) -> Iterator[webdriver.Remote]:
+        """A driver for the duration of the block, for tests that create
+        their own. Failure evidence is collected only when an exception
+        propagates out of the block, before the session is quit."""
+        driver = DriverManager.get_driver(browser, headless, block_profile, user_data_dir)
+        try:
+            yield driver
+        except BaseException as error:
+            DriverManager._collect_failure_evidence(driver, error)
+            raise
+        finally:
+            DriverManager.quit_driver(driver)
     
     @staticmethod
     def quit_driver(driver: Optional[webdriver.Remote]) -> None:
         if driver:
+            DriverManager._live_drivers.discard(driver)
+            RunMetrics.set("selenium_drivers_active", len(DriverManager._live_drivers))
+            StepFrames.discard(driver)
             try:
                 driver.quit()
             except Exception as e:
-                print(f"Error closing driver: {e}")
\ No newline at end of file
+                print(f"Error closing driver: {e}")
+            ProfileTemplate.remove_session_copy(DriverManager._session_profiles.pop(driver, None))
+    
+    @staticmethod
+    def _collect_failure_evidence(driver, error: BaseException) -> None:
+        if not (TestConfig.EVIDENCE_ON_FAILURE or StepFrames.enabled) or driver not in DriverManager._live_drivers:
+            return
+        if isinstance(error, (KeyboardInterrupt, SystemExit, GeneratorExit)):
+            return
+        import pytest
+        if isinstance(error, (pytest.skip.Exception, pytest.xfail.Exception)):
+            return
+        
+        test = os.environ.get("PYTEST_CURRENT_TEST", "unknown").rsplit(" (", 1)[0]
+        if TestConfig.EVIDENCE_ON_FAILURE:
+            from utils.failure_evidence import FailureEvidence
+            path = FailureEvidence.collect(driver, test)
+            if path:
+                print(f"Failure evidence saved: {path}")
+        if StepFrames.enabled:
+            directory = StepFrames.flush(driver, test)
+            if directory:
+                print(f"Step frames saved: {directory}")
\ No newline at end of file
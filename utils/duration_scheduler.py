@@ -0,0 +1,226 @@
+import heapq
+import json
+import os
+import statistics
+import time
+from typing import Dict, List, Optional
+import pytest
+from xdist.scheduler import LoadGroupScheduling
+from config.config import TestConfig
+from utils.timing_history import TimingHistory
+
+
+class DurationScheduling(LoadGroupScheduling):
+    """Longest-processing-time-first scheduling for xdist.
+    
+    Each test is its own work unit, except tests sharing a loadgroup or
+    marked parallel_unsafe, which form one unit that runs on a single
+    worker. Units are queued by their estimated duration from the timing
+    history, longest first, and a worker gets the next unit only when it
+    is nearly idle, so the long tests start early and the short ones fill
+    in at the end instead of one slow test becoming the tail of the run.
+    """
+    
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        if log is not None:
+            self.log = log.durationsched
+        self.unit_seconds: Dict[str, float] = {}
+        self.estimated_from_history = 0
+        self.predicted_makespan = 0.0
+        self.predicted_loads: List[float] = []
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.busy: Dict[str, float] = {}
+    
+    @staticmethod
+    def estimate(nodeids: List[str], known: Dict[str, float], default: float) -> Dict[str, float]:
+        """Seconds per test: its own history, else the mean of its other
+        parametrizations, else of its class or module, else the median of
+        all known tests."""
+        by_function: Dict[str, List[float]] = {}
+        by_parent: Dict[str, List[float]] = {}
+        for nodeid, seconds in known.items():
+            by_function.setdefault(nodeid.split("[", 1)[0], []).append(seconds)
+            by_parent.setdefault(nodeid.split("[", 1)[0].rsplit("::", 1)[0], []).append(seconds)
+        fallback = statistics.median(known.values()) if known else default
+        
+        estimates = {}
+        for nodeid in nodeids:
+            base = TimingHistory.base_nodeid(nodeid)
+            function = base.split("[", 1)[0]
+            if base in known:
+                estimates[nodeid] = known[base]
+            elif function in by_function:
+                estimates[nodeid] = statistics.mean(by_function[function])
+            elif function.rsplit("::", 1)[0] in by_parent:
+                estimates[nodeid] = statistics.mean(by_parent[function.rsplit("::", 1)[0]])
+            else:
+                estimates[nodeid] = fallback
+        return estimates
+    
+    @staticmethod
+    def predict(unit_seconds: List[float], workers: int) -> List[float]:
+        """Per-worker load of greedy list scheduling over units already
+        sorted longest first."""
+        loads = [0.0] * max(1, workers)
+        heapq.heapify(loads)
+        for seconds in unit_seconds:
+            heapq.heappush(loads, heapq.heappop(loads) + seconds)
+        return sorted(loads, reverse=True)
+    
+    def _known_durations(self) -> Dict[str, float]:
+        if not os.path.exists(TestConfig.TIMING_HISTORY_DB):
+            return {}
+        history = TimingHistory()
+        try:
+            return history.estimates(TestConfig.BROWSER, TestConfig.SCHEDULER_HISTORY_RUNS)
+        finally:
+            history.close()
+    
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+        
+        # Initial distribution already happened, reschedule on all nodes
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+        
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        
+        self.collection = list(next(iter(self.registered_collections.values())))
+        if not self.collection:
+            return
+        
+        units: Dict[str, Dict[str, bool]] = {}
+        for nodeid in self.collection:
+            units.setdefault(self._split_scope(nodeid), {})[nodeid] = False
+        
+        known = self._known_durations()
+        estimates = self.estimate(self.collection, known, TestConfig.SCHEDULER_DEFAULT_SECONDS)
+        self.estimated_from_history = sum(1 for nodeid in self.collection if TimingHistory.base_nodeid(nodeid) in known)
+        self.unit_seconds = {scope: sum(estimates[nodeid] for nodeid in unit) for scope, unit in units.items()}
+        for scope in sorted(units, key=lambda scope: -self.unit_seconds[scope]):
+            self.workqueue[scope] = units[scope]
+        
+        # Avoid having more workers than work
+        for _ in range(max(0, len(self.nodes) - len(self.workqueue))):
+            unused_node, _ = self.assigned_work.popitem()
+            self.log(f"Shutting down unused node {unused_node}")
+            unused_node.shutdown()
+        
+        self.predicted_loads = self.predict(list(self.unit_seconds[scope] for scope in self.workqueue), len(self.nodes))
+        self.predicted_makespan = self.predicted_loads[0]
+        self.started = time.monotonic()
+        
+        for node in self.nodes:
+            self._assign_work_unit(node)
+        for node in self.nodes:
+            self._reschedule(node)
+        
+        if not self.workqueue:
+            for node in self.nodes:
+                node.shutdown()
+    
+    def _reschedule(self, node) -> None:
+        if node.shutting_down:
+            return
+        if not self.workqueue:
+            node.shutdown()
+            return
+        # The worker holds back its last test until it knows the next one,
+        # so one pending test means it is about to go idle
+        if self._pending_of(self.assigned_work[node]) > 1:
+            return
+        self._assign_work_unit(node)
+    
+    def mark_test_complete(self, node, item_index: int, duration: float = 0) -> None:
+        worker = node.gateway.id
+        self.busy[worker] = self.busy.get(worker, 0.0) + duration
+        self.finished = time.monotonic()
+        super().mark_test_complete(node, item_index, duration)
+    
+    def summary(self) -> Optional[Dict]:
+        if self.started is None:
+            return None
+        actual = (self.finished or time.monotonic()) - self.started
+        return {
+            "tests": len(self.collection or ()),
+            "units": len(self.unit_seconds),
+            "tests_with_history": self.estimated_from_history,
+            "predicted_makespan": round(self.predicted_makespan, 1),
+            "actual_makespan": round(actual, 1),
+            "predicted_worker_seconds": [round(load, 1) for load in self.predicted_loads],
+            "actual_worker_seconds": {worker: round(seconds, 1) for worker, seconds in sorted(self.busy.items())}
+        }
+
+
+class DurationSchedulerPlugin:
+    """Installs DurationScheduling for `-n` runs and groups constrained tests.
+    
+    On the workers, tests marked loadgroup or parallel_unsafe get an
+    "@group" suffix on their node id, the convention xdist's own loadgroup
+    scheduling uses to keep a group on one worker.
+    """
+    
+    DISTRIBUTED_MODES = ("load", "loadscope", "loadfile", "loadgroup", "worksteal")
+    
+    def __init__(self):
+        self.scheduler: Optional[DurationScheduling] = None
+    
+    @staticmethod
+    def group_of(item) -> Optional[str]:
+        if item.get_closest_marker("parallel_unsafe"):
+            # All unsafe tests run one after another on the same worker
+            return "parallel_unsafe"
+        marker = item.get_closest_marker("loadgroup")
+        if marker is None:
+            return None
+        name = marker.args[0] if marker.args else marker.kwargs.get("name")
+        # An unnamed loadgroup keeps the test with its class or module
+        return str(name or item.nodeid.split("[", 1)[0].rsplit("::", 1)[0]).replace("@", "_")
+    
+    def pytest_configure_node(self, node):
+        # Workers always see dist="no"; tell them whether to group
+        node.workerinput["duration_scheduling"] = node.config.getvalue("dist") in self.DISTRIBUTED_MODES
+    
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if not getattr(config, "workerinput", {}).get("duration_scheduling"):
+            return
+        for item in items:
+            group = self.group_of(item)
+            if group and "@" not in item.nodeid.rsplit("]", 1)[-1]:
+                item._nodeid = f"{item.nodeid}@{group}"
+    
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getvalue("dist") not in self.DISTRIBUTED_MODES:
+            return None
+        self.scheduler = DurationScheduling(config, log)
+        return self.scheduler
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        summary = self.scheduler.summary() if self.scheduler else None
+        if not summary:
+            return
+        
+        terminalreporter.section("Duration scheduling")
+        terminalreporter.write_line(
+            f"{summary['tests']} tests in {summary['units']} units, "
+            f"{summary['tests_with_history']} estimated from history"
+        )
+        terminalreporter.write_line(
+            f"Predicted makespan {summary['predicted_makespan']}s, actual {summary['actual_makespan']}s"
+        )
+        terminalreporter.write_line(f"Worker busy seconds: {summary['actual_worker_seconds']}")
+        
+        path = os.path.join(TestConfig.REPORTS_DIR, "schedule.json")
+        try:
+            os.makedirs(TestConfig.REPORTS_DIR, exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(summary, file, indent=2)
+        except OSError as e:
+            print(f"Failed to write schedule summary: {e}")
\ No newline at end of file
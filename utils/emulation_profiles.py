@@ -0,0 +1,130 @@
+import weakref
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+
+
+# Throughput values are bytes per second, latency is the added round-trip
+# time in milliseconds, matching Network.emulateNetworkConditions.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "cable": {
+        "network": {"latency": 28, "download_throughput": 5 * 1024 * 1024 // 8, "upload_throughput": 1024 * 1024 // 8},
+        "cpu_slowdown": 1,
+        "device": None
+    },
+    "4G": {
+        "network": {"latency": 170, "download_throughput": 9 * 1024 * 1024 // 8, "upload_throughput": 9 * 1024 * 1024 // 8},
+        "cpu_slowdown": 1,
+        "device": None
+    },
+    "3G-fast": {
+        "network": {"latency": 563, "download_throughput": 1600 * 1024 // 8, "upload_throughput": 750 * 1024 // 8},
+        "cpu_slowdown": 1,
+        "device": None
+    },
+    "3G-slow": {
+        "network": {"latency": 2000, "download_throughput": 400 * 1024 // 8, "upload_throughput": 400 * 1024 // 8},
+        "cpu_slowdown": 1,
+        "device": None
+    },
+    "low-end-mobile": {
+        "network": {"latency": 563, "download_throughput": 1600 * 1024 // 8, "upload_throughput": 750 * 1024 // 8},
+        "cpu_slowdown": 6,
+        "device": {
+            "width": 360,
+            "height": 640,
+            "device_scale_factor": 2,
+            "mobile": True,
+            "user_agent": (
+                "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+            )
+        }
+    }
+}
+
+UNTHROTTLED = "unthrottled"
+
+
+class EmulationProfiles:
+    """Named network/CPU/device conditions applied over the DevTools protocol.
+    
+    Only Chromium-based drivers expose the protocol; on other browsers a
+    profile cannot be applied and the session is tagged as unthrottled.
+    """
+    
+    _active = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def names() -> List[str]:
+        return list(PROFILES.keys())
+    
+    @staticmethod
+    def get_profile(name: str) -> Dict[str, Any]:
+        if name not in PROFILES:
+            raise ValueError(f"Unknown emulation profile: {name}. Available: {', '.join(PROFILES)}")
+        return PROFILES[name]
+    
+    @staticmethod
+    def apply(driver, name: Optional[str]) -> bool:
+        if not name or name == UNTHROTTLED:
+            EmulationProfiles._active[driver] = UNTHROTTLED
+            return True
+        
+        profile = EmulationProfiles.get_profile(name)
+        
+        if not hasattr(driver, "execute_cdp_cmd"):
+            print(f"Emulation profile '{name}' requires a Chromium browser; running unthrottled")
+            EmulationProfiles._active[driver] = UNTHROTTLED
+            return False
+        
+        network = profile["network"]
+        device = profile["device"]
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+                "offline": False,
+                "latency": network["latency"],
+                "downloadThroughput": network["download_throughput"],
+                "uploadThroughput": network["upload_throughput"]
+            })
+            driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_slowdown"]})
+            
+            if device:
+                driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+                    "width": device["width"],
+                    "height": device["height"],
+                    "deviceScaleFactor": device["device_scale_factor"],
+                    "mobile": device["mobile"]
+                })
+                driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": device["mobile"]})
+                driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": device["user_agent"]})
+        except WebDriverException as e:
+            print(f"Failed to apply emulation profile '{name}': {e}")
+            EmulationProfiles._active[driver] = UNTHROTTLED
+            return False
+        
+        EmulationProfiles._active[driver] = name
+        return True
+    
+    @staticmethod
+    def clear(driver) -> None:
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+                    "offline": False,
+                    "latency": 0,
+                    "downloadThroughput": -1,
+                    "uploadThroughput": -1
+                })
+                driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": 1})
+                driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+            except WebDriverException:
+                pass
+        EmulationProfiles._active[driver] = UNTHROTTLED
+    
+    @staticmethod
+    def active_profile(driver) -> str:
+        try:
+            return EmulationProfiles._active.get(driver, UNTHROTTLED)
+        except TypeError:
+            return UNTHROTTLED
\ No newline at end of file
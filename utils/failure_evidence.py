@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from config.config import TestConfig
+from utils.action_trail import ActionTrail
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import ArtifactStore, safe_name
+from utils.network_log import NetworkLog
+
+
+class FailureEvidence:
+    """One compressed bundle of everything useful about a failed test.
+    
+    Screenshot, DOM, console log, network log, URL/title and the page-object
+    action trail are requested concurrently, and whatever has not arrived
+    when EVIDENCE_TIME_BUDGET runs out is listed as timed out in the bundle
+    manifest instead of holding up the run. The screenshot also goes into
+    the artifact store as the test's FAILURE image.
+    """
+    
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                # Sized so a bundle's collectors never wait on each other;
+                # collectors still running past the budget keep their threads
+                cls._executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix="evidence")
+            return cls._executor
+    
+    @staticmethod
+    def _collectors(driver) -> Dict[str, Callable[[], Any]]:
+        collectors = {
+            "page": lambda: {"url": driver.current_url, "title": driver.title},
+            "dom": lambda: driver.page_source,
+            "console": lambda: driver.get_log("browser"),
+            "network": lambda: NetworkLog.recent(driver, TestConfig.EVIDENCE_NETWORK_EVENTS),
+            "actions": lambda: ActionTrail.recent(driver)
+        }
+        if TestConfig.SCREENSHOT_ON_FAILURE:
+            collectors["screenshot"] = driver.get_screenshot_as_png
+        return collectors
+    
+    @classmethod
+    def collect(cls, driver, test: str, budget: Optional[float] = None) -> Optional[str]:
+        budget = TestConfig.EVIDENCE_TIME_BUDGET if budget is None else budget
+        started = time.perf_counter()
+        executor = cls._get_executor()
+        
+        futures = {}
+        for name, collector in cls._collectors(driver).items():
+            futures[executor.submit(cls._timed, collector)] = name
+        done, _ = wait(futures, timeout=budget)
+        
+        items: Dict[str, Any] = {}
+        report: Dict[str, Any] = {}
+        for future, name in futures.items():
+            if future not in done:
+                report[name] = {"status": "timed out"}
+                continue
+            value, elapsed, error = future.result()
+            if error:
+                report[name] = {"status": "error", "error": error, "seconds": elapsed}
+            else:
+                items[name] = value
+                report[name] = {"status": "ok", "seconds": elapsed}
+        
+        collected_in = time.perf_counter() - started
+        try:
+            return cls._write_bundle(test, items, report, collected_in)
+        except OSError as e:
+            print(f"Failed to write failure evidence for {test}: {e}")
+            return None
+    
+    @staticmethod
+    def _timed(collector: Callable[[], Any]):
+        started = time.perf_counter()
+        try:
+            return collector(), round(time.perf_counter() - started, 3), None
+        except Exception as e:
+            return None, round(time.perf_counter() - started, 3), f"{type(e).__name__}: {e}"
+    
+    @staticmethod
+    def _write_bundle(test: str, items: Dict[str, Any], report: Dict[str, Any], collected_in: float) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        path = os.path.join(TestConfig.EVIDENCE_DIR, f"{safe_name(test)}_{timestamp}.zip")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        manifest = {
+            "test": test,
+            "created": datetime.now().isoformat(),
+            "collected_seconds": round(collected_in, 3),
+            "items": report
+        }
+        screenshot = items.pop("screenshot", None)
+        if screenshot:
+            reference = ArtifactStore().put(screenshot, ".png", test, "FAILURE")
+            manifest["screenshot_object"] = reference["path"]
+        
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as bundle:
+            if screenshot:
+                # PNG is already compressed
+                bundle.writestr("screenshot.png", screenshot, compress_type=zipfile.ZIP_STORED)
+            if "dom" in items:
+                bundle.writestr("dom.html", items.pop("dom") or "")
+            for name, value in items.items():
+                bundle.writestr(f"{name}.json", json.dumps(value, indent=2, default=str))
+            bundle.writestr("manifest.json", json.dumps(manifest, indent=2))
+        
+        ArtifactManifest.record_file(path, "evidence", test)
+        return path
\ No newline at end of file
@@ -0,0 +1,273 @@
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+from PIL import Image
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import ArtifactStore
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+STYLESHEET = """body { font: 14px/1.4 sans-serif; margin: 1.5em; color: #222; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+td.outcome { font-weight: bold; text-transform: uppercase; font-size: 12px; }
+tr.passed td.outcome { color: #2a7d2a; }
+tr.failed td.outcome, tr.error td.outcome { color: #c0392b; }
+tr.skipped td.outcome, tr.rerun td.outcome { color: #a67c00; }
+pre { white-space: pre-wrap; background: #f6f6f6; padding: 6px; max-height: 30em; overflow: auto; font-size: 12px; }
+.artifacts a { display: inline-block; margin: 4px 6px 0 0; font-size: 12px; }
+.artifacts img { display: block; border: 1px solid #ccc; }
+.meta { color: #666; }
+"""
+
+
+class LightReport:
+    """HTML report written row by row while the run is in progress.
+    
+    The page shell is written at session start and each test's row is
+    appended and flushed when its teardown finishes, so the report can be
+    opened mid-run. Nothing is embedded: styles live in report.css next to
+    the report, artifacts are linked by relative path and failed tests show
+    small lazily loaded JPEG thumbnails made once into <report>_assets/.
+    A JSON sidecar with the totals lets merge() build an index of several
+    reports without reading their HTML.
+    """
+    
+    def __init__(self, path: str, title: Optional[str] = None):
+        self.path = os.path.abspath(path)
+        self.directory = os.path.dirname(self.path)
+        self.name = os.path.splitext(os.path.basename(self.path))[0]
+        self.title = title or self.name.replace("_", " ").title()
+        self.assets_dir = os.path.join(self.directory, f"{self.name}_assets")
+        self.counts: Dict[str, int] = {}
+        self.failures: List[Dict[str, str]] = []
+        self.started = time.time()
+        self.rows = 0
+        self._file = None
+    
+    @staticmethod
+    def summary_path(report_path: str) -> str:
+        return os.path.splitext(report_path)[0] + ".summary.json"
+    
+    @staticmethod
+    def write_stylesheet(directory: str) -> None:
+        path = os.path.join(directory, "report.css")
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            file.write(STYLESHEET)
+        os.replace(temp_path, path)
+    
+    def _relative(self, path: str) -> str:
+        return quote(os.path.relpath(path, self.directory).replace(os.sep, "/"))
+    
+    def open(self, details: Dict[str, str]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.write_stylesheet(self.directory)
+        meta = " · ".join(f"{html.escape(key)}: {html.escape(str(value))}" for key, value in details.items() if value)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(self.title)}</title><link rel=\"stylesheet\" href=\"report.css\"></head><body>\n"
+            f"<h1>{html.escape(self.title)}</h1>\n"
+            f"<p class=\"meta\">Started {datetime.fromtimestamp(self.started):%Y-%m-%d %H:%M:%S} · {meta}</p>\n"
+            "<table><thead><tr><th>Result</th><th>Test</th><th>Duration</th><th>Details</th></tr></thead><tbody>\n"
+        )
+        self._file.flush()
+    
+    def add(self, nodeid: str, outcome: str, duration: float, longrepr: str = "", sections: str = "") -> None:
+        self.rows += 1
+        anchor = f"t{self.rows}"
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        
+        details = ""
+        if outcome in ("failed", "error"):
+            message = next((line for line in longrepr.splitlines() if line.startswith("E ")), "")
+            self.failures.append({"nodeid": nodeid, "anchor": anchor, "outcome": outcome, "message": message[2:].strip()})
+            log = (longrepr + ("\n\n" + sections if sections else ""))[:TestConfig.REPORT_LOG_CHARS]
+            details = (
+                f"<details><summary>{html.escape(message[2:].strip() or outcome)}</summary>"
+                f"<pre>{html.escape(log)}</pre>{self._artifacts_html(nodeid)}</details>"
+            )
+        elif outcome == "skipped" and longrepr:
+            details = html.escape(longrepr.splitlines()[-1])
+        
+        self._file.write(
+            f"<tr id=\"{anchor}\" class=\"{outcome}\"><td class=\"outcome\">{outcome}</td>"
+            f"<td>{html.escape(nodeid)}</td><td>{duration:.2f}s</td><td>{details}</td></tr>\n"
+        )
+        self._file.flush()
+    
+    def _artifacts(self, nodeid: str) -> List[Dict[str, Any]]:
+        artifacts = {}
+        if os.path.exists(TestConfig.ARTIFACT_MANIFEST):
+            for entry in ArtifactManifest.default().for_test(nodeid):
+                if entry["kind"] not in ("object", "variant", "thumbnail"):
+                    artifacts[entry["path"]] = {"path": entry["path"], "label": entry["kind"], "size": entry["size"]}
+        # Store objects are shared between tests, so the per-test record
+        # is what ties a deduplicated screenshot to this test
+        store = ArtifactStore()
+        for reference in (store.read_record(nodeid) or {}).get("artifacts", []):
+            path = os.path.abspath(os.path.join(store.root, reference["path"]))
+            artifacts[path] = {"path": path, "label": reference.get("name") or "screenshot", "size": reference.get("size")}
+        return [artifact for artifact in artifacts.values() if os.path.exists(artifact["path"])]
+    
+    def _thumbnail(self, path: str) -> Optional[str]:
+        thumbnail_path = os.path.join(self.assets_dir, hashlib.sha1(path.encode()).hexdigest()[:16] + ".jpg")
+        if os.path.exists(thumbnail_path):
+            return thumbnail_path
+        try:
+            with Image.open(path) as img:
+                img.draft("RGB", (TestConfig.REPORT_THUMBNAIL_WIDTH, TestConfig.REPORT_THUMBNAIL_WIDTH * 4))
+                img = img.convert("RGB")
+                img.thumbnail((TestConfig.REPORT_THUMBNAIL_WIDTH, TestConfig.REPORT_THUMBNAIL_WIDTH * 4))
+                os.makedirs(self.assets_dir, exist_ok=True)
+                img.save(thumbnail_path, "JPEG", quality=70)
+        except (OSError, ValueError):
+            return None
+        return thumbnail_path
+    
+    def _artifacts_html(self, nodeid: str) -> str:
+        links = []
+        thumbnails = 0
+        for artifact in self._artifacts(nodeid):
+            href = self._relative(artifact["path"])
+            label = html.escape(f"{artifact['label']} · {os.path.basename(artifact['path'])}")
+            thumbnail = None
+            if artifact["path"].lower().endswith(IMAGE_EXTENSIONS) and thumbnails < TestConfig.REPORT_MAX_THUMBNAILS:
+                thumbnail = self._thumbnail(artifact["path"])
+            if thumbnail:
+                thumbnails += 1
+                links.append(f"<a href=\"{href}\"><img src=\"{self._relative(thumbnail)}\" loading=\"lazy\" "
+                             f"decoding=\"async\" width=\"{TestConfig.REPORT_THUMBNAIL_WIDTH}\" alt=\"\">{label}</a>")
+            else:
+                links.append(f"<a href=\"{href}\">{label}</a>")
+        return f"<div class=\"artifacts\">{''.join(links)}</div>" if links else ""
+    
+    def close(self) -> Dict[str, Any]:
+        duration = time.time() - self.started
+        totals = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.counts.items())) or "no tests"
+        failures = "".join(
+            f"<li><a href=\"#{failure['anchor']}\">{html.escape(failure['nodeid'])}</a> "
+            f"{html.escape(failure['message'])}</li>" for failure in self.failures
+        )
+        self._file.write(
+            "</tbody></table>\n"
+            f"<h2>Summary</h2><p>{totals} in {duration:.1f}s</p>\n"
+            + (f"<ul>{failures}</ul>\n" if failures else "")
+            + "</body></html>\n"
+        )
+        self._file.close()
+        
+        summary = {
+            "report": os.path.basename(self.path),
+            "title": self.title,
+            "started": self.started,
+            "duration": round(duration, 1),
+            "counts": self.counts,
+            "failures": self.failures
+        }
+        with open(self.summary_path(self.path), "w") as file:
+            json.dump(summary, file, indent=2)
+        return summary
+    
+    @classmethod
+    def merge(cls, directory: str, output: str = "index.html") -> Optional[str]:
+        """Index every report in `directory` from its sidecar summary."""
+        summaries = []
+        for path in sorted(glob.glob(os.path.join(directory, "*.summary.json"))):
+            try:
+                with open(path) as file:
+                    summaries.append(json.load(file))
+            except (OSError, ValueError) as e:
+                print(f"Skipping report summary {path}: {e}")
+        if not summaries:
+            return None
+        
+        outcomes = sorted({outcome for summary in summaries for outcome in summary["counts"]})
+        rows = []
+        failures = []
+        for summary in summaries:
+            report = quote(summary["report"])
+            cells = "".join(f"<td>{summary['counts'].get(outcome, 0)}</td>" for outcome in outcomes)
+            rows.append(f"<tr><td><a href=\"{report}\">{html.escape(summary['title'])}</a></td>{cells}"
+                        f"<td>{summary['duration']:.1f}s</td></tr>")
+            for failure in summary["failures"]:
+                failures.append(f"<li><a href=\"{report}#{failure['anchor']}\">{html.escape(failure['nodeid'])}</a> "
+                                f"({html.escape(summary['title'])}) {html.escape(failure['message'])}</li>")
+        
+        cls.write_stylesheet(directory)
+        path = os.path.join(directory, output)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(
+                "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Test Reports</title>"
+                "<link rel=\"stylesheet\" href=\"report.css\"></head><body>\n<h1>Test Reports</h1>\n"
+                f"<table><thead><tr><th>Report</th>{''.join(f'<th>{outcome}</th>' for outcome in outcomes)}"
+                f"<th>Duration</th></tr></thead><tbody>\n{chr(10).join(rows)}\n</tbody></table>\n"
+                + (f"<h2>Failures</h2><ul>{''.join(failures)}</ul>\n" if failures else "")
+                + "</body></html>\n"
+            )
+        return path
+
+
+class LightReportPlugin:
+    """Feeds LightReport from the controller's test reports (under xdist
+    the workers' reports all arrive there)."""
+    
+    def __init__(self, path: str, details: Dict[str, str]):
+        self.report = LightReport(path)
+        self.details = details
+        self.pending: Dict[str, Dict[str, Any]] = {}
+    
+    def pytest_sessionstart(self, session):
+        self.report.open(self.details)
+    
+    def pytest_runtest_logreport(self, report):
+        entry = self.pending.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0, "longrepr": "", "sections": ""})
+        entry["duration"] += report.duration
+        if report.when == "setup" and not report.passed:
+            entry["outcome"] = "skipped" if report.skipped else "error"
+        elif report.when == "call":
+            entry["outcome"] = report.outcome
+        elif report.when == "teardown" and report.failed and entry["outcome"] == "passed":
+            entry["outcome"] = "error"
+        if report.skipped and isinstance(report.longrepr, tuple):
+            # (path, line, reason) for skips
+            entry["longrepr"] = report.longrepr[2]
+        elif not report.passed and report.longrepr:
+            entry["longrepr"] = report.longreprtext
+            entry["sections"] = "\n".join(f"--- {title} ---\n{content}" for title, content in report.sections)
+        
+        if report.when == "teardown":
+            self.pending.pop(report.nodeid)
+            self.report.add(report.nodeid, entry["outcome"], entry["duration"], entry["longrepr"], entry["sections"])
+    
+    def pytest_sessionfinish(self, session):
+        self.report.close()
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", f"light report: {self.report.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lightweight HTML report tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge_parser = subparsers.add_parser("merge", help="Index the reports in a directory from their summaries")
+    merge_parser.add_argument("directory", nargs="?", default=TestConfig.REPORTS_DIR)
+    merge_parser.add_argument("--output", default="index.html")
+    args = parser.parse_args()
+    
+    path = LightReport.merge(args.directory, args.output)
+    print(f"Report index: {path}" if path else f"No report summaries in {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,194 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from utils.replay_proxy import ReplayProxy
+
+
+DESKTOP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Pre-answered consent so EU egress gets the page instead of the consent
+# interstitial, matching what a browser session sees after accepting
+CONSENT_COOKIES = {"CONSENT": "YES+cb", "SOCS": "CAI"}
+
+
+class _PageParser(HTMLParser):
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.ids: List[str] = []
+        self.links: List[str] = []
+        self._in_title = False
+    
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag == "title":
+            self._in_title = True
+        if attributes.get("id"):
+            self.ids.append(attributes["id"])
+        if tag == "a" and attributes.get("href"):
+            self.links.append(attributes["href"])
+    
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+class FetchedPage:
+    """What a non-interactive check needs from a page load, in either tier."""
+    
+    def __init__(self, url: str, current_url: str, title: str, html: str, elapsed: float,
+                 status_code: Optional[int] = None, ids: Optional[List[str]] = None,
+                 links: Optional[List[str]] = None):
+        self.url = url
+        self.current_url = current_url
+        self.title = title
+        self.html = html
+        self.elapsed = elapsed
+        self.status_code = status_code
+        self.ids = ids or []
+        self.links = links or []
+    
+    def has_element_id(self, element_id: str) -> bool:
+        return element_id in self.ids
+
+
+class HttpPageClient:
+    """Browser-free fetch-and-parse client for the HTTP fast tier.
+    
+    One pooled requests.Session is shared by all fetches; fetch_many runs
+    them concurrently. Final URL after redirects and the document title
+    are exposed under the same names the WebDriver uses.
+    """
+    
+    tier = "http"
+    
+    def __init__(self, pool_size: int = 10, timeout: float = 30):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": DESKTOP_USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+        for name, value in CONSENT_COOKIES.items():
+            self.session.cookies.set(name, value, domain=".youtube.com")
+        
+        proxy = ReplayProxy.current_address()
+        if proxy:
+            self.session.proxies.update({"http": f"http://{proxy}", "https": f"http://{proxy}"})
+    
+    def fetch(self, url: str) -> FetchedPage:
+        started = time.perf_counter()
+        response = self.session.get(url, timeout=self.timeout)
+        parser = _PageParser()
+        parser.feed(response.text)
+        return FetchedPage(
+            url=url,
+            current_url=response.url,
+            title=parser.title.strip(),
+            html=response.text,
+            elapsed=time.perf_counter() - started,
+            status_code=response.status_code,
+            ids=parser.ids,
+            links=parser.links
+        )
+    
+    def fetch_many(self, urls: List[str], max_workers: Optional[int] = None) -> List[FetchedPage]:
+        with ThreadPoolExecutor(max_workers=max_workers or min(self.pool_size, len(urls) or 1)) as executor:
+            return list(executor.map(self.fetch, urls))
+    
+    def close(self) -> None:
+        self.session.close()
+
+
+class BrowserPageFetcher:
+    """The same fetch interface on top of a WebDriver session."""
+    
+    tier = "browser"
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    def fetch(self, url: str) -> FetchedPage:
+        started = time.perf_counter()
+        self.driver.get(url)
+        ids = self.driver.execute_script(
+            "return Array.from(document.querySelectorAll('[id]'), function(e) { return e.id; });"
+        )
+        return FetchedPage(
+            url=url,
+            current_url=self.driver.current_url,
+            title=self.driver.title,
+            html=self.driver.page_source,
+            elapsed=time.perf_counter() - started,
+            ids=ids or []
+        )
+    
+    def fetch_many(self, urls: List[str], max_workers: Optional[int] = None) -> List[FetchedPage]:
+        return [self.fetch(url) for url in urls]
+
+
+class TierTimings:
+    """Per-test durations by tier, for the time-saved summary.
+    
+    Browser-tier durations are remembered across runs in the pytest cache,
+    so an HTTP-tier run can be compared with the same test's last browser
+    run.
+    """
+    
+    CACHE_KEY = "tiers/browser_durations"
+    
+    _durations: Dict[str, Dict[str, float]] = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def record(cls, nodeid: str, tier: str, seconds: float) -> None:
+        with cls._lock:
+            entry = cls._durations.setdefault(nodeid, {"tier": tier, "seconds": 0.0})
+            entry["seconds"] += seconds
+    
+    @classmethod
+    def summary(cls, browser_history: Dict[str, float]) -> Dict[str, object]:
+        with cls._lock:
+            durations = dict(cls._durations)
+        
+        browser_runs = {nodeid: entry["seconds"] for nodeid, entry in durations.items() if entry["tier"] == "browser"}
+        known = dict(browser_history, **browser_runs)
+        fallback = sum(browser_runs.values()) / len(browser_runs) if browser_runs else None
+        
+        http_tests = []
+        for nodeid, entry in durations.items():
+            if entry["tier"] != "http":
+                continue
+            baseline = known.get(nodeid, fallback)
+            http_tests.append({
+                "nodeid": nodeid,
+                "http_seconds": round(entry["seconds"], 3),
+                "browser_seconds": round(baseline, 3) if baseline is not None else None,
+                "estimated": nodeid not in known
+            })
+        
+        saved = sum(test["browser_seconds"] - test["http_seconds"]
+                    for test in http_tests if test["browser_seconds"] is not None)
+        return {
+            "http_tests": http_tests,
+            "browser_durations": browser_runs,
+            "time_saved": round(saved, 2)
+        }
+    
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._durations.clear()
\ No newline at end of file
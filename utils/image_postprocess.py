@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from PIL import Image, features
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import ArtifactStore
+
+
+THUMBNAIL_DIR = "thumbnails"
+
+# Artifacts only ever written for a failing test
+FAILURE_KINDS = ("evidence", "step_frame", "video")
+
+
+def _output_format(requested: str) -> str:
+    if requested == "webp" and not features.check("webp"):
+        return "jpeg"
+    return requested
+
+
+def _process_image(arguments) -> Dict[str, Any]:
+    path, settings, keep_original = arguments
+    result = {"path": path, "original_bytes": 0, "output_bytes": 0, "kept_original": keep_original, "error": None}
+    try:
+        result["original_bytes"] = os.path.getsize(path)
+        base, _ = os.path.splitext(path)
+        extension = ".webp" if settings["format"] == "webp" else ".jpg"
+        variant_path = base + extension
+        thumbnail_path = os.path.join(os.path.dirname(path), THUMBNAIL_DIR, os.path.basename(base) + extension)
+        
+        with Image.open(path) as img:
+            img = img.convert("RGB")
+            variant = img
+            if settings["max_width"] and img.width > settings["max_width"]:
+                variant = img.resize(
+                    (settings["max_width"], round(img.height * settings["max_width"] / img.width)),
+                    Image.Resampling.BILINEAR
+                )
+            _save(variant, variant_path, settings)
+            
+            # reduce() averages whole pixel blocks, far cheaper than LANCZOS,
+            # and is plenty for a thumbnail
+            factor = max(1, img.width // settings["thumbnail_width"])
+            thumbnail = img.reduce(factor) if factor > 1 else img
+            if thumbnail.width > settings["thumbnail_width"]:
+                thumbnail = thumbnail.resize(
+                    (settings["thumbnail_width"], round(thumbnail.height * settings["thumbnail_width"] / thumbnail.width)),
+                    Image.Resampling.BILINEAR
+                )
+            os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+            _save(thumbnail, thumbnail_path, settings)
+        
+        result["variant"] = variant_path
+        result["thumbnail"] = thumbnail_path
+        result["output_bytes"] = os.path.getsize(variant_path) + os.path.getsize(thumbnail_path)
+        if keep_original:
+            result["output_bytes"] += result["original_bytes"]
+        else:
+            os.remove(path)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _save(img, path: str, settings: Dict[str, Any]) -> None:
+    if settings["format"] == "webp":
+        img.save(path, "WEBP", quality=settings["quality"], method=4)
+    else:
+        img.save(path, "JPEG", quality=settings["quality"], optimize=True, progressive=True)
+
+
+class ImagePostProcessor:
+    """Batch conversion of a run's screenshots into report-friendly images.
+    
+    Every PNG gets a WebP (or JPEG) variant at IMAGE_QUALITY, optionally
+    downscaled, and a small thumbnail, with the work spread over a process
+    pool. The original PNG is only kept when the manifest ties the image to
+    a test that left failure artifacts (evidence, step frames or a
+    screencast); untracked images are converted. Objects in
+    the artifact store are left alone, since other records and baselines
+    point at them.
+    """
+    
+    def __init__(self, image_format: Optional[str] = None, quality: Optional[int] = None,
+                 thumbnail_width: Optional[int] = None, max_width: Optional[int] = None,
+                 workers: Optional[int] = None):
+        self.settings = {
+            "format": _output_format((image_format or TestConfig.IMAGE_FORMAT).lower()),
+            "quality": quality or TestConfig.IMAGE_QUALITY,
+            "thumbnail_width": thumbnail_width or TestConfig.THUMBNAIL_WIDTH,
+            "max_width": TestConfig.IMAGE_MAX_WIDTH if max_width is None else max_width
+        }
+        self.workers = workers or TestConfig.IMAGE_WORKERS
+    
+    @staticmethod
+    def find_images(directory: str) -> List[str]:
+        images = []
+        for current, directories, files in os.walk(directory):
+            directories[:] = [name for name in directories if name != THUMBNAIL_DIR]
+            images.extend(os.path.join(current, name) for name in files if name.lower().endswith(".png"))
+        return sorted(images)
+    
+    def _pending(self, path: str) -> bool:
+        extension = ".webp" if self.settings["format"] == "webp" else ".jpg"
+        variant = os.path.splitext(path)[0] + extension
+        return not os.path.exists(variant) or os.path.getmtime(variant) < os.path.getmtime(path)
+    
+    def process(self, screenshot_dirs: Optional[List[str]] = None,
+                store: Optional[ArtifactStore] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        # Store objects are linked by path from records, reports and
+        # baselines, so their originals can never be dropped; a variant
+        # would only add bytes
+        store_objects = os.path.join(os.path.abspath((store or ArtifactStore()).objects_dir), "")
+        manifest = ArtifactManifest.default()
+        failed_tests = manifest.tests_with(FAILURE_KINDS)
+        
+        jobs = []
+        for directory in screenshot_dirs or [TestConfig.SCREENSHOTS_DIR]:
+            for path in self.find_images(directory):
+                if os.path.abspath(path).startswith(store_objects) or not self._pending(path):
+                    continue
+                entry = manifest.get(path) if failed_tests else None
+                jobs.append((path, self.settings, bool(entry and entry["test"] in failed_tests)))
+        
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(_process_image, jobs, chunksize=max(1, len(jobs) // (self.workers * 4))))
+        else:
+            results = [_process_image(job) for job in jobs]
+        
+        for result in results:
+            path = os.path.abspath(result["path"])
+            if not result["error"]:
+                ArtifactManifest.record_file(result["variant"], "variant")
+                ArtifactManifest.record_file(result["thumbnail"], "thumbnail")
+                if not result["kept_original"]:
+                    manifest.forget(path)
+        
+        processed = [result for result in results if not result["error"]]
+        original_bytes = sum(result["original_bytes"] for result in processed)
+        output_bytes = sum(result["output_bytes"] for result in processed)
+        return {
+            "format": self.settings["format"],
+            "quality": self.settings["quality"],
+            "images": len(processed),
+            "errors": [result for result in results if result["error"]],
+            "originals_kept": sum(1 for result in processed if result["kept_original"]),
+            "original_bytes": original_bytes,
+            "output_bytes": output_bytes,
+            "bytes_saved": original_bytes - output_bytes,
+            "elapsed": round(time.perf_counter() - started, 2),
+            "results": results
+        }
+    
+    @staticmethod
+    def format_summary(report: Dict[str, Any]) -> str:
+        saved = report["bytes_saved"]
+        share = saved / report["original_bytes"] if report["original_bytes"] else 0
+        return (f"Processed {report['images']} images to {report['format']} in {report['elapsed']}s: "
+                f"{report['original_bytes'] // 1024} KB -> {report['output_bytes'] // 1024} KB, "
+                f"saved {saved // 1024} KB ({share:.0%}); {report['originals_kept']} originals kept, "
+                f"{len(report['errors'])} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a run's screenshots to WebP/JPEG with thumbnails")
+    parser.add_argument("dirs", nargs="*", help="Screenshot directories (default: SCREENSHOTS_DIR)")
+    parser.add_argument("--format", choices=["webp", "jpeg"], default=None)
+    parser.add_argument("--quality", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=os.path.join(TestConfig.REPORTS_DIR, "image_postprocess.json"))
+    args = parser.parse_args()
+    
+    processor = ImagePostProcessor(image_format=args.format, quality=args.quality, workers=args.workers)
+    report = processor.process(args.dirs or None)
+    for error in report["errors"]:
+        print(f"Failed to process {error['path']}: {error['error']}")
+    
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(ImagePostProcessor.format_summary(report))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,439 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from config.config import TestConfig
+from config.environments import EnvironmentTestData, get_environment_config
+from pages.home_page import AsyncHomePage, HomePage
+from pages.search_page import AsyncSearchPage, SearchPage
+from pages.video_page import AsyncVideoPage, VideoPage
+from utils.async_webdriver import AsyncDriverService
+from utils.driver_manager import DriverManager
+
+
+def _open_home(user: "VirtualUser") -> bool:
+    return HomePage(user.driver).open()
+
+
+def _search(user: "VirtualUser") -> bool:
+    if not HomePage(user.driver).search_for_video(user.rng.choice(user.search_terms)):
+        return False
+    return SearchPage(user.driver).has_search_results()
+
+
+def _watch_result(user: "VirtualUser") -> bool:
+    if not SearchPage(user.driver).click_search_result_by_index(user.rng.randrange(5)):
+        return False
+    return VideoPage(user.driver).wait_for_video_to_load(timeout=10)
+
+
+def _watch_related(user: "VirtualUser") -> bool:
+    if not VideoPage(user.driver).click_related_video(user.rng.randrange(3)):
+        return False
+    return VideoPage(user.driver).wait_for_video_to_load(timeout=10)
+
+
+def _browse_trending(user: "VirtualUser") -> bool:
+    if not HomePage(user.driver).click_trending():
+        return False
+    return HomePage(user.driver).wait_for_page_load()
+
+
+STEPS: Dict[str, Callable[["VirtualUser"], bool]] = {
+    "open_home": _open_home,
+    "search": _search,
+    "watch_result": _watch_result,
+    "watch_related": _watch_related,
+    "browse_trending": _browse_trending
+}
+
+async def _open_home_async(user: "VirtualUser") -> bool:
+    return await AsyncHomePage(user.driver).open()
+
+
+async def _search_async(user: "VirtualUser") -> bool:
+    if not await AsyncHomePage(user.driver).search_for_video(user.rng.choice(user.search_terms)):
+        return False
+    return await AsyncSearchPage(user.driver).has_search_results()
+
+
+async def _watch_result_async(user: "VirtualUser") -> bool:
+    if not await AsyncSearchPage(user.driver).click_search_result_by_index(user.rng.randrange(5)):
+        return False
+    return await AsyncVideoPage(user.driver).wait_for_video_to_load(timeout=10)
+
+
+async def _watch_related_async(user: "VirtualUser") -> bool:
+    if not await AsyncVideoPage(user.driver).click_related_video(user.rng.randrange(3)):
+        return False
+    return await AsyncVideoPage(user.driver).wait_for_video_to_load(timeout=10)
+
+
+async def _browse_trending_async(user: "VirtualUser") -> bool:
+    if not await AsyncHomePage(user.driver).click_trending():
+        return False
+    return await AsyncHomePage(user.driver).wait_for_page_load()
+
+
+ASYNC_STEPS: Dict[str, Callable[["VirtualUser"], Awaitable[bool]]] = {
+    "open_home": _open_home_async,
+    "search": _search_async,
+    "watch_result": _watch_result_async,
+    "watch_related": _watch_related_async,
+    "browse_trending": _browse_trending_async
+}
+
+LOAD_MODES = ["threads", "async"]
+
+JOURNEYS: Dict[str, List[str]] = {
+    "browse": ["open_home", "browse_trending"],
+    "search": ["open_home", "search"],
+    "watch": ["open_home", "search", "watch_result"],
+    "binge": ["open_home", "search", "watch_result", "watch_related"]
+}
+
+DEFAULT_JOURNEY_WEIGHTS: Dict[str, float] = {
+    "browse": 1,
+    "search": 2,
+    "watch": 4,
+    "binge": 3
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LoadStats:
+    
+    def __init__(self):
+        self.step_latencies: Dict[str, List[float]] = {}
+        self.step_failures: Dict[str, int] = {}
+        self.journeys: Dict[str, Dict[str, int]] = {}
+        self.errors: List[str] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def record_step(self, step: str, seconds: float, success: bool) -> None:
+        with self._lock:
+            self.step_latencies.setdefault(step, []).append(seconds)
+            if not success:
+                self.step_failures[step] = self.step_failures.get(step, 0) + 1
+    
+    def record_journey(self, journey: str, success: bool) -> None:
+        with self._lock:
+            counts = self.journeys.setdefault(journey, {"completed": 0, "failed": 0})
+            counts["completed" if success else "failed"] += 1
+    
+    def record_error(self, message: str) -> None:
+        with self._lock:
+            self.errors.append(message)
+    
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = (self.finished_at or time.time()) - (self.started_at or time.time())
+            completed = sum(counts["completed"] for counts in self.journeys.values())
+            failed = sum(counts["failed"] for counts in self.journeys.values())
+            steps = {}
+            for step, latencies in self.step_latencies.items():
+                steps[step] = {
+                    "count": len(latencies),
+                    "failures": self.step_failures.get(step, 0),
+                    "p50": round(percentile(latencies, 50), 3),
+                    "p90": round(percentile(latencies, 90), 3),
+                    "p95": round(percentile(latencies, 95), 3),
+                    "p99": round(percentile(latencies, 99), 3),
+                    "max": round(max(latencies), 3)
+                }
+            step_count = sum(len(latencies) for latencies in self.step_latencies.values())
+            return {
+                "elapsed": round(elapsed, 2),
+                "journeys_completed": completed,
+                "journeys_failed": failed,
+                "journeys_per_second": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+                "steps_per_second": round(step_count / elapsed, 3) if elapsed > 0 else 0.0,
+                "journeys": {name: dict(counts) for name, counts in self.journeys.items()},
+                "steps": steps,
+                "errors": list(self.errors[:20])
+            }
+
+
+class VirtualUser:
+    
+    def __init__(self, user_id: int, driver, rng: random.Random, search_terms: List[str]):
+        self.user_id = user_id
+        self.driver = driver
+        self.rng = rng
+        self.search_terms = search_terms
+
+
+class LoadRunner:
+    """Runs N virtual users through weighted page-object journeys.
+    
+    Each user owns one headless browser session. Users start evenly spread
+    over the ramp-up period, pick a journey by weight, pause for a random
+    think time between steps and stop starting journeys once the duration
+    has elapsed. Step latencies include the page objects' own waits.
+    
+    In "threads" mode every user gets a thread and a Selenium session; in
+    "async" mode all users run as tasks on one event loop, sharing a single
+    driver process through AsyncWebDriver.
+    """
+    
+    def __init__(self, users: int = 5, duration: float = 60, ramp_up: float = 10,
+                 think_time: Tuple[float, float] = (1.0, 3.0), journey_weights: Optional[Dict[str, float]] = None,
+                 browser: str = "chrome", block_profile: Optional[str] = None, seed: int = 42, mode: str = "threads"):
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode: {mode}. Available: {', '.join(LOAD_MODES)}")
+        
+        self.mode = mode
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_time = think_time
+        self.journey_weights = journey_weights or dict(DEFAULT_JOURNEY_WEIGHTS)
+        self.browser = browser
+        self.block_profile = block_profile
+        self.seed = seed
+        self.search_terms = EnvironmentTestData.get_search_terms(get_environment_config().environment)
+        self.stats = LoadStats()
+        
+        unknown = [name for name in self.journey_weights if name not in JOURNEYS]
+        if unknown:
+            raise ValueError(f"Unknown journeys: {', '.join(unknown)}. Available: {', '.join(JOURNEYS)}")
+    
+    def pick_journey(self, rng: random.Random) -> str:
+        names = [name for name, weight in self.journey_weights.items() if weight > 0]
+        weights = [self.journey_weights[name] for name in names]
+        return rng.choices(names, weights=weights)[0]
+    
+    def run(self) -> Dict[str, Any]:
+        self.stats = LoadStats()
+        self.stats.started_at = time.time()
+        deadline = self.stats.started_at + self.duration
+        
+        if self.mode == "async":
+            asyncio.run(self._run_async(deadline))
+        else:
+            self._run_threads(deadline)
+        
+        self.stats.finished_at = time.time()
+        summary = self.stats.summary()
+        summary["users"] = self.users
+        summary["mode"] = self.mode
+        return summary
+    
+    def _start_delay(self, user_id: int) -> float:
+        return self.ramp_up * user_id / self.users if self.users else 0
+    
+    def _run_threads(self, deadline: float) -> None:
+        threads = []
+        for user_id in range(self.users):
+            thread = threading.Thread(
+                target=self._run_user, args=(user_id, self._start_delay(user_id), deadline),
+                name=f"virtual-user-{user_id}", daemon=True
+            )
+            threads.append(thread)
+            thread.start()
+        
+        for thread in threads:
+            thread.join()
+    
+    def _run_user(self, user_id: int, start_delay: float, deadline: float) -> None:
+        time.sleep(start_delay)
+        if time.time() >= deadline:
+            return
+        
+        rng = random.Random(self.seed * 1000 + user_id)
+        started = time.perf_counter()
+        try:
+            driver = DriverManager.get_driver(self.browser, headless=True, block_profile=self.block_profile)
+            driver.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+        except Exception as e:
+            self.stats.record_step("start_session", time.perf_counter() - started, False)
+            self.stats.record_error(f"user {user_id}: failed to start browser: {e}")
+            return
+        self.stats.record_step("start_session", time.perf_counter() - started, True)
+        
+        user = VirtualUser(user_id, driver, rng, self.search_terms)
+        try:
+            while time.time() < deadline:
+                journey = self.pick_journey(rng)
+                self.stats.record_journey(journey, self._run_journey(user, journey, deadline))
+        finally:
+            DriverManager.quit_driver(driver)
+    
+    def _run_journey(self, user: VirtualUser, journey: str, deadline: float) -> bool:
+        for step in JOURNEYS[journey]:
+            started = time.perf_counter()
+            try:
+                success = bool(STEPS[step](user))
+            except Exception as e:
+                success = False
+                self.stats.record_error(f"user {user.user_id}: {journey}/{step}: {type(e).__name__}: {e}")
+            self.stats.record_step(step, time.perf_counter() - started, success)
+            
+            if not success:
+                return False
+            if time.time() < deadline:
+                time.sleep(user.rng.uniform(*self.think_time))
+        return True
+    
+    async def _run_async(self, deadline: float) -> None:
+        service = AsyncDriverService(self.browser)
+        try:
+            await service.start()
+            await asyncio.gather(*(
+                self._run_user_async(service, user_id, self._start_delay(user_id), deadline)
+                for user_id in range(self.users)
+            ))
+        finally:
+            await service.stop()
+    
+    async def _run_user_async(self, service: AsyncDriverService, user_id: int, start_delay: float,
+                              deadline: float) -> None:
+        await asyncio.sleep(start_delay)
+        if time.time() >= deadline:
+            return
+        
+        rng = random.Random(self.seed * 1000 + user_id)
+        started = time.perf_counter()
+        try:
+            driver = await service.new_session(headless=True, block_profile=self.block_profile)
+            await driver.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+        except Exception as e:
+            self.stats.record_step("start_session", time.perf_counter() - started, False)
+            self.stats.record_error(f"user {user_id}: failed to start browser: {e}")
+            return
+        self.stats.record_step("start_session", time.perf_counter() - started, True)
+        
+        user = VirtualUser(user_id, driver, rng, self.search_terms)
+        try:
+            while time.time() < deadline:
+                journey = self.pick_journey(rng)
+                self.stats.record_journey(journey, await self._run_journey_async(user, journey, deadline))
+        finally:
+            try:
+                await driver.quit()
+            except Exception as e:
+                print(f"Error closing driver: {e}")
+    
+    async def _run_journey_async(self, user: VirtualUser, journey: str, deadline: float) -> bool:
+        for step in JOURNEYS[journey]:
+            started = time.perf_counter()
+            try:
+                success = bool(await ASYNC_STEPS[step](user))
+            except Exception as e:
+                success = False
+                self.stats.record_error(f"user {user.user_id}: {journey}/{step}: {type(e).__name__}: {e}")
+            self.stats.record_step(step, time.perf_counter() - started, success)
+            
+            if not success:
+                return False
+            if time.time() < deadline:
+                await asyncio.sleep(user.rng.uniform(*self.think_time))
+        return True
+    
+    @staticmethod
+    def format_summary(summary: Dict[str, Any]) -> str:
+        lines = [
+            f"Users: {summary['users']} ({summary['mode']})  Elapsed: {summary['elapsed']}s  "
+            f"Journeys: {summary['journeys_completed']} ok / {summary['journeys_failed']} failed  "
+            f"Throughput: {summary['journeys_per_second']} journeys/s, {summary['steps_per_second']} steps/s",
+            f"{'step':<16}{'count':>7}{'fail':>6}{'p50':>8}{'p90':>8}{'p95':>8}{'p99':>8}{'max':>8}"
+        ]
+        for step, stats in summary["steps"].items():
+            lines.append(
+                f"{step:<16}{stats['count']:>7}{stats['failures']:>6}{stats['p50']:>8}"
+                f"{stats['p90']:>8}{stats['p95']:>8}{stats['p99']:>8}{stats['max']:>8}"
+            )
+        for error in summary["errors"]:
+            lines.append(f"  ! {error}")
+        return "\n".join(lines)
+
+
+def _parse_weights(value: str) -> Dict[str, float]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run virtual users through page-object journeys")
+    parser.add_argument("--users", default="5", help="Virtual users, or a comma-separated list to step through")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per load level")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Seconds over which users start")
+    parser.add_argument("--think-min", type=float, default=1.0)
+    parser.add_argument("--think-max", type=float, default=3.0)
+    parser.add_argument("--journeys", default=None, help="Weights such as watch=4,search=2,binge=1")
+    parser.add_argument("--browser", default=TestConfig.BROWSER)
+    parser.add_argument("--block-profile", default=TestConfig.REQUEST_BLOCK_PROFILE or None)
+    parser.add_argument("--base-url", default=None, help="Target instead of the configured environment")
+    parser.add_argument("--standin", action="store_true", help="Start a local stand-in server and target it")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", choices=LOAD_MODES, default="threads",
+                        help="One thread per user, or all users on one asyncio event loop")
+    parser.add_argument("--output", default=None, help="JSON report path")
+    args = parser.parse_args()
+    
+    # Per-navigation metrics would add a script round-trip to every step
+    TestConfig.CAPTURE_PAGE_METRICS = False
+    
+    server = None
+    if args.standin:
+        from standin.server import StandinServer
+        server = StandinServer.from_config()
+        server.port = 0
+        server.start()
+        TestConfig.YOUTUBE_BASE_URL = server.url
+    elif args.base_url:
+        TestConfig.YOUTUBE_BASE_URL = args.base_url
+    
+    results = []
+    try:
+        for users in [int(level) for level in args.users.split(",")]:
+            runner = LoadRunner(
+                users=users, duration=args.duration, ramp_up=args.ramp_up,
+                think_time=(args.think_min, args.think_max),
+                journey_weights=_parse_weights(args.journeys) if args.journeys else None,
+                browser=args.browser, block_profile=args.block_profile, seed=args.seed, mode=args.mode
+            )
+            print(f"\nRunning {users} virtual users against {TestConfig.YOUTUBE_BASE_URL} for {args.duration}s")
+            summary = runner.run()
+            results.append(summary)
+            print(LoadRunner.format_summary(summary))
+    finally:
+        if server:
+            server.stop()
+    
+    if len(results) > 1:
+        print("\nusers  journeys/s  p95 step latency")
+        for summary in results:
+            worst_p95 = max((stats["p95"] for step, stats in summary["steps"].items() if step != "start_session"),
+                            default=0.0)
+            print(f"{summary['users']:>5}  {summary['journeys_per_second']:>10}  {worst_p95:>8}")
+    
+    output = args.output or os.path.join(
+        TestConfig.REPORTS_DIR, "load", f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({"target": TestConfig.YOUTUBE_BASE_URL, "levels": results}, file, indent=2)
+    print(f"\nLoad report saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
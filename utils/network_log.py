@@ -0,0 +1,61 @@
+import json
+import weakref
+from collections import deque
+from typing import Any, Dict, List
+from selenium.common.exceptions import WebDriverException
+
+
+class NetworkLog:
+    """Drains Chromium performance-log entries into a bounded per-driver buffer.
+    
+    get_log("performance") empties the browser-side log on every read, so all
+    consumers go through poll() to see the same DevTools network events.
+    Requires the goog:loggingPrefs performance capability at session start.
+    """
+    
+    MAX_EVENTS = 2000
+    
+    _buffers = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def enable_capability(options) -> None:
+        # Chrome reads goog:loggingPrefs, Edge reads ms:loggingPrefs
+        vendor = options.KEY.split(":")[0]
+        options.set_capability(f"{vendor}:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+    
+    @staticmethod
+    def poll(driver) -> List[Dict[str, Any]]:
+        buffer = NetworkLog._buffers.setdefault(driver, deque(maxlen=NetworkLog.MAX_EVENTS))
+        
+        try:
+            raw_entries = driver.get_log("performance")
+        except (WebDriverException, AttributeError, ValueError):
+            return []
+        
+        events = []
+        for raw in raw_entries:
+            try:
+                message = json.loads(raw["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            if not message.get("method", "").startswith("Network."):
+                continue
+            event = {
+                "timestamp": raw.get("timestamp"),
+                "method": message["method"],
+                "params": message.get("params", {})
+            }
+            events.append(event)
+            buffer.append(event)
+        return events
+    
+    @staticmethod
+    def recent(driver, limit: int = MAX_EVENTS) -> List[Dict[str, Any]]:
+        NetworkLog.poll(driver)
+        buffer = NetworkLog._buffers.get(driver, deque())
+        return list(buffer)[-limit:]
+    
+    @staticmethod
+    def clear(driver) -> None:
+        NetworkLog.poll(driver)
+        NetworkLog._buffers.pop(driver, None)
\ No newline at end of file
@@ -0,0 +1,253 @@
+import time
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+
+
+_INSTALL_SCRIPT = """
+var video = arguments[0];
+var interval = arguments[1];
+if (!video) { return false; }
+if (video.__qoe) { return true; }
+var now = function() { return performance.now(); };
+var player = document.getElementById('movie_player');
+var qoe = {
+    start: now(),
+    events: [],
+    samples: [],
+    firstFrame: null,
+    stallStart: null,
+    width: video.videoWidth,
+    height: video.videoHeight,
+    quality: null,
+    timer: null
+};
+video.__qoe = qoe;
+window.__qoe = qoe;
+
+function push(type, data) {
+    data = data || {};
+    data.type = type;
+    data.t = now() - qoe.start;
+    qoe.events.push(data);
+}
+
+function markFirstFrame() {
+    if (qoe.firstFrame === null) {
+        qoe.firstFrame = now() - qoe.start;
+        push('first_frame', {});
+    }
+}
+
+if (video.readyState >= 2 && video.currentTime > 0) {
+    qoe.firstFrame = 0;
+    push('first_frame', {already_rendering: true});
+} else if (video.requestVideoFrameCallback) {
+    video.requestVideoFrameCallback(markFirstFrame);
+}
+
+video.addEventListener('playing', function() {
+    if (qoe.stallStart !== null) {
+        push('stall_end', {duration: now() - qoe.stallStart});
+        qoe.stallStart = null;
+    }
+    if (!video.requestVideoFrameCallback) { markFirstFrame(); }
+});
+video.addEventListener('waiting', function() {
+    if (qoe.stallStart === null) {
+        qoe.stallStart = now();
+        push('stall_start', {current_time: video.currentTime});
+    }
+});
+video.addEventListener('resize', function() {
+    push('resolution_switch', {
+        from: [qoe.width, qoe.height],
+        to: [video.videoWidth, video.videoHeight]
+    });
+    qoe.width = video.videoWidth;
+    qoe.height = video.videoHeight;
+});
+
+function sample() {
+    var quality = video.getVideoPlaybackQuality ? video.getVideoPlaybackQuality() : null;
+    var bufferedAhead = 0;
+    for (var i = 0; i < video.buffered.length; i++) {
+        if (video.buffered.start(i) <= video.currentTime && video.currentTime <= video.buffered.end(i)) {
+            bufferedAhead = video.buffered.end(i) - video.currentTime;
+        }
+    }
+    if (player && player.getPlaybackQuality) {
+        var label = player.getPlaybackQuality();
+        if (qoe.quality !== null && label !== qoe.quality) {
+            push('quality_switch', {from: qoe.quality, to: label});
+        }
+        qoe.quality = label;
+    }
+    qoe.samples.push({
+        t: now() - qoe.start,
+        current_time: video.currentTime,
+        paused: video.paused,
+        ready_state: video.readyState,
+        buffered_ahead: bufferedAhead,
+        width: video.videoWidth,
+        height: video.videoHeight,
+        dropped_frames: quality ? quality.droppedVideoFrames : null,
+        total_frames: quality ? quality.totalVideoFrames : null
+    });
+}
+
+sample();
+qoe.timer = setInterval(sample, interval);
+return true;
+"""
+
+_DRAIN_SCRIPT = """
+var qoe = window.__qoe;
+if (!qoe) { return null; }
+return {
+    events: qoe.events.splice(0, qoe.events.length),
+    samples: qoe.samples.splice(0, qoe.samples.length),
+    stalled_for: qoe.stallStart === null ? 0 : performance.now() - qoe.stallStart,
+    elapsed: performance.now() - qoe.start
+};
+"""
+
+_STOP_SCRIPT = """
+var qoe = window.__qoe;
+if (qoe && qoe.timer !== null) {
+    clearInterval(qoe.timer);
+    qoe.timer = null;
+}
+"""
+
+
+class PlaybackMetricsCollector:
+    """Samples quality-of-experience data from an HTML5 video element.
+    
+    Events and samples are buffered inside the page and pulled back in
+    batches by drain(), so a playback window costs one script call per
+    drain instead of one per sample.
+    """
+    
+    DEFAULT_SAMPLE_INTERVAL_MS = 250
+    
+    def __init__(self, driver, video_element, sample_interval_ms: int = DEFAULT_SAMPLE_INTERVAL_MS):
+        self.driver = driver
+        self.video_element = video_element
+        self.sample_interval_ms = sample_interval_ms
+        self.events: List[Dict[str, Any]] = []
+        self.samples: List[Dict[str, Any]] = []
+        self.elapsed_ms = 0.0
+        self.ongoing_stall_ms = 0.0
+        self.started = False
+    
+    def start(self) -> bool:
+        try:
+            self.started = bool(self.driver.execute_script(
+                _INSTALL_SCRIPT, self.video_element, self.sample_interval_ms
+            ))
+        except WebDriverException:
+            self.started = False
+        return self.started
+    
+    def drain(self) -> Dict[str, Any]:
+        if not self.started:
+            return {"events": [], "samples": []}
+        
+        try:
+            batch = self.driver.execute_script(_DRAIN_SCRIPT)
+        except WebDriverException:
+            batch = None
+        
+        if not batch:
+            return {"events": [], "samples": []}
+        
+        self.events.extend(batch["events"])
+        self.samples.extend(batch["samples"])
+        self.elapsed_ms = batch["elapsed"]
+        self.ongoing_stall_ms = batch["stalled_for"]
+        return batch
+    
+    def collect_for(self, seconds: float, drain_interval: float = 1.0) -> Dict[str, Any]:
+        deadline = time.time() + seconds
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(drain_interval, remaining))
+            self.drain()
+        return self.summary()
+    
+    def stop(self) -> Dict[str, Any]:
+        self.drain()
+        try:
+            self.driver.execute_script(_STOP_SCRIPT)
+        except WebDriverException:
+            pass
+        self.started = False
+        return self.summary()
+    
+    def summary(self) -> Dict[str, Any]:
+        first_frame = next((e for e in self.events if e["type"] == "first_frame"), None)
+        stall_durations = [e["duration"] for e in self.events if e["type"] == "stall_end"]
+        stall_starts = [e for e in self.events if e["type"] == "stall_start"]
+        stall_ms = sum(stall_durations) + self.ongoing_stall_ms
+        
+        frame_samples = [s for s in self.samples if s.get("total_frames") is not None]
+        if frame_samples:
+            dropped = frame_samples[-1]["dropped_frames"] - frame_samples[0]["dropped_frames"]
+            total = frame_samples[-1]["total_frames"] - frame_samples[0]["total_frames"]
+        else:
+            dropped = None
+            total = None
+        
+        # Attached after playback began (autoplay): the first frame came
+        # before the collector, so there is no time to first frame to report
+        already_rendering = bool(first_frame and first_frame.get("already_rendering"))
+        window_s = self.elapsed_ms / 1000.0
+        return {
+            "time_to_first_frame": first_frame["t"] / 1000.0 if first_frame and not already_rendering else None,
+            "already_rendering": already_rendering,
+            "stall_count": len(stall_starts),
+            "stall_duration": stall_ms / 1000.0,
+            "stall_ratio": (stall_ms / self.elapsed_ms) if self.elapsed_ms else 0.0,
+            "dropped_frames": dropped,
+            "total_frames": total,
+            "dropped_frame_ratio": (dropped / total) if total else 0.0,
+            "resolution_switches": [e for e in self.events if e["type"] == "resolution_switch"],
+            "quality_switches": [e for e in self.events if e["type"] == "quality_switch"],
+            "playback_window": window_s,
+            "sample_count": len(self.samples),
+        }
+    
+    def check_thresholds(self, thresholds: Dict[str, float]) -> List[str]:
+        summary = self.summary()
+        violations = []
+        
+        max_ttff = thresholds.get("time_to_first_frame")
+        if max_ttff is not None and not summary["already_rendering"]:
+            ttff = summary["time_to_first_frame"]
+            if ttff is None:
+                violations.append("no frame was rendered during the playback window")
+            elif ttff > max_ttff:
+                violations.append(f"time to first frame {ttff:.2f}s exceeds {max_ttff:.2f}s")
+        
+        limits = [
+            ("stall_count", "stall count", "{}"),
+            ("stall_ratio", "stall ratio", "{:.3f}"),
+            ("dropped_frame_ratio", "dropped frame ratio", "{:.3f}"),
+        ]
+        for key, label, fmt in limits:
+            limit = thresholds.get(key)
+            if limit is not None and summary[key] > limit:
+                violations.append(f"{label} {fmt.format(summary[key])} exceeds {fmt.format(limit)}")
+        
+        return violations
+    
+    def assert_within_thresholds(self, thresholds: Dict[str, float]) -> None:
+        violations = self.check_thresholds(thresholds)
+        assert not violations, "Playback QoE thresholds breached: " + "; ".join(violations)
+    
+    @staticmethod
+    def attach(driver, video_element, sample_interval_ms: int = DEFAULT_SAMPLE_INTERVAL_MS) -> Optional["PlaybackMetricsCollector"]:
+        collector = PlaybackMetricsCollector(driver, video_element, sample_interval_ms)
+        return collector if collector.start() else None
\ No newline at end of file
@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from selenium.webdriver.common.by import By
+from config.config import TestConfig
+
+
+# Bump whenever build() changes what goes into the template, so existing
+# templates are rebuilt on the next run
+TEMPLATE_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+
+# A build lock older than this belongs to a build that crashed
+BUILD_LOCK_TIMEOUT_SECONDS = 600
+
+# Sessions may still be copying a template that was just replaced, so a
+# retired profile directory is kept this long before it is removed
+RETIRED_GRACE_SECONDS = 3600
+
+# Files a running browser holds in its profile; copying them would make the
+# copy look like it is already in use
+_LOCK_FILES = {"SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile", "lock", ".parentlock", "parent.lock"}
+
+CONSENT_BUTTONS = (
+    By.XPATH,
+    "//button[contains(@aria-label, 'Accept') or .//span[contains(text(), 'Accept all')]]"
+)
+
+
+class ProfileTemplate:
+    """Versioned, pre-warmed browser profile that sessions start from.
+    
+    The template is a user-data-dir in which cookie consent has been
+    accepted and the home, results and watch pages have been loaded once,
+    so the HTTP cache already holds the player and page JS/CSS. Each session
+    gets its own copy. The template is rebuilt when its version, base URL or
+    browser version no longer match, or when it is older than the maximum
+    age. Each build goes into its own directory and is swapped in by
+    replacing the manifest, so a copy never reads a half-removed profile.
+    """
+    
+    def __init__(self, browser: str = "chrome", root: Optional[str] = None):
+        self.browser = browser.lower()
+        self.root = os.path.join(root or TestConfig.PROFILE_TEMPLATE_DIR, self.browser)
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        self.lock_path = os.path.join(self.root, ".build.lock")
+    
+    @property
+    def profile_dir(self) -> str:
+        return self._profile_dir(self.read_manifest())
+    
+    def _profile_dir(self, manifest: Optional[Dict[str, Any]]) -> str:
+        # Templates built before versioned directories live in "profile"
+        return os.path.join(self.root, (manifest or {}).get("profile", "profile"))
+    
+    def read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.manifest_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+    
+    def stale_reason(self) -> Optional[str]:
+        manifest = self.read_manifest()
+        if manifest is None or not os.path.isdir(self._profile_dir(manifest)):
+            return "no template"
+        if manifest.get("version") != TEMPLATE_VERSION:
+            return f"template version {manifest.get('version')} != {TEMPLATE_VERSION}"
+        if manifest.get("base_url") != TestConfig.YOUTUBE_BASE_URL:
+            return f"built for {manifest.get('base_url')}"
+        if manifest.get("stale"):
+            return manifest["stale"]
+        age_hours = (time.time() - manifest.get("created_at", 0)) / 3600
+        if age_hours > TestConfig.PROFILE_TEMPLATE_MAX_AGE_HOURS:
+            return f"{age_hours:.0f}h old"
+        return None
+    
+    def usable(self) -> bool:
+        """Whether the current template can seed a session, even if it is
+        due for a rebuild."""
+        manifest = self.read_manifest()
+        return (manifest is not None and manifest.get("version") == TEMPLATE_VERSION
+                and manifest.get("base_url") == TestConfig.YOUTUBE_BASE_URL
+                and os.path.isdir(self._profile_dir(manifest)))
+    
+    def ensure_fresh(self) -> bool:
+        if self.stale_reason() is None:
+            return True
+        
+        os.makedirs(self.root, exist_ok=True)
+        if not self._acquire_lock():
+            # Another worker is building; keep using the current template
+            # until the new one is swapped in, or start cold if there is none
+            return self.usable()
+        
+        try:
+            reason = self.stale_reason()
+            if reason is None:
+                return True
+            print(f"Building {self.browser} profile template ({reason})")
+            return self.build() or self.usable()
+        finally:
+            self._release_lock()
+    
+    def build(self) -> bool:
+        from utils.driver_manager import DriverManager
+        
+        build_dir = tempfile.mkdtemp(prefix="profile-", dir=self.root)
+        started = time.time()
+        driver = None
+        try:
+            driver = DriverManager.get_driver(self.browser, headless=TestConfig.HEADLESS, user_data_dir=build_dir)
+            driver.set_page_load_timeout(TestConfig.PAGE_LOAD_TIMEOUT)
+            self._warm_up(driver)
+            browser_version = driver.capabilities.get("browserVersion", "")
+        except Exception as e:
+            print(f"Failed to build {self.browser} profile template: {e}")
+            if driver:
+                DriverManager.quit_driver(driver)
+            shutil.rmtree(build_dir, ignore_errors=True)
+            return False
+        
+        # The browser only flushes its cache and cookie stores on a clean exit
+        DriverManager.quit_driver(driver)
+        
+        previous_dir = self.profile_dir
+        self._write_manifest({
+            "version": TEMPLATE_VERSION,
+            "browser": self.browser,
+            "browser_version": browser_version,
+            "base_url": TestConfig.YOUTUBE_BASE_URL,
+            "profile": os.path.basename(build_dir),
+            "created_at": time.time(),
+            "created": datetime.now().isoformat(),
+            "build_seconds": round(time.time() - started, 1),
+            "size_bytes": self._directory_size(build_dir)
+        })
+        try:
+            # Start the grace period of the directory just replaced
+            os.utime(previous_dir)
+        except OSError:
+            pass
+        self._remove_retired(os.path.basename(build_dir))
+        return True
+    
+    def _remove_retired(self, current: str) -> None:
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name == current or not name.startswith("profile") or not os.path.isdir(path):
+                continue
+            try:
+                if time.time() - os.path.getmtime(path) > RETIRED_GRACE_SECONDS:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+    
+    def _warm_up(self, driver) -> None:
+        from pages.home_page import HomePage
+        from pages.search_page import SearchPage
+        from pages.video_page import VideoPage
+        
+        home_page = HomePage(driver)
+        home_page.open()
+        self._accept_consent(home_page)
+        home_page.open()
+        
+        if home_page.search_for_video(TestConfig.PROFILE_TEMPLATE_SEARCH_TERM):
+            search_page = SearchPage(driver)
+            if search_page.click_first_search_result():
+                VideoPage(driver).wait_for_video_to_load()
+    
+    @staticmethod
+    def _accept_consent(page) -> bool:
+        # Either the consent.youtube.com interstitial or the in-page dialog
+        if not page.is_element_present(CONSENT_BUTTONS):
+            return False
+        if page.click_element(CONSENT_BUTTONS):
+            page.wait_for_page_load()
+            return True
+        return False
+    
+    def session_copy(self) -> Optional[str]:
+        if not self.ensure_fresh():
+            return None
+        
+        # Resolved once, so a template swapped in mid-copy does not matter
+        profile_dir = self.profile_dir
+        session_dir = tempfile.mkdtemp(prefix=f"{self.browser}-session-")
+        try:
+            shutil.copytree(profile_dir, session_dir, dirs_exist_ok=True,
+                            ignore=lambda directory, names: [name for name in names if name in _LOCK_FILES])
+        except (OSError, shutil.Error) as e:
+            print(f"Failed to copy {self.browser} profile template: {e}")
+            shutil.rmtree(session_dir, ignore_errors=True)
+            return None
+        return session_dir
+    
+    def check_browser_version(self, browser_version: str) -> None:
+        manifest = self.read_manifest()
+        if manifest and browser_version and manifest.get("browser_version") != browser_version:
+            # Profiles written by another browser version may be migrated or
+            # rejected; have the next session rebuild the template
+            manifest["stale"] = f"browser {manifest.get('browser_version')} -> {browser_version}"
+            self._write_manifest(manifest)
+    
+    def invalidate(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, self.manifest_path)
+    
+    def _acquire_lock(self) -> bool:
+        # A single attempt: a session never waits for another worker's build
+        for _ in range(2):
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.path.getmtime(self.lock_path) <= BUILD_LOCK_TIMEOUT_SECONDS:
+                    return False
+                os.remove(self.lock_path)
+            except OSError:
+                pass
+        return False
+    
+    def _release_lock(self) -> None:
+        try:
+            os.remove(self.lock_path)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _directory_size(path: str) -> int:
+        total = 0
+        for directory, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(directory, name))
+                except OSError:
+                    pass
+        return total
+    
+    @staticmethod
+    def remove_session_copy(path: Optional[str]) -> None:
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pre-warmed browser profile templates")
+    parser.add_argument("--browser", action="append", help="chrome, firefox or edge (repeatable)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild even if the template is fresh")
+    args = parser.parse_args()
+    
+    for browser in args.browser or [TestConfig.BROWSER]:
+        template = ProfileTemplate(browser)
+        if args.rebuild:
+            template.invalidate()
+        reason = template.stale_reason()
+        if reason is None:
+            print(f"{browser}: template is fresh ({template.read_manifest().get('created')})")
+        elif template.ensure_fresh():
+            print(f"{browser}: built template in {template.profile_dir}")
+        else:
+            print(f"{browser}: failed to build template ({reason})")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,566 @@
+import datetime
+import glob
+import hashlib
+import http.client
+import importlib.util
+import ipaddress
+import json
+import os
+import select
+import shutil
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+REPLAY_MODES = ["record", "replay"]
+
+LATENCY_MODES = ["recorded", "zero"]
+
+# Query parameters that change on every page load and would otherwise make
+# each request signature unique
+VOLATILE_PARAMS = ["_", "cb", "cachebuster", "rnd", "t", "timestamp"]
+
+_HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "proxy-connection", "te", "trailers", "transfer-encoding", "upgrade"
+}
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key not in VOLATILE_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+def request_signature(method: str, url: str, body: bytes = b"") -> str:
+    body_hash = hashlib.sha1(body).hexdigest() if body else ""
+    key = f"{method.upper()} {normalize_url(url)} {body_hash}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class ReplayArchive:
+    """Compressed archive of recorded HTTP exchanges keyed by request signature.
+    
+    An archive is a deflated zip holding an index.json with the response
+    metadata and one member per response body. A signature recorded several
+    times is replayed in order, repeating the last response once exhausted.
+    """
+    
+    INDEX_NAME = "index.json"
+    
+    def __init__(self):
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+    
+    def add(self, signature: str, method: str, url: str, status: int, headers: List[List[str]],
+            body: bytes, latency_ms: float) -> None:
+        with self._lock:
+            entries = self._entries.setdefault(signature, [])
+            body_name = f"bodies/{signature}-{len(entries)}"
+            entries.append({
+                "method": method,
+                "url": url,
+                "status": status,
+                "headers": headers,
+                "body": body_name,
+                "latency_ms": round(latency_ms, 1)
+            })
+            self._bodies[body_name] = body
+    
+    def lookup(self, signature: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries = self._entries.get(signature)
+            if not entries:
+                return None
+            cursor = self._cursors.get(signature, 0)
+            self._cursors[signature] = cursor + 1
+            entry = dict(entries[min(cursor, len(entries) - 1)])
+            entry["body"] = self._bodies.get(entry["body"], b"")
+            return entry
+    
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock, zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(ReplayArchive.INDEX_NAME, json.dumps(self._entries, indent=1))
+            for name, body in self._bodies.items():
+                archive.writestr(name, body)
+        return path
+    
+    @staticmethod
+    def load(paths: List[str]) -> "ReplayArchive":
+        replay_archive = ReplayArchive()
+        for path in paths:
+            with zipfile.ZipFile(path) as archive:
+                entries = json.loads(archive.read(ReplayArchive.INDEX_NAME))
+                for signature, recorded in entries.items():
+                    replay_archive._entries.setdefault(signature, []).extend(recorded)
+                    for entry in recorded:
+                        replay_archive._bodies[entry["body"]] = archive.read(entry["body"])
+        return replay_archive
+    
+    @staticmethod
+    def archive_paths(base_path: str) -> List[str]:
+        # Recording under xdist writes one archive per worker next to the
+        # base path; replay loads all of them
+        root, ext = os.path.splitext(base_path)
+        paths = [base_path] if os.path.isfile(base_path) else []
+        return paths + sorted(glob.glob(f"{root}-gw*{ext}"))
+
+
+class ProxyCertificates:
+    """Local certificate authority for intercepting HTTPS through the proxy.
+    
+    The CA is created once in REPLAY_CA_DIR and reused across runs and xdist
+    workers; ca.pem can be imported into any client that should trust it.
+    Each intercepted host gets a certificate signed by the CA, minted on
+    first use and kept for the life of the proxy. Needs the cryptography
+    package.
+    """
+    
+    BUNDLE_NAME = "ca-bundle.pem"
+    CERT_NAME = "ca.pem"
+    
+    def __init__(self, directory: str):
+        from cryptography.hazmat.primitives.asymmetric import ec
+        
+        self.directory = directory
+        self._contexts: Dict[str, ssl.SSLContext] = {}
+        self._lock = threading.Lock()
+        self._workdir = tempfile.mkdtemp(prefix="replay-certs-")
+        self._ca_key, self._ca_cert = self._load_or_create_ca()
+        # One key for every host certificate; minting is then only a signature
+        self._host_key = ec.generate_private_key(ec.SECP256R1())
+    
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("cryptography") is not None
+    
+    @property
+    def ca_path(self) -> str:
+        return os.path.join(self.directory, ProxyCertificates.CERT_NAME)
+    
+    @staticmethod
+    def _builder(subject, issuer, public_key, days: int):
+        from cryptography import x509
+        
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return (x509.CertificateBuilder()
+                .subject_name(subject)
+                .issuer_name(issuer)
+                .public_key(public_key)
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(now - datetime.timedelta(days=1))
+                .not_valid_after(now + datetime.timedelta(days=days)))
+    
+    def _load_or_create_ca(self):
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.x509.oid import NameOID
+        
+        os.makedirs(self.directory, exist_ok=True)
+        bundle_path = os.path.join(self.directory, ProxyCertificates.BUNDLE_NAME)
+        if not os.path.exists(bundle_path):
+            key = ec.generate_private_key(ec.SECP256R1())
+            name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Selenium replay proxy CA")])
+            certificate = (self._builder(name, name, key.public_key(), 3650)
+                           .add_extension(x509.BasicConstraints(ca=True, path_length=0), critical=True)
+                           .add_extension(x509.KeyUsage(False, False, False, False, False, True, True, False, False),
+                                          critical=True)
+                           .sign(key, hashes.SHA256()))
+            temp_path = f"{bundle_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                             serialization.NoEncryption()))
+                file.write(certificate.public_bytes(serialization.Encoding.PEM))
+            try:
+                # Workers starting together race here; the first link wins
+                # and everyone loads that one
+                os.link(temp_path, bundle_path)
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(temp_path)
+        
+        with open(bundle_path, "rb") as file:
+            data = file.read()
+        key = serialization.load_pem_private_key(data, password=None)
+        certificate = x509.load_pem_x509_certificate(data[data.index(b"-----BEGIN CERTIFICATE-----"):])
+        temp_path = f"{self.ca_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(certificate.public_bytes(serialization.Encoding.PEM))
+        os.replace(temp_path, self.ca_path)
+        return key, certificate
+    
+    def context_for(self, host: str) -> ssl.SSLContext:
+        with self._lock:
+            context = self._contexts.get(host)
+            if context is None:
+                context = self._contexts[host] = self._mint(host)
+            return context
+    
+    def _mint(self, host: str) -> ssl.SSLContext:
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+        
+        try:
+            alternative_name = x509.IPAddress(ipaddress.ip_address(host))
+        except ValueError:
+            alternative_name = x509.DNSName(host)
+        certificate = (self._builder(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host[:64])]),
+                                     self._ca_cert.subject, self._host_key.public_key(), 365)
+                       .add_extension(x509.SubjectAlternativeName([alternative_name]), critical=False)
+                       .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+                       .add_extension(x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]), critical=False)
+                       .sign(self._ca_key, hashes.SHA256()))
+        
+        # load_cert_chain only reads files
+        path = os.path.join(self._workdir, f"{hashlib.sha1(host.encode('utf-8')).hexdigest()}.pem")
+        with open(path, "wb") as file:
+            file.write(self._host_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                                    serialization.NoEncryption()))
+            file.write(certificate.public_bytes(serialization.Encoding.PEM))
+            file.write(self._ca_cert.public_bytes(serialization.Encoding.PEM))
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(path)
+        # The handler speaks HTTP/1.1 only
+        context.set_alpn_protocols(["http/1.1"])
+        return context
+    
+    def close(self) -> None:
+        shutil.rmtree(self._workdir, ignore_errors=True)
+
+
+class ReplayProxyHandler(BaseHTTPRequestHandler):
+    
+    protocol_version = "HTTP/1.1"
+    
+    # Scheme and authority of an intercepted CONNECT tunnel, whose requests
+    # carry only a path
+    origin: Optional[str] = None
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self._handle()
+    
+    do_HEAD = do_GET
+    do_POST = do_GET
+    do_PUT = do_GET
+    do_DELETE = do_GET
+    do_OPTIONS = do_GET
+    do_PATCH = do_GET
+    
+    def do_CONNECT(self):
+        if self.server.certificates is not None:
+            self._intercept()
+            return
+        
+        # Without a local CA TLS traffic cannot be recorded, so HTTPS is
+        # tunnelled while recording and refused while replaying
+        if self.server.mode == "replay":
+            self.server.count("refused")
+            self._send_error(502, "HTTPS is not available in replay mode")
+            return
+        
+        host, _, port = self.path.rpartition(":")
+        try:
+            upstream = socket.create_connection((host.strip("[]"), int(port or 443)), timeout=30)
+        except (OSError, ValueError) as e:
+            self._send_error(502, f"Tunnel to {self.path} failed: {e}")
+            return
+        
+        self.server.count("tunnelled")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self._pipe(self.connection, upstream)
+    
+    def _intercept(self):
+        # Terminate TLS with a certificate for the requested host and handle
+        # the requests inside the tunnel like plain proxy requests, so they
+        # are recorded and replayed the same way
+        authority, _, port = self.path.rpartition(":")
+        if port == "443":
+            # Requests to the default port are recorded without it, as the
+            # browser would write the URL
+            origin = f"https://{authority}"
+        else:
+            origin = f"https://{self.path}"
+        host = authority.strip("[]")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            tls = self.server.certificates.context_for(host).wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError) as e:
+            self.server.count("errors")
+            self.log_error("TLS handshake for %s failed: %s", self.path, e)
+            return
+        
+        self.server.count("intercepted")
+        try:
+            TunnelRequestHandler(tls, self.client_address, self.server, origin)
+        except (ssl.SSLError, OSError):
+            pass
+        finally:
+            tls.close()
+    
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if "://" in self.path:
+            url = self.path
+        elif self.origin:
+            url = f"{self.origin}{self.path}"
+        else:
+            url = f"http://{self.headers.get('Host', '')}{self.path}"
+        signature = request_signature(self.command, url, body)
+        
+        if self.server.mode == "replay":
+            entry = self.server.archive.lookup(signature)
+            if entry is None:
+                self.server.count("misses")
+                self._send_error(504, f"No recording for {self.command} {url}")
+                return
+            self.server.count("hits")
+            if self.server.latency == "recorded" and entry["latency_ms"]:
+                time.sleep(entry["latency_ms"] / 1000.0)
+            self._send_response(entry["status"], entry["headers"], entry["body"])
+            return
+        
+        try:
+            status, headers, response_body, latency_ms = self._forward(url, body)
+        except (OSError, http.client.HTTPException) as e:
+            self.server.count("errors")
+            self._send_error(502, f"Upstream request failed: {e}")
+            return
+        
+        self.server.archive.add(signature, self.command, url, status, headers, response_body, latency_ms)
+        self.server.count("recorded")
+        self._send_response(status, headers, response_body)
+    
+    def _forward(self, url: str, body: bytes):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(parts.netloc, timeout=60)
+        path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        headers = {key: value for key, value in self.headers.items() if key.lower() not in _HOP_BY_HOP_HEADERS}
+        
+        started = time.perf_counter()
+        try:
+            connection.request(self.command, path, body=body or None, headers=headers)
+            response = connection.getresponse()
+            latency_ms = (time.perf_counter() - started) * 1000
+            response_body = response.read()
+            response_headers = [[key, value] for key, value in response.getheaders()
+                                if key.lower() not in _HOP_BY_HOP_HEADERS and key.lower() != "content-length"]
+            return response.status, response_headers, response_body, latency_ms
+        finally:
+            connection.close()
+    
+    def _send_response(self, status: int, headers: List[List[str]], body: bytes):
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def _send_error(self, status: int, message: str):
+        self._send_response(status, [["Content-Type", "text/plain; charset=utf-8"]], message.encode("utf-8"))
+    
+    def _pipe(self, client: socket.socket, upstream: socket.socket):
+        sockets = [client, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, 60)
+                if errored or not readable:
+                    break
+                for source in readable:
+                    data = source.recv(65536)
+                    if not data:
+                        return
+                    (upstream if source is client else client).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+
+class TunnelRequestHandler(ReplayProxyHandler):
+    """Serves the requests of one intercepted CONNECT tunnel."""
+    
+    def __init__(self, request, client_address, server, origin: str):
+        self.origin = origin
+        super().__init__(request, client_address, server)
+    
+    def do_CONNECT(self):
+        self._send_error(400, "CONNECT inside a tunnel")
+
+
+class ReplayProxyServer(ThreadingHTTPServer):
+    
+    daemon_threads = True
+    
+    def __init__(self, address, mode: str, archive: ReplayArchive, latency: str,
+                 certificates: Optional[ProxyCertificates] = None):
+        super().__init__(address, ReplayProxyHandler)
+        self.mode = mode
+        self.archive = archive
+        self.latency = latency
+        self.certificates = certificates
+        self.stats = {"recorded": 0, "hits": 0, "misses": 0, "intercepted": 0, "tunnelled": 0, "refused": 0,
+                      "errors": 0}
+        self._stats_lock = threading.Lock()
+    
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+
+class ReplayProxy:
+    """Local HTTP proxy that records a session's traffic or replays it offline.
+    
+    In record mode exchanges are forwarded, stored and written to the
+    archive on stop. HTTPS is intercepted with certificates from a local CA
+    (ProxyCertificates), so it is recorded like plain HTTP; without the
+    cryptography package it is tunnelled through unrecorded instead. In
+    replay mode responses come from the archive with their recorded latency
+    (or none) and nothing reaches the network.
+    """
+    
+    _current: Optional["ReplayProxy"] = None
+    
+    def __init__(self, archive_path: str, mode: str = "replay", host: str = "127.0.0.1", port: int = 8780,
+                 latency: str = "recorded", intercept_https: bool = True, ca_dir: Optional[str] = None):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}. Available: {', '.join(REPLAY_MODES)}")
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency: {latency}. Available: {', '.join(LATENCY_MODES)}")
+        
+        self.archive_path = archive_path
+        self.mode = mode
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.intercept_https = intercept_https
+        self.ca_dir = ca_dir or os.path.join(os.getcwd(), ".replay_ca")
+        self.certificates: Optional[ProxyCertificates] = None
+        self._server: Optional[ReplayProxyServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._server.stats) if self._server else {}
+    
+    def start(self) -> "ReplayProxy":
+        if self._server is not None:
+            return self
+        
+        if self.mode == "replay":
+            paths = ReplayArchive.archive_paths(self.archive_path)
+            if not paths:
+                raise FileNotFoundError(f"No replay archive found at {self.archive_path}")
+            archive = ReplayArchive.load(paths)
+        else:
+            archive = ReplayArchive()
+        
+        if self.intercept_https and ProxyCertificates.available():
+            self.certificates = ProxyCertificates(self.ca_dir)
+        elif self.intercept_https:
+            print("cryptography is not installed; HTTPS will not be recorded or replayed")
+        
+        self._server = ReplayProxyServer((self.host, self.port), self.mode, archive, self.latency, self.certificates)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-proxy", daemon=True)
+        self._thread.start()
+        ReplayProxy._current = self
+        return self
+    
+    def stop(self) -> Optional[str]:
+        if self._server is None:
+            return None
+        
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        saved_path = None
+        if self.mode == "record":
+            saved_path = self._server.archive.save(self.archive_path)
+        
+        if self.certificates is not None:
+            self.certificates.close()
+            self.certificates = None
+        self._server = None
+        self._thread = None
+        if ReplayProxy._current is self:
+            ReplayProxy._current = None
+        return saved_path
+    
+    @staticmethod
+    def current_address() -> Optional[str]:
+        proxy = ReplayProxy._current
+        return proxy.address if proxy else None
+    
+    @staticmethod
+    def worker_archive_path(base_path: str, worker: Optional[str]) -> str:
+        if not worker:
+            return base_path
+        root, ext = os.path.splitext(base_path)
+        return f"{root}-{worker}{ext}"
+    
+    @staticmethod
+    def from_config() -> Optional["ReplayProxy"]:
+        from config.config import TestConfig
+        if not TestConfig.REPLAY_MODE:
+            return None
+        
+        archive_path = TestConfig.REPLAY_ARCHIVE
+        if TestConfig.REPLAY_MODE == "record":
+            archive_path = ReplayProxy.worker_archive_path(archive_path, os.getenv("PYTEST_XDIST_WORKER"))
+        return ReplayProxy(
+            archive_path,
+            mode=TestConfig.REPLAY_MODE,
+            port=TestConfig.REPLAY_PROXY_PORT,
+            latency=TestConfig.REPLAY_LATENCY,
+            intercept_https=TestConfig.REPLAY_INTERCEPT_HTTPS,
+            ca_dir=TestConfig.REPLAY_CA_DIR
+        )
+    
+    @staticmethod
+    def chromium_arguments(address: str) -> List[str]:
+        # Chromium never proxies loopback hosts unless told to, which would
+        # bypass the archive for the local stand-in
+        return [f"--proxy-server=http://{address}", "--proxy-bypass-list=<-loopback>"]
+    
+    @staticmethod
+    def apply_firefox_preferences(options, address: str) -> None:
+        host, _, port = address.rpartition(":")
+        options.set_preference("network.proxy.type", 1)
+        options.set_preference("network.proxy.http", host)
+        options.set_preference("network.proxy.http_port", int(port))
+        options.set_preference("network.proxy.ssl", host)
+        options.set_preference("network.proxy.ssl_port", int(port))
+        options.set_preference("network.proxy.no_proxies_on", "")
+        options.set_preference("network.proxy.allow_hijacking_localhost", True)
\ No newline at end of file
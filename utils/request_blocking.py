@@ -0,0 +1,170 @@
+import fnmatch
+import weakref
+from urllib.parse import quote
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+from utils.network_log import NetworkLog
+
+
+# URL patterns use the DevTools wildcard syntax (* matches anything), which
+# is also what shExpMatch understands in the Firefox PAC script.
+BLOCK_CATEGORIES: Dict[str, List[str]] = {
+    "ads": [
+        "*doubleclick.net/*",
+        "*googlesyndication.com/*",
+        "*googleadservices.com/*",
+        "*youtube.com/pagead/*",
+        "*youtube.com/api/stats/ads*",
+        "*youtube.com/ptracking*"
+    ],
+    "trackers": [
+        "*google-analytics.com/*",
+        "*googletagmanager.com/*",
+        "*youtube.com/api/stats/*",
+        "*youtube.com/youtubei/v1/log_event*",
+        "*youtube.com/generate_204*",
+        "*youtube.com/csi_204*"
+    ],
+    "thumbnails": [
+        "*i.ytimg.com/vi/*",
+        "*i.ytimg.com/vi_webp/*",
+        "*i.ytimg.com/an_webp/*"
+    ],
+    "media": [
+        "*googlevideo.com/videoplayback*"
+    ]
+}
+
+BLOCK_PROFILES: Dict[str, List[str]] = {
+    "none": [],
+    "ads": ["ads", "trackers"],
+    "functional": ["ads", "trackers", "thumbnails", "media"]
+}
+
+# Typical transfer size of one request per category, used to estimate what
+# a blocked request would have cost. Blocked requests never report a size.
+ESTIMATED_BYTES: Dict[str, int] = {
+    "ads": 40 * 1024,
+    "trackers": 1024,
+    "thumbnails": 25 * 1024,
+    "media": 512 * 1024
+}
+
+DISCARD_PROXY = "PROXY 127.0.0.1:9"
+
+
+class RequestBlocker:
+    """Blocks ads, trackers and heavy media per named profile.
+    
+    Chromium sessions use Network.setBlockedURLs and report blocked requests
+    from the DevTools performance log. Firefox sessions route matching URLs
+    to a discard proxy through a PAC script; they are blocked but not counted.
+    """
+    
+    _active = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def get_categories(profile: str) -> List[str]:
+        if profile not in BLOCK_PROFILES:
+            raise ValueError(f"Unknown request block profile: {profile}. Available: {', '.join(BLOCK_PROFILES)}")
+        return BLOCK_PROFILES[profile]
+    
+    @staticmethod
+    def get_patterns(profile: str) -> List[str]:
+        patterns = []
+        for category in RequestBlocker.get_categories(profile):
+            patterns.extend(BLOCK_CATEGORIES[category])
+        return patterns
+    
+    @staticmethod
+    def categorize(url: str) -> Optional[str]:
+        for category, patterns in BLOCK_CATEGORIES.items():
+            if any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns):
+                return category
+        return None
+    
+    @staticmethod
+    def apply_chromium(driver, profile: str) -> bool:
+        patterns = RequestBlocker.get_patterns(profile)
+        if not patterns:
+            return False
+        
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except WebDriverException as e:
+            print(f"Failed to enable request blocking profile '{profile}': {e}")
+            return False
+        
+        RequestBlocker._active[driver] = {"profile": profile, "blocked": {}, "seen_urls": {}}
+        return True
+    
+    @staticmethod
+    def firefox_pac_script(profile: str, upstream: str = "DIRECT") -> str:
+        conditions = " ||\n        ".join(
+            f'shExpMatch(url, "{pattern}")' for pattern in RequestBlocker.get_patterns(profile)
+        )
+        if not conditions:
+            return f'function FindProxyForURL(url, host) {{ return "{upstream}"; }}'
+        
+        return (
+            "function FindProxyForURL(url, host) {\n"
+            f"    if ({conditions}) {{\n"
+            f'        return "{DISCARD_PROXY}";\n'
+            "    }\n"
+            f'    return "{upstream}";\n'
+            "}"
+        )
+    
+    @staticmethod
+    def apply_firefox_preferences(options, profile: str, upstream: str = "DIRECT") -> bool:
+        if not RequestBlocker.get_patterns(profile):
+            return False
+        
+        pac = RequestBlocker.firefox_pac_script(profile, upstream)
+        options.set_preference("network.proxy.type", 2)
+        options.set_preference("network.proxy.autoconfig_url", "data:text/javascript," + quote(pac))
+        # Without this Firefox strips HTTPS URLs down to the origin before
+        # calling FindProxyForURL and path patterns never match
+        options.set_preference("network.proxy.autoconfig_url.include_path", True)
+        return True
+    
+    @staticmethod
+    def is_active(driver) -> bool:
+        return driver in RequestBlocker._active
+    
+    @staticmethod
+    def collect_stats(driver) -> Optional[Dict[str, Any]]:
+        state = RequestBlocker._active.get(driver)
+        if state is None:
+            return None
+        
+        for event in NetworkLog.poll(driver):
+            params = event["params"]
+            request_id = params.get("requestId")
+            if event["method"] == "Network.requestWillBeSent":
+                state["seen_urls"][request_id] = params.get("request", {}).get("url", "")
+            elif event["method"] == "Network.loadingFailed" and params.get("blockedReason"):
+                url = state["seen_urls"].get(request_id, "")
+                state["blocked"][request_id] = RequestBlocker.categorize(url) or "other"
+        
+        by_category: Dict[str, int] = {}
+        for category in state["blocked"].values():
+            by_category[category] = by_category.get(category, 0) + 1
+        
+        return {
+            "profile": state["profile"],
+            "blocked_requests": len(state["blocked"]),
+            "estimated_bytes_saved": sum(
+                ESTIMATED_BYTES.get(category, 0) * count for category, count in by_category.items()
+            ),
+            "by_category": by_category
+        }
+    
+    @staticmethod
+    def reset_stats(driver) -> None:
+        state = RequestBlocker._active.get(driver)
+        if state is not None:
+            NetworkLog.poll(driver)
+            state["blocked"] = {}
+            state["seen_urls"] = {}
\ No newline at end of file
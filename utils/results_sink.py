@@ -0,0 +1,126 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from config.config import TestConfig
+from utils.run_metrics import RunMetrics
+
+
+class ResultsSink:
+    """Append-only JSON Lines store for per-test result records.
+    
+    Each process (xdist worker or the controller) buffers compact records
+    and appends them to its own part file in batches, so no two processes
+    write the same file and there is no file per test. The controller merges
+    the parts into one run-<run id>.jsonl at session end.
+    """
+    
+    _buffer: List[str] = []
+    _last_flush = time.monotonic()
+    _lock = threading.Lock()
+    _registered = False
+    _session_workers: Set[str] = set()
+    
+    @staticmethod
+    def run_id() -> str:
+        # Set once by the controller before workers start; they inherit it.
+        # Parallel Jenkins stages share the workspace and start within the
+        # same second, so the timestamp alone would collide
+        return os.environ.setdefault(
+            "TEST_RUN_ID", f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        )
+    
+    @staticmethod
+    def worker_id() -> str:
+        return os.environ.get("PYTEST_XDIST_WORKER", "main")
+    
+    @classmethod
+    def part_path(cls) -> str:
+        return os.path.join(TestConfig.RESULTS_DIR, f"results-{cls.run_id()}-{cls.worker_id()}.jsonl")
+    
+    @classmethod
+    def run_path(cls, run_id: Optional[str] = None) -> str:
+        return os.path.join(TestConfig.RESULTS_DIR, f"run-{run_id or cls.run_id()}.jsonl")
+    
+    @classmethod
+    def add_session_worker(cls, worker: str) -> None:
+        cls._session_workers.add(worker)
+    
+    @classmethod
+    def append(cls, record: Dict[str, Any]) -> None:
+        line = json.dumps(dict(record, run_id=cls.run_id(), worker=cls.worker_id()),
+                          separators=(",", ":"), default=str)
+        with cls._lock:
+            cls._buffer.append(line)
+            if not cls._registered:
+                atexit.register(cls.flush)
+                cls._registered = True
+            due = (len(cls._buffer) >= TestConfig.RESULTS_BATCH_SIZE
+                   or time.monotonic() - cls._last_flush >= TestConfig.RESULTS_FLUSH_SECONDS)
+            buffered = len(cls._buffer)
+        RunMetrics.inc("selenium_result_records_total")
+        RunMetrics.set("selenium_result_records_buffered", buffered)
+        if due:
+            cls.flush()
+    
+    @classmethod
+    def flush(cls) -> int:
+        with cls._lock:
+            lines, cls._buffer = cls._buffer, []
+            cls._last_flush = time.monotonic()
+            RunMetrics.set("selenium_result_records_buffered", 0)
+            if not lines:
+                return 0
+            os.makedirs(TestConfig.RESULTS_DIR, exist_ok=True)
+            # One write per batch in append mode
+            with open(cls.part_path(), "a") as file:
+                file.write("\n".join(lines) + "\n")
+        return len(lines)
+    
+    @classmethod
+    def merge(cls, run_id: Optional[str] = None, workers: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Concatenate the part files of this run's processes into the run
+        file and remove them.
+        
+        Only parts of the given workers (by default the controller and the
+        xdist workers of this session) are merged, so a part file that
+        another session is still appending to is never read or removed.
+        """
+        run_id = run_id or cls.run_id()
+        workers = set(cls._session_workers | {cls.worker_id()} if workers is None else workers)
+        prefix = os.path.join(TestConfig.RESULTS_DIR, f"results-{run_id}-")
+        parts = sorted(part for part in glob.glob(f"{glob.escape(prefix)}*.jsonl")
+                       if part[len(prefix):-len(".jsonl")] in workers)
+        if not parts:
+            return None
+        
+        path = cls.run_path(run_id)
+        with open(path, "a") as merged:
+            for part in parts:
+                with open(part) as file:
+                    for line in file:
+                        # Skip a line torn by a crashed worker
+                        if line.endswith("\n"):
+                            merged.write(line)
+        for part in parts:
+            os.remove(part)
+        return path
+    
+    @classmethod
+    def read_run(cls, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        records = []
+        try:
+            with open(cls.run_path(run_id)) as file:
+                for line in file:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return records
\ No newline at end of file
@@ -0,0 +1,334 @@
+import json
+import glob
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+import pytest
+from config.config import TestConfig
+
+
+METRICS = {
+    "selenium_tests_collected": ("gauge", "Tests collected for this run"),
+    "selenium_tests_completed_total": ("counter", "Tests finished, by outcome"),
+    "selenium_tests_remaining": ("gauge", "Tests collected but not finished yet"),
+    "selenium_tests_per_minute": ("gauge", "Tests finished per minute over the last TESTS_PER_MINUTE_WINDOW seconds"),
+    "selenium_run_seconds": ("gauge", "Seconds since the run started"),
+    "selenium_test_seconds_total": ("counter", "Time spent running tests"),
+    "selenium_current_test_seconds": ("gauge", "How long the worker's current test has been running"),
+    "selenium_drivers_active": ("gauge", "Browser sessions currently open"),
+    "selenium_driver_starts_total": ("counter", "Browser sessions started"),
+    "selenium_driver_start_failures_total": ("counter", "Browser sessions that failed to start"),
+    "selenium_driver_start_seconds_total": ("counter", "Time spent starting browser sessions"),
+    "selenium_driver_pool_utilization": ("gauge", "Open browser sessions per worker"),
+    "selenium_wait_seconds_total": ("counter", "Time spent in explicit waits"),
+    "selenium_waits_total": ("counter", "Explicit waits run"),
+    "selenium_wait_timeouts_total": ("counter", "Explicit waits that timed out"),
+    "selenium_wait_time_share": ("gauge", "Share of test time spent in explicit waits"),
+    "selenium_result_records_total": ("counter", "Result records appended to the results sink"),
+    "selenium_result_records_buffered": ("gauge", "Result records not yet written to disk"),
+    "selenium_screenshot_queue_depth": ("gauge", "Screenshots waiting for the background pipeline"),
+    "selenium_snapshot_age_seconds": ("gauge", "Age of the worker's latest metrics snapshot")
+}
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(labels.items()))
+
+
+class RunMetrics:
+    """Process-wide counters for a live view of a running suite.
+    
+    DriverManager, WaitStats and ResultsSink push their counts here, and a
+    background thread writes the process's values to METRICS_DIR every
+    METRICS_SNAPSHOT_SECONDS. Under xdist every worker writes its own
+    snapshot; the controller adds the per-test counts it receives, serves
+    all of them in Prometheus text format on METRICS_PORT and keeps a
+    combined .prom file on disk, so a stuck run can be inspected from the
+    files alone.
+    """
+    
+    enabled = TestConfig.METRICS_ENABLED
+    
+    TESTS_PER_MINUTE_WINDOW = 300
+    
+    _lock = threading.Lock()
+    _values: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+    _completions: deque = deque()
+    _current_test: Optional[Tuple[str, float]] = None
+    _started = time.time()
+    _snapshot_thread: Optional[threading.Thread] = None
+    _stop = threading.Event()
+    
+    @classmethod
+    def inc(cls, name: str, value: float = 1, **labels: str) -> None:
+        if not cls.enabled:
+            return
+        with cls._lock:
+            series = cls._values.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+    
+    @classmethod
+    def set(cls, name: str, value: float, **labels: str) -> None:
+        if not cls.enabled:
+            return
+        with cls._lock:
+            cls._values.setdefault(name, {})[_label_key(labels)] = value
+    
+    @classmethod
+    def test_started(cls, nodeid: Optional[str]) -> None:
+        if cls.enabled:
+            cls._current_test = (nodeid, time.time()) if nodeid else None
+    
+    @classmethod
+    def test_finished(cls, outcome: str) -> None:
+        if not cls.enabled:
+            return
+        cls.inc("selenium_tests_completed_total", outcome=outcome)
+        now = time.time()
+        with cls._lock:
+            cls._completions.append(now)
+            while cls._completions and cls._completions[0] < now - cls.TESTS_PER_MINUTE_WINDOW:
+                cls._completions.popleft()
+    
+    @staticmethod
+    def worker_id() -> str:
+        return os.environ.get("PYTEST_XDIST_WORKER", "main")
+    
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        from utils.screenshot_pipeline import ScreenshotPipeline
+        cls.set("selenium_screenshot_queue_depth", ScreenshotPipeline.pending_count())
+        now = time.time()
+        current = cls._current_test
+        cls.set("selenium_current_test_seconds", round(now - current[1], 1) if current else 0)
+        with cls._lock:
+            window = min(cls.TESTS_PER_MINUTE_WINDOW, max(1.0, now - cls._started))
+            series = [[name, dict(key), value] for name, values in cls._values.items() for key, value in values.items()]
+            completions = len(cls._completions)
+        return {
+            "worker": cls.worker_id(),
+            "pid": os.getpid(),
+            "time": now,
+            "started": cls._started,
+            "current_test": current[0] if current else None,
+            "tests_per_minute": round(completions * 60.0 / window, 2),
+            "series": series
+        }
+    
+    @classmethod
+    def _snapshot_path(cls, worker: str) -> str:
+        from utils.results_sink import ResultsSink
+        # The run id is unique per pytest session, so sessions running side
+        # by side in one workspace never read each other's snapshots
+        return os.path.join(TestConfig.METRICS_DIR, f"{ResultsSink.run_id()}-{worker}.json")
+    
+    @classmethod
+    def write_snapshot(cls, include_workers: bool = False) -> Optional[str]:
+        snapshot = cls.snapshot()
+        path = cls._snapshot_path(snapshot["worker"])
+        try:
+            os.makedirs(TestConfig.METRICS_DIR, exist_ok=True)
+            with open(f"{path}.tmp", "w") as file:
+                json.dump(snapshot, file)
+            os.replace(f"{path}.tmp", path)
+            if include_workers:
+                prometheus_path = os.path.splitext(path)[0] + ".prom"
+                with open(f"{prometheus_path}.tmp", "w") as file:
+                    file.write(cls.render(snapshot))
+                os.replace(f"{prometheus_path}.tmp", prometheus_path)
+        except OSError as e:
+            print(f"Failed to write metrics snapshot: {e}")
+            return None
+        return path
+    
+    @classmethod
+    def start_snapshots(cls, include_workers: bool = False) -> None:
+        if not cls.enabled or cls._snapshot_thread is not None:
+            return
+        cls._stop.clear()
+        
+        def run():
+            while not cls._stop.wait(TestConfig.METRICS_SNAPSHOT_SECONDS):
+                cls.write_snapshot(include_workers)
+        
+        cls._snapshot_thread = threading.Thread(target=run, name="metrics-snapshots", daemon=True)
+        cls._snapshot_thread.start()
+    
+    @classmethod
+    def stop_snapshots(cls, include_workers: bool = False) -> None:
+        if cls._snapshot_thread is None:
+            return
+        cls._stop.set()
+        cls._snapshot_thread.join(timeout=5)
+        cls._snapshot_thread = None
+        cls.write_snapshot(include_workers)
+    
+    @classmethod
+    def worker_snapshots(cls) -> List[Dict[str, Any]]:
+        snapshots = []
+        own = os.path.basename(cls._snapshot_path(cls.worker_id()))
+        for path in glob.glob(cls._snapshot_path("*")):
+            if os.path.basename(path) == own:
+                continue
+            try:
+                with open(path) as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+    
+    @classmethod
+    def render(cls, own: Optional[Dict[str, Any]] = None) -> str:
+        """Prometheus text for this process and every worker snapshot of
+        the run, with derived pool, wait share and throughput gauges."""
+        own = own or cls.snapshot()
+        snapshots = [own] + cls.worker_snapshots()
+        samples: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+        
+        def add(name, labels, value):
+            samples.setdefault(name, []).append((labels, value))
+        
+        totals: Dict[str, float] = {}
+        for snapshot in snapshots:
+            worker = snapshot["worker"]
+            for name, labels, value in snapshot["series"]:
+                if name == "selenium_current_test_seconds" and snapshot.get("current_test"):
+                    labels = dict(labels, test=snapshot["current_test"])
+                add(name, dict(labels, worker=worker), value)
+                totals[name] = totals.get(name, 0) + value
+            if snapshot is not own:
+                add("selenium_snapshot_age_seconds", {"worker": worker}, round(own["time"] - snapshot["time"], 1))
+        
+        workers = max(1, len(snapshots) - 1) if len(snapshots) > 1 else 1
+        completed = sum(value for name, _, value in own["series"] if name == "selenium_tests_completed_total")
+        collected = totals.get("selenium_tests_collected", 0)
+        add("selenium_run_seconds", {}, round(own["time"] - own["started"], 1))
+        add("selenium_tests_per_minute", {}, own["tests_per_minute"])
+        if collected:
+            add("selenium_tests_remaining", {}, max(0, collected - completed))
+        add("selenium_driver_pool_utilization", {}, round(totals.get("selenium_drivers_active", 0) / workers, 3))
+        if totals.get("selenium_test_seconds_total"):
+            add("selenium_wait_time_share", {},
+                round(totals.get("selenium_wait_seconds_total", 0) / totals["selenium_test_seconds_total"], 3))
+        
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            if name not in samples:
+                continue
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples[name]:
+                label_text = ",".join(
+                    f'{key}="{str(label).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                    for key, label in sorted(labels.items())
+                )
+                lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        if self.path.split("?", 1)[0] == "/metrics":
+            body = RunMetrics.render().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?", 1)[0] == "/snapshot":
+            body = json.dumps([RunMetrics.snapshot()] + RunMetrics.worker_snapshots(), indent=2).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None):
+        self.host = host or TestConfig.METRICS_HOST
+        self.port = TestConfig.METRICS_PORT if port is None else port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+    
+    def start(self) -> "MetricsServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+
+
+class RunMetricsPlugin:
+    """Counts tests for RunMetrics and runs the snapshots and endpoint.
+    
+    Tests are counted where their reports arrive (the controller under
+    xdist) and timed where they run (the workers).
+    """
+    
+    def __init__(self, config):
+        self.controller = not hasattr(config, "workerinput")
+        self.distributed = bool(getattr(config.option, "numprocesses", None)) and self.controller
+        self.server: Optional[MetricsServer] = None
+    
+    def pytest_sessionstart(self, session):
+        if self.controller and TestConfig.METRICS_PORT:
+            try:
+                self.server = MetricsServer().start()
+                print(f"\nRun metrics on {self.server.url}")
+            except OSError as e:
+                print(f"\nRun metrics endpoint unavailable: {e}")
+        RunMetrics.start_snapshots(include_workers=self.controller)
+    
+    def pytest_collection_finish(self, session):
+        if self.controller and not self.distributed:
+            RunMetrics.set("selenium_tests_collected", len(session.items))
+    
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        # Every worker collects the full suite; count it once
+        RunMetrics.set("selenium_tests_collected", len(ids))
+    
+    def pytest_runtest_logstart(self, nodeid, location):
+        if not self.distributed:
+            RunMetrics.test_started(nodeid)
+    
+    def pytest_runtest_logreport(self, report):
+        if not self.distributed:
+            RunMetrics.inc("selenium_test_seconds_total", report.duration)
+        if not self.controller:
+            return
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            RunMetrics.test_finished(report.outcome if report.when == "call" or report.skipped else "error")
+    
+    def pytest_runtest_logfinish(self, nodeid, location):
+        if not self.distributed:
+            RunMetrics.test_started(None)
+    
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        RunMetrics.stop_snapshots(include_workers=self.controller)
+        if self.server:
+            self.server.stop()
\ No newline at end of file
@@ -0,0 +1,210 @@
+import base64
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+import requests
+import websocket
+from PIL import Image, features
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+
+
+class ScreencastRecorder:
+    """Ring-buffered DevTools screencast of one browser session.
+    
+    Chromium pushes JPEG frames over the DevTools websocket only when the
+    page repaints. A reader thread keeps the last VIDEO_BUFFER_SECONDS of
+    them, still base64-encoded, in a bounded deque; nothing is decoded or
+    written unless save() is called for a failed test. Firefox has no
+    DevTools screencast, so start() returns False there.
+    """
+    
+    def __init__(self, driver, fps: Optional[int] = None, scale: Optional[float] = None,
+                 buffer_seconds: Optional[int] = None, quality: Optional[int] = None):
+        self.driver = driver
+        self.fps = fps or TestConfig.VIDEO_FPS
+        self.scale = scale or TestConfig.VIDEO_SCALE
+        self.quality = quality or TestConfig.VIDEO_QUALITY
+        self.frames: Deque[Tuple[float, str]] = deque(maxlen=self.fps * (buffer_seconds or TestConfig.VIDEO_BUFFER_SECONDS))
+        self.dropped = 0
+        self._socket: Optional[websocket.WebSocket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._message_id = 0
+        self._send_lock = threading.Lock()
+    
+    @staticmethod
+    def debugger_address(driver) -> Optional[str]:
+        capabilities = getattr(driver, "capabilities", {}) or {}
+        for key in ("goog:chromeOptions", "ms:edgeOptions"):
+            address = (capabilities.get(key) or {}).get("debuggerAddress")
+            if address:
+                return address
+        return None
+    
+    def _page_websocket_url(self, address: str) -> Optional[str]:
+        targets = requests.get(f"http://{address}/json/list", timeout=5).json()
+        pages = [target for target in targets if target.get("type") == "page"]
+        # ChromeDriver window handles are the DevTools target ids
+        handle = self.driver.current_window_handle
+        for target in pages:
+            if target.get("id") == handle:
+                return target.get("webSocketDebuggerUrl")
+        return pages[0].get("webSocketDebuggerUrl") if pages else None
+    
+    def start(self) -> bool:
+        address = self.debugger_address(self.driver)
+        if not address:
+            return False
+        try:
+            url = self._page_websocket_url(address)
+            if not url:
+                return False
+            # Chrome rejects DevTools connections that send an Origin header
+            self._socket = websocket.create_connection(url, timeout=5, suppress_origin=True)
+            size = self.driver.get_window_size()
+            self._send("Page.startScreencast", {
+                "format": "jpeg",
+                "quality": self.quality,
+                "maxWidth": int(size["width"] * self.scale),
+                "maxHeight": int(size["height"] * self.scale)
+            })
+        except (OSError, ValueError, requests.RequestException, websocket.WebSocketException) as e:
+            print(f"Screencast recording unavailable: {e}")
+            self._close_socket()
+            return False
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._read_frames, name="screencast", daemon=True)
+        self._thread.start()
+        return True
+    
+    def _send(self, method: str, params: dict) -> None:
+        with self._send_lock:
+            self._message_id += 1
+            self._socket.send(json.dumps({"id": self._message_id, "method": method, "params": params}))
+    
+    def _read_frames(self) -> None:
+        interval = 1.0 / self.fps
+        last_kept = 0.0
+        self._socket.settimeout(1)
+        while self._running:
+            try:
+                message = json.loads(self._socket.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            except (OSError, ValueError, websocket.WebSocketException):
+                break
+            if message.get("method") != "Page.screencastFrame":
+                continue
+            
+            params = message["params"]
+            try:
+                # Chrome sends the next frame only after this ack
+                self._send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+            except (OSError, websocket.WebSocketException):
+                break
+            
+            timestamp = params.get("metadata", {}).get("timestamp") or time.time()
+            if timestamp - last_kept < interval:
+                self.dropped += 1
+                continue
+            last_kept = timestamp
+            self.frames.append((timestamp, params["data"]))
+    
+    def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        try:
+            self._send("Page.stopScreencast", {})
+        except (OSError, AttributeError, websocket.WebSocketException):
+            pass
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._close_socket()
+    
+    def _close_socket(self) -> None:
+        if self._socket:
+            try:
+                self._socket.close()
+            except (OSError, websocket.WebSocketException):
+                pass
+            self._socket = None
+    
+    def discard(self) -> None:
+        self.frames.clear()
+    
+    def _frame_durations(self):
+        frames = list(self.frames)
+        durations = []
+        for index, (timestamp, _) in enumerate(frames):
+            following = frames[index + 1][0] if index + 1 < len(frames) else timestamp + 1.0 / self.fps
+            durations.append(max(1.0 / self.fps, following - timestamp))
+        return frames, durations
+    
+    def save(self, path_without_extension: str, test: Optional[str] = None) -> Optional[str]:
+        """Encode the buffered frames; ffmpeg when available, otherwise an
+        animated WebP (or GIF) through PIL."""
+        frames, durations = self._frame_durations()
+        if not frames:
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(path_without_extension)), exist_ok=True)
+        
+        if shutil.which("ffmpeg"):
+            path = self._encode_ffmpeg(frames, durations, path_without_extension + ".mp4")
+        else:
+            path = self._encode_pil(frames, durations, path_without_extension)
+        if path:
+            ArtifactManifest.record_file(path, "video", test)
+        return path
+    
+    def _encode_ffmpeg(self, frames, durations, path: str) -> Optional[str]:
+        # The concat demuxer keeps the real gaps between repaints
+        with tempfile.TemporaryDirectory(prefix="screencast-") as directory:
+            lines = []
+            for index, ((_, data), duration) in enumerate(zip(frames, durations)):
+                frame_path = os.path.join(directory, f"{index:05d}.jpg")
+                with open(frame_path, "wb") as file:
+                    file.write(base64.b64decode(data))
+                lines.append(f"file '{frame_path}'\nduration {duration:.3f}")
+            lines.append(f"file '{os.path.join(directory, f'{len(frames) - 1:05d}.jpg')}'")
+            playlist = os.path.join(directory, "frames.txt")
+            with open(playlist, "w") as file:
+                file.write("\n".join(lines))
+            
+            command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", playlist,
+                       "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", "libx264", "-preset", "veryfast",
+                       "-pix_fmt", "yuv420p", "-r", str(self.fps), path]
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"ffmpeg failed: {result.stderr.strip()}")
+                return None
+        return path
+    
+    def _encode_pil(self, frames, durations, path_without_extension: str) -> Optional[str]:
+        images = [Image.open(io.BytesIO(base64.b64decode(data))) for _, data in frames]
+        milliseconds = [int(duration * 1000) for duration in durations]
+        try:
+            if features.check("webp"):
+                path = path_without_extension + ".webp"
+                images[0].save(path, "WEBP", save_all=True, append_images=images[1:],
+                               duration=milliseconds, quality=self.quality, loop=0)
+            else:
+                path = path_without_extension + ".gif"
+                images[0].save(path, "GIF", save_all=True, append_images=images[1:],
+                               duration=milliseconds, loop=0, optimize=False)
+        except (OSError, ValueError) as e:
+            print(f"Failed to encode screencast: {e}")
+            return None
+        finally:
+            for image in images:
+                image.close()
+        return path
\ No newline at end of file
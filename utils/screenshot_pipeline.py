@@ -0,0 +1,140 @@
+import base64
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Set
+from PIL import Image
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+
+
+class ScreenshotPipeline:
+    """Background decoding, downscaling and writing of screenshots.
+    
+    Only the WebDriver call runs on the caller's thread; it returns the
+    base64 payload the driver already sent, and a bounded worker pool does
+    the rest. When MAX_PENDING screenshots are in flight, submit() blocks
+    until one finishes so memory stays bounded.
+    """
+    
+    _executor: Optional[ThreadPoolExecutor] = None
+    _slots: Optional[threading.BoundedSemaphore] = None
+    _pending: Set[Future] = set()
+    _lock = threading.Lock()
+    
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=TestConfig.SCREENSHOT_WORKERS, thread_name_prefix="screenshot"
+                )
+                cls._slots = threading.BoundedSemaphore(TestConfig.SCREENSHOT_MAX_PENDING)
+            return cls._executor
+    
+    @classmethod
+    def submit(cls, driver, filepath: str, max_width: Optional[int] = None,
+               max_height: Optional[int] = None) -> Future:
+        try:
+            payload = driver.get_screenshot_as_base64()
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return future
+        return cls._submit_payload(payload, filepath, max_width, max_height)
+    
+    @classmethod
+    def submit_element(cls, element, filepath: str, max_width: Optional[int] = None,
+                       max_height: Optional[int] = None) -> Future:
+        try:
+            payload = element.screenshot_as_base64
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return future
+        return cls._submit_payload(payload, filepath, max_width, max_height)
+    
+    @classmethod
+    def submit_to_store(cls, driver, store, test: Optional[str] = None, name: Optional[str] = None) -> Future:
+        """Capture now; hash and store in the ArtifactStore in the background.
+        The future resolves to the stored object's path."""
+        try:
+            payload = driver.get_screenshot_as_base64()
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return future
+        return cls._submit_task(cls._store, payload, store, test, name)
+    
+    @classmethod
+    def _submit_payload(cls, payload: str, filepath: str, max_width: Optional[int],
+                        max_height: Optional[int]) -> Future:
+        return cls._submit_task(cls._write, payload, filepath, max_width, max_height)
+    
+    @classmethod
+    def _submit_task(cls, task, *args) -> Future:
+        executor = cls._get_executor()
+        cls._slots.acquire()
+        try:
+            future = executor.submit(task, *args)
+        except RuntimeError:
+            cls._slots.release()
+            raise
+        with cls._lock:
+            cls._pending.add(future)
+        future.add_done_callback(cls._finished)
+        return future
+    
+    @classmethod
+    def _finished(cls, future: Future) -> None:
+        with cls._lock:
+            cls._pending.discard(future)
+        cls._slots.release()
+    
+    @staticmethod
+    def _write(payload: str, filepath: str, max_width: Optional[int], max_height: Optional[int]) -> str:
+        png = base64.b64decode(payload)
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        
+        if max_width or max_height:
+            with Image.open(io.BytesIO(png)) as img:
+                if (max_width and img.width > max_width) or (max_height and img.height > max_height):
+                    img.thumbnail((max_width or img.width, max_height or img.height), Image.Resampling.LANCZOS)
+                    img.save(filepath, "PNG", compress_level=6)
+                    ArtifactManifest.record_file(filepath)
+                    return filepath
+        
+        # Browsers already send PNG; write it as-is instead of re-encoding
+        with open(filepath, "wb") as file:
+            file.write(png)
+        ArtifactManifest.record_file(filepath, data=png)
+        return filepath
+    
+    @staticmethod
+    def _store(payload: str, store, test: Optional[str], name: Optional[str]) -> str:
+        reference = store.put(base64.b64decode(payload), ".png", test, name)
+        return os.path.join(store.root, reference["path"])
+    
+    @classmethod
+    def pending_count(cls) -> int:
+        with cls._lock:
+            return len(cls._pending)
+    
+    @classmethod
+    def wait_all(cls, timeout: Optional[float] = None) -> bool:
+        with cls._lock:
+            pending = list(cls._pending)
+        if not pending:
+            return True
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+    
+    @classmethod
+    def shutdown(cls, timeout: Optional[float] = None) -> None:
+        cls.wait_all(timeout)
+        with cls._lock:
+            executor = cls._executor
+            cls._executor = None
+        if executor:
+            executor.shutdown(wait=False)
\ No newline at end of file
@@ -1,48 +1,57 @@
+import base64
+import io
 import os
 from datetime import datetime
 from PIL import Image
 from selenium.common.exceptions import WebDriverException
 from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest, read_png_dimensions
+from utils.artifact_store import ArtifactStore
+from utils.screenshot_pipeline import ScreenshotPipeline
 
 
 class ScreenshotUtils:
     
     @staticmethod
     def take_screenshot(driver, filename=None, custom_path=None):
-        try:
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                filename = f"screenshot_{timestamp}.png"
-            
-            if custom_path:
-                filepath = os.path.join(custom_path, filename)
-            else:
-                filepath = os.path.join(TestConfig.SCREENSHOTS_DIR, filename)
-            
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            success = driver.save_screenshot(filepath)
-            
-            if success:
-                print(f"Screenshot saved: {filepath}")
-                return filepath
-            else:
-                print(f"Failed to save screenshot: {filepath}")
-                return None
-                
-        except WebDriverException as e:
-            print(f"WebDriver exception while taking screenshot: {e}")
-            return None
-        except Exception as e:
-            print(f"Unexpected error while taking screenshot: {e}")
-            return None
+        """Capture now; decode, downscale and write in the background. The
+        future resolves to the file path."""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            filename = f"screenshot_{timestamp}.png"
+        
+        filepath = os.path.join(custom_path or TestConfig.SCREENSHOTS_DIR, filename)
+        future = ScreenshotPipeline.submit(driver, filepath, TestConfig.SCREENSHOT_MAX_WIDTH or None)
+        future.add_done_callback(lambda done: ScreenshotUtils._report_saved(done, "Screenshot"))
+        return future
     
     @staticmethod
     def take_element_screenshot(driver, element, filename=None, custom_path=None):
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            filename = f"element_screenshot_{timestamp}.png"
+        
+        filepath = os.path.join(custom_path or TestConfig.SCREENSHOTS_DIR, filename)
+        future = ScreenshotPipeline.submit_element(element, filepath, TestConfig.SCREENSHOT_MAX_WIDTH or None)
+        future.add_done_callback(lambda done: ScreenshotUtils._report_saved(done, "Element screenshot"))
+        return future
+    
+    @staticmethod
+    def _report_saved(future, label):
+        error = future.exception()
+        if isinstance(error, WebDriverException):
+            print(f"WebDriver exception while taking {label.lower()}: {error}")
+        elif error is not None:
+            print(f"Unexpected error while taking {label.lower()}: {error}")
+        else:
+            print(f"{label} saved: {future.result()}")
+    
+    @staticmethod
+    def take_full_page_screenshot(driver, filename=None, custom_path=None, max_height=None):
         try:
             if filename is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                filename = f"element_screenshot_{timestamp}.png"
+                filename = f"fullpage_screenshot_{timestamp}.png"
             
             if custom_path:
                 filepath = os.path.join(custom_path, filename)
@@ -51,71 +60,132 @@ class ScreenshotUtils:
             
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            success = element.screenshot(filepath)
+            png = ScreenshotUtils.capture_full_page_png(driver, max_height)
+            with open(filepath, "wb") as file:
+                file.write(png)
+            ArtifactManifest.record_file(filepath, data=png)
             
-            if success:
-                print(f"Element screenshot saved: {filepath}")
-                return filepath
-            else:
-                print(f"Failed to save element screenshot: {filepath}")
-                return None
+            print(f"Full page screenshot saved: {filepath}")
+            return filepath
                 
         except WebDriverException as e:
-            print(f"WebDriver exception while taking element screenshot: {e}")
+            print(f"WebDriver exception while taking full page screenshot: {e}")
             return None
         except Exception as e:
-            print(f"Unexpected error while taking element screenshot: {e}")
+            print(f"Unexpected error while taking full page screenshot: {e}")
             return None
     
     @staticmethod
-    def take_full_page_screenshot(driver, filename=None, custom_path=None):
+    def capture_full_page_png(driver, max_height=None):
+        # The window is never resized: a taller window makes YouTube lazy-load
+        # more content and relayout, so the capture no longer matches the page
+        max_height = max_height or TestConfig.FULL_PAGE_MAX_HEIGHT
+        
+        if hasattr(driver, "execute_cdp_cmd"):
+            return ScreenshotUtils._capture_beyond_viewport(driver, max_height)
+        
+        if hasattr(driver, "get_full_page_screenshot_as_png"):
+            png = driver.get_full_page_screenshot_as_png()
+            with Image.open(io.BytesIO(png)) as img:
+                ratio = driver.execute_script("return window.devicePixelRatio") or 1
+                if img.height <= max_height * ratio:
+                    return png
+                return ScreenshotUtils._encode_png(img.crop((0, 0, img.width, int(max_height * ratio))))
+        
+        # Remote drivers without either capability get the viewport only
+        return driver.get_screenshot_as_png()
+    
+    @staticmethod
+    def _capture_beyond_viewport(driver, max_height):
+        metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+        content = metrics.get("cssContentSize") or metrics["contentSize"]
+        width = content["width"]
+        height = min(content["height"], max_height)
+        tile_height = TestConfig.FULL_PAGE_TILE_HEIGHT
+        if width < 1 or int(height) < 1:
+            # Nothing laid out yet (blank or still loading page); there is
+            # no band to capture, so return the viewport instead
+            return driver.get_screenshot_as_png()
+        
+        # GPU textures are capped in size, so long pages are captured in
+        # horizontal bands and stitched
+        tiles = []
+        for top in range(0, int(height), tile_height):
+            clip = {"x": 0, "y": top, "width": width, "height": min(tile_height, height - top), "scale": 1}
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "png",
+                "captureBeyondViewport": True,
+                "fromSurface": True,
+                "clip": clip
+            })
+            tiles.append(base64.b64decode(result["data"]))
+        
+        if len(tiles) == 1:
+            return tiles[0]
+        
+        images = [Image.open(io.BytesIO(tile)) for tile in tiles]
         try:
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-                filename = f"fullpage_screenshot_{timestamp}.png"
-            
-            if custom_path:
-                filepath = os.path.join(custom_path, filename)
-            else:
-                filepath = os.path.join(TestConfig.SCREENSHOTS_DIR, filename)
-            
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            original_size = driver.get_window_size()
-            
-            driver.execute_script("return document.body.scrollHeight")
-            page_height = driver.execute_script("return document.body.scrollHeight")
-            driver.set_window_size(original_size['width'], page_height)
-            
-            success = driver.save_screenshot(filepath)
-            
-            driver.set_window_size(original_size['width'], original_size['height'])
-            
-            if success:
-                print(f"Full page screenshot saved: {filepath}")
-                return filepath
-            else:
-                print(f"Failed to save full page screenshot: {filepath}")
-                return None
-                
+            stitched = Image.new("RGB", (images[0].width, sum(image.height for image in images)))
+            offset = 0
+            for image in images:
+                stitched.paste(image, (0, offset))
+                offset += image.height
+            return ScreenshotUtils._encode_png(stitched)
+        finally:
+            for image in images:
+                image.close()
+    
+    @staticmethod
+    def _encode_png(img):
+        buffer = io.BytesIO()
+        img.save(buffer, "PNG", compress_level=6)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def store_screenshot(driver, test_name, name=None, store=None, metadata=None):
+        try:
+            png = driver.get_screenshot_as_png()
         except WebDriverException as e:
-            print(f"WebDriver exception while taking full page screenshot: {e}")
+            print(f"Error taking screenshot: {e}")
             return None
-        except Exception as e:
-            print(f"Unexpected error while taking full page screenshot: {e}")
+        
+        store = store or ArtifactStore()
+        try:
+            reference = store.put(png, ".png", test_name, name, metadata)
+        except OSError as e:
+            print(f"Error storing screenshot: {e}")
             return None
+        
+        filepath = os.path.join(store.root, reference["path"])
+        if reference["deduplicated"]:
+            print(f"Screenshot unchanged, reusing: {filepath}")
+        else:
+            print(f"Screenshot saved: {filepath}")
+        return filepath
     
     @staticmethod
-    def take_comparison_screenshot(driver, test_name, step_name):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{test_name}_{step_name}_{timestamp}.png"
-        return ScreenshotUtils.take_screenshot(driver, filename)
+    def store_screenshot_async(driver, test_name, name=None, store=None):
+        return ScreenshotPipeline.submit_to_store(driver, store or ArtifactStore(), test_name, name)
+    
+    @staticmethod
+    def take_comparison_screenshot(driver, test_name, step_name, ignore_regions=None):
+        metadata = {"kind": "comparison", "ignore_regions": [list(region) for region in ignore_regions or []]}
+        return ScreenshotUtils.store_screenshot(driver, test_name, step_name, metadata=metadata)
+    
+    @staticmethod
+    def compare_with_baseline(driver, test_name, step_name, ignore_regions=None):
+        from utils.visual_regression import VisualRegression
+        
+        filepath = ScreenshotUtils.take_comparison_screenshot(driver, test_name, step_name, ignore_regions)
+        if filepath is None:
+            return None
+        result = VisualRegression().compare(test_name, step_name, filepath, ignore_regions)
+        print(result.summary())
+        return result
     
     @staticmethod
     def take_failure_screenshot(driver, test_name):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"FAILURE_{test_name}_{timestamp}.png"
-        return ScreenshotUtils.take_screenshot(driver, filename)
+        return ScreenshotUtils.store_screenshot(driver, test_name, "FAILURE")
     
     @staticmethod
     def resize_screenshot(image_path, max_width=1920, max_height=1080):
@@ -141,24 +211,12 @@ class ScreenshotUtils:
     
     @staticmethod
     def clean_old_screenshots(days_old=7):
+        # Expiry is an indexed query over the artifact manifest; the
+        # screenshots directory is never listed
         try:
-            current_time = datetime.now()
-            screenshots_dir = TestConfig.SCREENSHOTS_DIR
-            
-            if not os.path.exists(screenshots_dir):
-                return
-            
-            for filename in os.listdir(screenshots_dir):
-                filepath = os.path.join(screenshots_dir, filename)
-                
-                if os.path.isfile(filepath) and filename.endswith('.png'):
-                    file_modified_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    days_difference = (current_time - file_modified_time).days
-                    
-                    if days_difference > days_old:
-                        os.remove(filepath)
-                        print(f"Removed old screenshot: {filename}")
-                        
+            result = ArtifactManifest.default().enforce_retention(max_age_days=days_old)
+            if result["removed"]:
+                print(f"Removed {result['removed']} old artifacts ({result['freed_bytes'] // 1024} KB)")
         except Exception as e:
             print(f"Error cleaning old screenshots: {e}")
     
@@ -171,24 +229,23 @@ class ScreenshotUtils:
     @staticmethod
     def get_screenshot_info(image_path):
         try:
-            if os.path.exists(image_path):
-                file_size = os.path.getsize(image_path)
-                file_modified = datetime.fromtimestamp(os.path.getmtime(image_path))
-                
-                with Image.open(image_path) as img:
-                    width, height = img.size
-                    format_type = img.format
-                
-                return {
-                    'path': image_path,
-                    'size_bytes': file_size,
-                    'size_mb': round(file_size / (1024 * 1024), 2),
-                    'dimensions': f"{width}x{height}",
-                    'format': format_type,
-                    'modified': file_modified.strftime("%Y-%m-%d %H:%M:%S")
-                }
-            else:
-                return None
+            entry = ArtifactManifest.default().get(image_path)
+            if entry is None:
+                if not os.path.exists(image_path):
+                    return None
+                # Not recorded: the PNG header has the dimensions, no decode needed
+                width, height = read_png_dimensions(image_path)
+                entry = {"size": os.path.getsize(image_path), "width": width, "height": height,
+                         "modified": os.path.getmtime(image_path)}
+            
+            return {
+                'path': image_path,
+                'size_bytes': entry["size"],
+                'size_mb': round(entry["size"] / (1024 * 1024), 2),
+                'dimensions': f"{entry['width']}x{entry['height']}",
+                'format': os.path.splitext(image_path)[1].lstrip('.').upper(),
+                'modified': datetime.fromtimestamp(entry["modified"]).strftime("%Y-%m-%d %H:%M:%S")
+            }
                 
         except Exception as e:
             print(f"Error getting screenshot info: {e}")
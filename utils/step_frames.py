@@ -0,0 +1,141 @@
+import base64
+import io
+import json
+import os
+import threading
+import weakref
+from collections import deque
+from typing import Any, Dict, List, Optional
+from PIL import Image, ImageDraw
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import safe_name
+
+
+class StepFrames:
+    """Small screenshot after every page-object action, kept in memory.
+    
+    Each driver holds its last STEP_FRAMES_PER_TEST frames as downscaled
+    JPEGs, and all drivers in the worker share a STEP_FRAMES_MAX_MB budget;
+    the oldest frames are evicted first. Frames are written to disk, with
+    the preceding action drawn on each, only when the test fails.
+    Chromium renders the small JPEG itself through DevTools, so nothing is
+    decoded on the Python side.
+    """
+    
+    enabled = TestConfig.STEP_FRAMES
+    
+    _buffers = weakref.WeakKeyDictionary()
+    _viewports = weakref.WeakKeyDictionary()
+    _order: deque = deque()
+    _total_bytes = 0
+    _lock = threading.Lock()
+    
+    @classmethod
+    def capture(cls, driver, action: Dict[str, Any]) -> None:
+        try:
+            data = cls._grab(driver)
+        except Exception:
+            # A frame is never worth failing the action for
+            return
+        if data:
+            cls._add(driver, {"action": action, "data": data, "size": len(data)})
+    
+    @classmethod
+    def _grab(cls, driver) -> Optional[bytes]:
+        width = TestConfig.STEP_FRAME_WIDTH
+        if hasattr(driver, "execute_cdp_cmd"):
+            viewport = cls._viewports.get(driver)
+            if viewport is None:
+                metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+                layout = metrics.get("cssLayoutViewport") or metrics["layoutViewport"]
+                viewport = cls._viewports[driver] = (layout["clientWidth"], layout["clientHeight"])
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": TestConfig.STEP_FRAME_QUALITY,
+                "clip": {"x": 0, "y": 0, "width": viewport[0], "height": viewport[1],
+                         "scale": min(1.0, width / viewport[0])}
+            })
+            return base64.b64decode(result["data"])
+        
+        with Image.open(io.BytesIO(driver.get_screenshot_as_png())) as img:
+            img = img.convert("RGB")
+            img.thumbnail((width, width * 4), Image.Resampling.BILINEAR)
+            buffer = io.BytesIO()
+            img.save(buffer, "JPEG", quality=TestConfig.STEP_FRAME_QUALITY)
+            return buffer.getvalue()
+    
+    @classmethod
+    def _add(cls, driver, frame: Dict[str, Any]) -> None:
+        max_bytes = TestConfig.STEP_FRAMES_MAX_MB * 1024 * 1024
+        with cls._lock:
+            buffer = cls._buffers.setdefault(driver, deque())
+            if len(buffer) >= TestConfig.STEP_FRAMES_PER_TEST:
+                cls._drop(buffer.popleft())
+            buffer.append(frame)
+            cls._order.append(frame)
+            cls._total_bytes += frame["size"]
+            
+            while cls._total_bytes > max_bytes and cls._order:
+                cls._drop(cls._order.popleft())
+            # Frames already dropped from their driver's buffer linger in the
+            # global order until they reach its head; trim them in bulk
+            if len(cls._order) > 4 * TestConfig.STEP_FRAMES_PER_TEST * max(1, len(cls._buffers)):
+                cls._order = deque(item for item in cls._order if item["data"] is not None)
+    
+    @classmethod
+    def _drop(cls, frame: Dict[str, Any]) -> None:
+        if frame["data"] is not None:
+            cls._total_bytes -= frame["size"]
+            frame["data"] = None
+    
+    @classmethod
+    def frames(cls, driver) -> List[Dict[str, Any]]:
+        with cls._lock:
+            buffer = cls._buffers.get(driver) or ()
+            return [dict(frame) for frame in buffer if frame["data"] is not None]
+    
+    @classmethod
+    def discard(cls, driver) -> None:
+        with cls._lock:
+            for frame in cls._buffers.pop(driver, None) or ():
+                cls._drop(frame)
+            cls._viewports.pop(driver, None)
+    
+    @classmethod
+    def memory_bytes(cls) -> int:
+        return cls._total_bytes
+    
+    @classmethod
+    def flush(cls, driver, test: str) -> Optional[str]:
+        """Write the buffered frames for a failed test, then release them."""
+        frames = cls.frames(driver)
+        cls.discard(driver)
+        if not frames:
+            return None
+        
+        directory = os.path.join(TestConfig.STEP_FRAMES_DIR, safe_name(test))
+        os.makedirs(directory, exist_ok=True)
+        index = []
+        for number, frame in enumerate(frames, 1):
+            action = frame["action"]
+            label = f"{number:02d} {action['page']}.{action['action']} {action['target']}".strip()
+            if not action["ok"]:
+                label += " (failed)"
+            path = os.path.join(directory, f"{number:02d}_{safe_name(action['action'])}.jpg")
+            cls._write_annotated(frame["data"], label, path)
+            ArtifactManifest.record_file(path, "step_frame", test)
+            index.append(dict(action, frame=os.path.basename(path)))
+        
+        with open(os.path.join(directory, "frames.json"), "w") as file:
+            json.dump({"test": test, "frames": index}, file, indent=2)
+        return directory
+    
+    @staticmethod
+    def _write_annotated(data: bytes, label: str, path: str) -> None:
+        with Image.open(io.BytesIO(data)) as img:
+            banner = 16
+            annotated = Image.new("RGB", (img.width, img.height + banner), "black")
+            annotated.paste(img, (0, banner))
+            ImageDraw.Draw(annotated).text((4, 2), label[:120], fill="white")
+            annotated.save(path, "JPEG", quality=TestConfig.STEP_FRAME_QUALITY)
\ No newline at end of file
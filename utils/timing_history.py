@@ -0,0 +1,349 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import pytest
+from config.config import TestConfig
+from utils.results_sink import ResultsSink
+from utils.wait_stats import WaitStats
+
+
+class TimingHistory:
+    """SQLite store of per-test phase durations across builds.
+    
+    Each row is one test in one run on one browser: setup, call and
+    teardown milliseconds, time spent in explicit waits and the outcome.
+    Node ids and runs are stored once and referenced by integer id, so a
+    row is a few dozen bytes and months of history stay small.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or TestConfig.TIMING_HISTORY_DB
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                build TEXT NOT NULL DEFAULT '',
+                job TEXT NOT NULL DEFAULT '',
+                started REAL NOT NULL,
+                UNIQUE (run_id, job, build)
+            );
+            CREATE TABLE IF NOT EXISTS tests (
+                id INTEGER PRIMARY KEY,
+                nodeid TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS timings (
+                test INTEGER NOT NULL,
+                run INTEGER NOT NULL,
+                browser TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                setup_ms INTEGER NOT NULL,
+                call_ms INTEGER NOT NULL,
+                teardown_ms INTEGER NOT NULL,
+                wait_ms INTEGER NOT NULL,
+                waits INTEGER NOT NULL,
+                PRIMARY KEY (test, run, browser)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS timings_run ON timings (run);
+            CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+        """)
+        self._test_ids: Dict[str, int] = {}
+    
+    def _migrate(self) -> None:
+        # Databases from before runs were keyed on job and build as well
+        row = self._connection.execute("SELECT sql FROM sqlite_master WHERE name = 'runs'").fetchone()
+        if not row or "run_id TEXT NOT NULL UNIQUE" not in row[0]:
+            return
+        self._connection.executescript("""
+            BEGIN;
+            ALTER TABLE runs RENAME TO runs_old;
+            CREATE TABLE runs (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                build TEXT NOT NULL DEFAULT '',
+                job TEXT NOT NULL DEFAULT '',
+                started REAL NOT NULL,
+                UNIQUE (run_id, job, build)
+            );
+            INSERT INTO runs SELECT id, run_id, COALESCE(build, ''), COALESCE(job, ''), started FROM runs_old;
+            DROP TABLE runs_old;
+            COMMIT;
+        """)
+    
+    @staticmethod
+    def base_nodeid(nodeid: str) -> str:
+        # Drop the "@group" suffix that group scheduling adds on xdist workers
+        if nodeid.rfind("@") > nodeid.rfind("]"):
+            return nodeid.rsplit("@", 1)[0]
+        return nodeid
+    
+    def _run_key(self, run_id: str, build: Optional[str], job: Optional[str]) -> int:
+        # Parallel stages of one build each have their own session run id
+        key = (run_id, job or "", build or "")
+        self._connection.execute(
+            "INSERT OR IGNORE INTO runs (run_id, job, build, started) VALUES (?, ?, ?, ?)", key + (time.time(),)
+        )
+        return self._connection.execute(
+            "SELECT id FROM runs WHERE run_id = ? AND job = ? AND build = ?", key
+        ).fetchone()[0]
+    
+    def _test_key(self, nodeid: str) -> int:
+        key = self._test_ids.get(nodeid)
+        if key is None:
+            self._connection.execute("INSERT OR IGNORE INTO tests (nodeid) VALUES (?)", (nodeid,))
+            key = self._connection.execute("SELECT id FROM tests WHERE nodeid = ?", (nodeid,)).fetchone()[0]
+            self._test_ids[nodeid] = key
+        return key
+    
+    def record_run(self, run_id: str, records: List[Dict[str, Any]], build: Optional[str] = None,
+                   job: Optional[str] = None) -> int:
+        """Write one run's records in a single transaction."""
+        with self._lock, self._connection:
+            run = self._run_key(run_id, build, job)
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO timings (test, run, browser, outcome, setup_ms, call_ms, teardown_ms, "
+                "wait_ms, waits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self._test_key(record["nodeid"]), run, record["browser"], record["outcome"],
+                  record["setup_ms"], record["call_ms"], record["teardown_ms"], record["wait_ms"],
+                  record["waits"]) for record in records]
+            )
+        return len(records)
+    
+    def prune(self, max_age_days: Optional[int] = None) -> int:
+        max_age_days = TestConfig.TIMING_HISTORY_DAYS if max_age_days is None else max_age_days
+        if not max_age_days:
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock, self._connection:
+            removed = self._connection.execute(
+                "DELETE FROM timings WHERE run IN (SELECT id FROM runs WHERE started < ?)", (cutoff,)
+            ).rowcount
+            self._connection.execute("DELETE FROM runs WHERE started < ?", (cutoff,))
+            self._connection.execute("DELETE FROM tests WHERE id NOT IN (SELECT DISTINCT test FROM timings)")
+            self._test_ids.clear()
+        return removed
+    
+    def _query(self, sql: str, parameters=()) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._connection.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def history(self, nodeid: str, limit: int = 20, browser: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT runs.run_id, runs.build, runs.started, timings.browser, timings.outcome, timings.setup_ms, "
+            "timings.call_ms, timings.teardown_ms, timings.wait_ms, timings.waits "
+            "FROM timings JOIN tests ON tests.id = timings.test JOIN runs ON runs.id = timings.run "
+            "WHERE tests.nodeid = ? AND (? IS NULL OR timings.browser = ?) "
+            "ORDER BY runs.started DESC LIMIT ?",
+            (nodeid, browser, browser, limit)
+        )
+    
+    def slowest(self, limit: int = 10, days: float = 30, browser: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Tests with the highest mean total duration over the last `days`."""
+        return self._query(
+            "SELECT tests.nodeid, timings.browser, COUNT(*) AS runs, "
+            "CAST(AVG(setup_ms + call_ms + teardown_ms) AS INTEGER) AS mean_ms, "
+            "MAX(setup_ms + call_ms + teardown_ms) AS max_ms, "
+            "ROUND(1.0 * SUM(wait_ms) / MAX(1, SUM(setup_ms + call_ms + teardown_ms)), 3) AS wait_share "
+            "FROM timings JOIN tests ON tests.id = timings.test JOIN runs ON runs.id = timings.run "
+            "WHERE runs.started >= ? AND (? IS NULL OR timings.browser = ?) "
+            "GROUP BY timings.test, timings.browser ORDER BY mean_ms DESC LIMIT ?",
+            (time.time() - days * 86400, browser, browser, limit)
+        )
+    
+    def getting_slower(self, window: int = 5, ratio: float = 1.2, min_ms: int = 500,
+                       browser: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Tests whose mean over their last `window` passing runs is at least
+        `ratio` times the mean of the `window` passing runs before that.
+        Failures are left out; they are usually timeouts."""
+        return self._query(
+            "WITH ranked AS ("
+            "  SELECT timings.test, timings.browser, setup_ms + call_ms + teardown_ms AS total_ms, "
+            "  ROW_NUMBER() OVER (PARTITION BY timings.test, timings.browser ORDER BY runs.started DESC) AS position "
+            "  FROM timings JOIN runs ON runs.id = timings.run "
+            "  WHERE timings.outcome = 'passed' AND (? IS NULL OR timings.browser = ?)"
+            "), windows AS ("
+            "  SELECT test, browser, "
+            "  AVG(CASE WHEN position <= ? THEN total_ms END) AS recent_ms, "
+            "  AVG(CASE WHEN position > ? THEN total_ms END) AS previous_ms "
+            "  FROM ranked WHERE position <= 2 * ? GROUP BY test, browser"
+            ") "
+            "SELECT tests.nodeid, windows.browser, CAST(recent_ms AS INTEGER) AS recent_ms, "
+            "CAST(previous_ms AS INTEGER) AS previous_ms, ROUND(recent_ms / previous_ms, 2) AS ratio "
+            "FROM windows JOIN tests ON tests.id = windows.test "
+            "WHERE previous_ms > 0 AND recent_ms >= previous_ms * ? AND recent_ms >= ? "
+            "ORDER BY recent_ms - previous_ms DESC",
+            (browser, browser, window, window, window, ratio, min_ms)
+        )
+    
+    def by_browser(self, days: float = 30, nodeid: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Mean duration, wait share and pass rate per browser, for one test
+        or across all tests."""
+        return self._query(
+            "SELECT timings.browser, COUNT(*) AS runs, COUNT(DISTINCT timings.test) AS tests, "
+            "CAST(AVG(setup_ms + call_ms + teardown_ms) AS INTEGER) AS mean_ms, "
+            "ROUND(1.0 * SUM(wait_ms) / MAX(1, SUM(setup_ms + call_ms + teardown_ms)), 3) AS wait_share, "
+            "ROUND(AVG(timings.outcome = 'passed'), 3) AS pass_rate "
+            "FROM timings JOIN tests ON tests.id = timings.test JOIN runs ON runs.id = timings.run "
+            "WHERE runs.started >= ? AND (? IS NULL OR tests.nodeid = ?) "
+            "GROUP BY timings.browser ORDER BY mean_ms DESC",
+            (time.time() - days * 86400, nodeid, nodeid)
+        )
+    
+    def estimates(self, browser: Optional[str] = None, window: int = 5) -> Dict[str, float]:
+        """Mean seconds over each test's last `window` passing runs, taken
+        from runs on `browser` when the test has any."""
+        rows = self._query(
+            "WITH ranked AS ("
+            "  SELECT timings.test, timings.browser, setup_ms + call_ms + teardown_ms AS total_ms, "
+            "  ROW_NUMBER() OVER (PARTITION BY timings.test, timings.browser ORDER BY runs.started DESC) AS position "
+            "  FROM timings JOIN runs ON runs.id = timings.run WHERE timings.outcome = 'passed'"
+            ") "
+            "SELECT tests.nodeid, ranked.browser, AVG(total_ms) AS mean_ms "
+            "FROM ranked JOIN tests ON tests.id = ranked.test WHERE position <= ? "
+            "GROUP BY ranked.test, ranked.browser",
+            (window,)
+        )
+        estimates: Dict[str, float] = {}
+        for row in rows:
+            if row["browser"] == browser or row["nodeid"] not in estimates:
+                estimates[row["nodeid"]] = row["mean_ms"] / 1000.0
+        return estimates
+    
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class TimingHistoryPlugin:
+    """Collects phase durations and wait totals and writes them to
+    TimingHistory at session end.
+    
+    Registered on the controller and on every xdist worker. Workers attach
+    the wait totals and browser to the teardown report; only the controller,
+    which receives every worker's reports, writes the database.
+    """
+    
+    DRIVER_FIXTURES = {"chrome_driver": "chrome", "firefox_driver": "firefox"}
+    
+    def __init__(self, config):
+        self.writer = not hasattr(config, "workerinput")
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.records: List[Dict[str, Any]] = []
+    
+    @classmethod
+    def browser_of(cls, item) -> str:
+        if dict(item.user_properties).get("test_tier") == "http":
+            return "http"
+        for fixture, browser in cls.DRIVER_FIXTURES.items():
+            if fixture in item.fixturenames:
+                return browser
+        if "driver" in item.fixturenames or "page_fetcher" in item.fixturenames:
+            return TestConfig.BROWSER
+        return "none"
+    
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        WaitStats.reset()
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "teardown":
+            waits = WaitStats.snapshot()
+            report.user_properties.append(("timing_wait_seconds", round(waits["seconds"], 3)))
+            report.user_properties.append(("timing_waits", waits["waits"]))
+            report.user_properties.append(("timing_browser", self.browser_of(item)))
+    
+    def pytest_runtest_logreport(self, report):
+        if not self.writer:
+            return
+        entry = self.pending.setdefault(report.nodeid, {"outcome": "passed"})
+        entry[f"{report.when}_ms"] = int(report.duration * 1000)
+        if report.when == "setup" and not report.passed:
+            entry["outcome"] = "skipped" if report.skipped else "error"
+        elif report.when == "call":
+            entry["outcome"] = report.outcome
+        elif report.when == "teardown" and report.failed and entry["outcome"] == "passed":
+            entry["outcome"] = "error"
+        
+        if report.when == "teardown":
+            self.pending.pop(report.nodeid)
+            properties = dict(report.user_properties)
+            self.records.append({
+                "nodeid": TimingHistory.base_nodeid(report.nodeid),
+                "browser": properties.get("timing_browser", "none"),
+                "outcome": entry["outcome"],
+                "setup_ms": entry.get("setup_ms", 0),
+                "call_ms": entry.get("call_ms", 0),
+                "teardown_ms": entry["teardown_ms"],
+                "wait_ms": int(properties.get("timing_wait_seconds", 0) * 1000),
+                "waits": properties.get("timing_waits", 0)
+            })
+    
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        if not self.writer or not self.records:
+            return
+        try:
+            history = TimingHistory()
+            history.record_run(ResultsSink.run_id(), self.records,
+                               build=os.getenv("BUILD_NUMBER"), job=os.getenv("JOB_NAME"))
+            history.prune()
+            history.close()
+        except sqlite3.Error as e:
+            print(f"\nFailed to record timing history: {e}")
+
+
+def _print_rows(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        print("No matching history")
+    for row in rows:
+        print("  ".join(f"{key}={value}" for key, value in row.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the per-test timing history")
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--browser", default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    history_parser = subparsers.add_parser("history", help="Recent runs of one test")
+    history_parser.add_argument("nodeid")
+    history_parser.add_argument("--limit", type=int, default=20)
+    slowest_parser = subparsers.add_parser("slowest", help="Slowest tests by mean duration")
+    slowest_parser.add_argument("--limit", type=int, default=10)
+    slowest_parser.add_argument("--days", type=float, default=30)
+    slower_parser = subparsers.add_parser("slower", help="Tests getting slower")
+    slower_parser.add_argument("--window", type=int, default=5)
+    slower_parser.add_argument("--ratio", type=float, default=1.2)
+    slower_parser.add_argument("--min-ms", type=int, default=500)
+    browsers_parser = subparsers.add_parser("browsers", help="Compare browsers")
+    browsers_parser.add_argument("--days", type=float, default=30)
+    browsers_parser.add_argument("--test", default=None)
+    subparsers.add_parser("prune", help="Drop runs older than TIMING_HISTORY_DAYS")
+    args = parser.parse_args()
+    
+    history = TimingHistory(args.db)
+    if args.command == "history":
+        _print_rows(history.history(args.nodeid, args.limit, args.browser))
+    elif args.command == "slowest":
+        _print_rows(history.slowest(args.limit, args.days, args.browser))
+    elif args.command == "slower":
+        _print_rows(history.getting_slower(args.window, args.ratio, args.min_ms, args.browser))
+    elif args.command == "browsers":
+        _print_rows(history.by_browser(args.days, args.test))
+    else:
+        print(f"Removed {history.prune()} timing rows")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,259 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from config.config import TestConfig
+from utils.action_trail import ActionTrail
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import safe_name
+
+
+class Span:
+    
+    __slots__ = ("name", "category", "attributes", "started", "track", "token")
+    
+    def __init__(self, name: str, category: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.started = 0.0
+        self.track = None
+        self.token = None
+    
+    def __enter__(self) -> "Span":
+        # Spans nest per thread and per asyncio task, so concurrent pages
+        # each get their own track in the trace
+        self.track = Tracer.current_track()
+        self.token = Tracer._stack.set(Tracer._stack.get() + (self,))
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        ended = time.perf_counter()
+        Tracer._stack.reset(self.token)
+        if exc_type is not None:
+            self.attributes["outcome"] = "error"
+            self.attributes["error"] = exc_type.__name__
+        else:
+            self.attributes.setdefault("outcome", "ok")
+        Tracer.add_event(self, ended)
+        return False
+    
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+    
+    def result(self, value: Any) -> None:
+        # None, False and [] are how page objects report a missed lookup
+        missed = value is None or value is False or (isinstance(value, list) and not value)
+        self.attributes["outcome"] = "miss" if missed else "ok"
+
+
+class _NoSpan:
+    
+    def __enter__(self) -> "_NoSpan":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+    
+    def set(self, **attributes) -> None:
+        pass
+    
+    def result(self, value: Any) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Nested timing spans for page-object actions, exported per test.
+    
+    Every public method of a page object runs inside a span named after
+    the class that defines it, carrying the locator, the outcome and the
+    number of wait retries. The spans of a test are written to
+    reports/traces/ in Chrome trace-event format, which chrome://tracing
+    and ui.perfetto.dev open directly. With TRACING off the wrappers only
+    check a flag.
+    """
+    
+    enabled = TestConfig.TRACING
+    
+    _stack: contextvars.ContextVar = contextvars.ContextVar("trace_stack", default=())
+    _lock = threading.Lock()
+    _current_test: Optional[str] = None
+    _origin = time.perf_counter()
+    _events: List[Dict[str, Any]] = []
+    _tracks: Dict[Any, int] = {}
+    _dropped = 0
+    
+    @staticmethod
+    def traces_dir() -> str:
+        return TestConfig.TRACES_DIR
+    
+    @staticmethod
+    def current_track() -> Any:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            return ("task", id(task), task.get_name())
+        thread = threading.current_thread()
+        return ("thread", thread.ident, thread.name)
+    
+    @classmethod
+    def span(cls, name: str, category: str = "page", **attributes):
+        if not cls.enabled:
+            return NO_SPAN
+        return Span(name, category, attributes)
+    
+    @classmethod
+    def current(cls):
+        stack = cls._stack.get()
+        return stack[-1] if stack and cls.enabled else NO_SPAN
+    
+    @classmethod
+    def annotate(cls, **attributes) -> None:
+        if cls.enabled:
+            cls.current().set(**attributes)
+    
+    @classmethod
+    def counting_retries(cls, condition: Callable) -> Callable:
+        """Wrap a wait condition so every poll after the first adds one to
+        the current span's retries."""
+        span = cls.current()
+        if span is NO_SPAN:
+            return condition
+        polls = [0]
+        
+        def counted(*args):
+            polls[0] += 1
+            if polls[0] > 1:
+                span.attributes["retries"] = span.attributes.get("retries", 0) + 1
+            return condition(*args)
+        return counted
+    
+    @classmethod
+    def add_event(cls, span: Span, ended: float) -> None:
+        with cls._lock:
+            if len(cls._events) >= TestConfig.TRACE_MAX_EVENTS:
+                cls._dropped += 1
+                return
+            tid = cls._tracks.setdefault(span.track, len(cls._tracks) + 1)
+            cls._events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.started - cls._origin) * 1e6, 1),
+                "dur": round((ended - span.started) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": span.attributes
+            })
+    
+    @staticmethod
+    def _call_attributes(args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        attributes = {}
+        values = list(args) + list(kwargs.values())
+        if values and isinstance(values[0], tuple) and len(values[0]) == 2:
+            attributes["locator"] = ActionTrail.describe_locator(values[0])
+            values = values[1:]
+        scalars = [value for value in values if isinstance(value, (str, int, float, bool))]
+        if scalars:
+            attributes["args"] = [value[:120] if isinstance(value, str) else value for value in scalars]
+        return attributes
+    
+    @classmethod
+    def wrap(cls, function: Callable, owner: str) -> Callable:
+        name = f"{owner}.{function.__name__}"
+        returns = inspect.signature(function).return_annotation
+        reports_result = returns not in (None, inspect.Signature.empty)
+        
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def traced(self, *args, **kwargs):
+                if not cls.enabled:
+                    return await function(self, *args, **kwargs)
+                with Span(name, owner, cls._call_attributes(args, kwargs)) as span:
+                    result = await function(self, *args, **kwargs)
+                    if reports_result:
+                        span.result(result)
+                    return result
+        else:
+            @functools.wraps(function)
+            def traced(self, *args, **kwargs):
+                if not cls.enabled:
+                    return function(self, *args, **kwargs)
+                with Span(name, owner, cls._call_attributes(args, kwargs)) as span:
+                    result = function(self, *args, **kwargs)
+                    if reports_result:
+                        span.result(result)
+                    return result
+        
+        traced.__traced__ = True
+        return traced
+    
+    @classmethod
+    def instrument(cls, page_class: type) -> type:
+        """Wrap the public methods a page class defines itself; inherited
+        ones are already wrapped on the class that defines them."""
+        for attribute, member in list(vars(page_class).items()):
+            if attribute.startswith("_") or not inspect.isfunction(member):
+                continue
+            if getattr(member, "__traced__", False):
+                continue
+            setattr(page_class, attribute, cls.wrap(member, page_class.__name__))
+        return page_class
+    
+    @classmethod
+    def begin_test(cls, test_id: str) -> None:
+        with cls._lock:
+            cls._current_test = test_id
+            cls._origin = time.perf_counter()
+            cls._events = []
+            cls._tracks = {}
+            cls._dropped = 0
+    
+    @classmethod
+    def end_test(cls) -> Optional[str]:
+        ended = time.perf_counter()
+        with cls._lock:
+            test_id, events, tracks, dropped = cls._current_test, cls._events, cls._tracks, cls._dropped
+            cls._current_test = None
+            cls._events = []
+            cls._tracks = {}
+            cls._dropped = 0
+        
+        if not test_id or not events:
+            return None
+        
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                     "args": {"name": os.getenv("PYTEST_XDIST_WORKER", "main")}}]
+        for (_, _, track_name), tid in tracks.items():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track_name}})
+        # The test itself is the outermost span on every track
+        tests = [{"name": test_id, "cat": "test", "ph": "X", "ts": 0, "dur": round((ended - cls._origin) * 1e6, 1),
+                  "pid": pid, "tid": tid, "args": {}} for tid in tracks.values()]
+        
+        os.makedirs(cls.traces_dir(), exist_ok=True)
+        filepath = os.path.join(cls.traces_dir(), f"{safe_name(test_id)}.json")
+        trace = {
+            "traceEvents": metadata + tests + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"test": test_id, "dropped_spans": dropped}
+        }
+        try:
+            with open(filepath, "w") as file:
+                json.dump(trace, file, default=str)
+        except OSError as e:
+            print(f"Failed to write trace: {e}")
+            return None
+        ArtifactManifest.record_file(filepath, "trace", test_id)
+        return filepath
\ No newline at end of file
@@ -0,0 +1,363 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image
+from config.config import TestConfig
+from utils.artifact_manifest import ArtifactManifest
+from utils.artifact_store import ArtifactStore, safe_name
+
+
+Region = Tuple[int, int, int, int]
+
+
+class VisualResult:
+    
+    def __init__(self, test: str, step: str, status: str, candidate: str, baseline: str,
+                 changed_pixels: int = 0, compared_pixels: int = 0, changed_tiles: int = 0,
+                 total_tiles: int = 0, diff_path: Optional[str] = None, reason: str = "",
+                 elapsed: float = 0.0):
+        self.test = test
+        self.step = step
+        self.status = status
+        self.candidate = candidate
+        self.baseline = baseline
+        self.changed_pixels = changed_pixels
+        self.compared_pixels = compared_pixels
+        self.changed_tiles = changed_tiles
+        self.total_tiles = total_tiles
+        self.diff_path = diff_path
+        self.reason = reason
+        self.elapsed = elapsed
+    
+    @property
+    def diff_ratio(self) -> float:
+        return self.changed_pixels / self.compared_pixels if self.compared_pixels else 0.0
+    
+    @property
+    def passed(self) -> bool:
+        return self.status in ("passed", "new", "updated")
+    
+    def summary(self) -> str:
+        text = f"Visual {self.status}: {self.test} [{self.step}]"
+        if self.compared_pixels:
+            text += f" {self.diff_ratio:.4%} changed, {self.changed_tiles}/{self.total_tiles} tiles"
+        if self.reason:
+            text += f" ({self.reason})"
+        if self.diff_path:
+            text += f" diff: {self.diff_path}"
+        return text
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "test": self.test,
+            "step": self.step,
+            "status": self.status,
+            "candidate": self.candidate,
+            "baseline": self.baseline,
+            "changed_pixels": self.changed_pixels,
+            "compared_pixels": self.compared_pixels,
+            "diff_ratio": round(self.diff_ratio, 6),
+            "changed_tiles": self.changed_tiles,
+            "total_tiles": self.total_tiles,
+            "diff_path": self.diff_path,
+            "reason": self.reason,
+            "elapsed": round(self.elapsed, 4)
+        }
+
+
+def _load_rgb(path: str) -> np.ndarray:
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+def _ignore_mask(height: int, width: int, regions: Sequence[Region]) -> np.ndarray:
+    mask = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in regions:
+        mask[max(0, y):max(0, y + h), max(0, x):max(0, x + w)] = True
+    return mask
+
+
+def _tiles(pixels: np.ndarray, tile_size: int) -> np.ndarray:
+    """(rows, columns, tile, tile, 3) view of the image padded to whole tiles."""
+    height, width = pixels.shape[:2]
+    rows = -(-height // tile_size)
+    columns = -(-width // tile_size)
+    padded = np.zeros((rows * tile_size, columns * tile_size, 3), dtype=pixels.dtype)
+    padded[:height, :width] = pixels
+    return padded.reshape(rows, tile_size, columns, tile_size, 3).swapaxes(1, 2)
+
+
+def _tile_hashes(tiles: np.ndarray) -> List[str]:
+    rows, columns = tiles.shape[:2]
+    flat = np.ascontiguousarray(tiles).reshape(rows * columns, -1)
+    return [hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest() for row in flat]
+
+
+class VisualRegression:
+    """Baseline comparison for comparison screenshots.
+    
+    Baselines live under VISUAL_BASELINE_DIR/<browser>/<test>/<step>.png,
+    each with a sidecar of per-tile hashes. A candidate is split into tiles
+    and hashed first; when every tile hash matches, the baseline image is
+    never decoded. Only tiles whose hashes differ are diffed pixel by pixel.
+    Ignore regions are blanked in both images before hashing and diffing.
+    """
+    
+    def __init__(self, baseline_dir: Optional[str] = None, variant: Optional[str] = None,
+                 diff_dir: Optional[str] = None, tile_size: Optional[int] = None,
+                 pixel_threshold: Optional[int] = None, max_diff_ratio: Optional[float] = None,
+                 update_baselines: Optional[bool] = None):
+        self.baseline_dir = baseline_dir or TestConfig.VISUAL_BASELINE_DIR
+        self.variant = variant or TestConfig.BROWSER
+        self.diff_dir = diff_dir or TestConfig.VISUAL_DIFF_DIR
+        self.tile_size = tile_size or TestConfig.VISUAL_TILE_SIZE
+        self.pixel_threshold = TestConfig.VISUAL_PIXEL_THRESHOLD if pixel_threshold is None else pixel_threshold
+        self.max_diff_ratio = TestConfig.VISUAL_MAX_DIFF_RATIO if max_diff_ratio is None else max_diff_ratio
+        self.update_baselines = TestConfig.VISUAL_UPDATE_BASELINES if update_baselines is None else update_baselines
+    
+    def baseline_path(self, test: str, step: str) -> str:
+        return os.path.join(self.baseline_dir, safe_name(self.variant), safe_name(test), f"{safe_name(step)}.png")
+    
+    def diff_path(self, test: str, step: str) -> str:
+        return os.path.join(self.diff_dir, safe_name(test), f"{safe_name(step)}_diff.png")
+    
+    @staticmethod
+    def region_of(driver, element) -> Region:
+        """Screenshot-pixel rectangle of an element, for ignore regions.
+        
+        The screenshot is of the viewport, so the rectangle comes from
+        getBoundingClientRect() rather than the document-relative
+        element.rect, which is off by the scroll offset.
+        """
+        rect = driver.execute_script(
+            "const rect = arguments[0].getBoundingClientRect();"
+            "return [rect.left, rect.top, rect.width, rect.height, window.devicePixelRatio || 1];",
+            element
+        )
+        x, y, width, height, ratio = rect
+        # Round outwards so a fractional edge is still covered
+        left, top = math.floor(x * ratio), math.floor(y * ratio)
+        return (left, top, math.ceil((x + width) * ratio) - left, math.ceil((y + height) * ratio) - top)
+    
+    def _masked(self, pixels: np.ndarray, regions: Sequence[Region]) -> np.ndarray:
+        if not regions:
+            return pixels
+        pixels = pixels.copy()
+        pixels[_ignore_mask(pixels.shape[0], pixels.shape[1], regions)] = 0
+        return pixels
+    
+    def _sidecar_path(self, baseline: str) -> str:
+        return f"{os.path.splitext(baseline)[0]}.json"
+    
+    @staticmethod
+    def _file_hash(path: str) -> str:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    
+    def _baseline_hashes(self, baseline: str, regions: Sequence[Region]) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._sidecar_path(baseline)) as file:
+                sidecar = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if (sidecar.get("tile_size") != self.tile_size
+                or sidecar.get("ignore_regions") != [list(region) for region in regions]
+                or sidecar.get("sha256") != self._file_hash(baseline)):
+            return None
+        return sidecar
+    
+    def _write_baseline(self, candidate: str, baseline: str, pixels: np.ndarray, regions: Sequence[Region]) -> None:
+        os.makedirs(os.path.dirname(baseline), exist_ok=True)
+        shutil.copyfile(candidate, baseline)
+        self._write_sidecar(baseline, pixels, regions)
+    
+    def _write_sidecar(self, baseline: str, pixels: np.ndarray, regions: Sequence[Region]) -> Dict[str, Any]:
+        sidecar = {
+            "width": pixels.shape[1],
+            "height": pixels.shape[0],
+            "tile_size": self.tile_size,
+            "ignore_regions": [list(region) for region in regions],
+            "sha256": self._file_hash(baseline),
+            "tile_hashes": _tile_hashes(_tiles(self._masked(pixels, regions), self.tile_size))
+        }
+        with open(self._sidecar_path(baseline), "w") as file:
+            json.dump(sidecar, file)
+        return sidecar
+    
+    def compare(self, test: str, step: str, candidate: str,
+                ignore_regions: Optional[Sequence[Region]] = None) -> VisualResult:
+        started = time.perf_counter()
+        regions = [tuple(region) for region in ignore_regions or []]
+        baseline = self.baseline_path(test, step)
+        result = VisualResult(test, step, "passed", candidate, baseline)
+        
+        try:
+            pixels = _load_rgb(candidate)
+        except OSError as e:
+            result.status, result.reason = "error", f"cannot read candidate: {e}"
+            return result
+        
+        if not os.path.exists(baseline) or self.update_baselines:
+            result.status = "updated" if os.path.exists(baseline) else "new"
+            self._write_baseline(candidate, baseline, pixels, regions)
+            result.elapsed = time.perf_counter() - started
+            return result
+        
+        sidecar = self._baseline_hashes(baseline, regions)
+        baseline_pixels = None
+        if sidecar is None:
+            baseline_pixels = _load_rgb(baseline)
+            sidecar = self._write_sidecar(baseline, baseline_pixels, regions)
+        
+        if (sidecar["height"], sidecar["width"]) != pixels.shape[:2]:
+            result.status = "failed"
+            result.reason = f"size {pixels.shape[1]}x{pixels.shape[0]} != baseline {sidecar['width']}x{sidecar['height']}"
+            result.elapsed = time.perf_counter() - started
+            return result
+        
+        masked = self._masked(pixels, regions)
+        tiles = _tiles(masked, self.tile_size)
+        rows, columns = tiles.shape[:2]
+        changed = np.array([a != b for a, b in zip(_tile_hashes(tiles), sidecar["tile_hashes"])]).reshape(rows, columns)
+        result.total_tiles = rows * columns
+        result.compared_pixels = masked.shape[0] * masked.shape[1]
+        if regions:
+            result.compared_pixels -= int(_ignore_mask(masked.shape[0], masked.shape[1], regions).sum())
+        
+        if changed.any():
+            if baseline_pixels is None:
+                baseline_pixels = _load_rgb(baseline)
+            baseline_tiles = _tiles(self._masked(baseline_pixels, regions), self.tile_size)
+            # Diff only the tiles whose hashes differ, all of them in one vectorized pass
+            difference = np.abs(tiles[changed].astype(np.int16) - baseline_tiles[changed].astype(np.int16)).max(axis=-1)
+            tile_changes = difference > self.pixel_threshold
+            result.changed_pixels = int(tile_changes.sum())
+            result.changed_tiles = int(tile_changes.any(axis=(1, 2)).sum())
+            
+            if result.diff_ratio > self.max_diff_ratio:
+                result.status = "failed"
+                pixel_mask = np.zeros((rows, columns, self.tile_size, self.tile_size), dtype=bool)
+                pixel_mask[changed] = tile_changes
+                pixel_mask = pixel_mask.swapaxes(1, 2).reshape(rows * self.tile_size, columns * self.tile_size)
+                result.diff_path = self._write_diff(test, step, pixels, pixel_mask[:pixels.shape[0], :pixels.shape[1]], regions)
+        
+        result.elapsed = time.perf_counter() - started
+        return result
+    
+    def _write_diff(self, test: str, step: str, pixels: np.ndarray, changes: np.ndarray,
+                    regions: Sequence[Region]) -> str:
+        # Faded candidate with changed pixels in red and ignored areas in blue
+        image = (pixels.astype(np.uint16) + 510) // 3
+        image = image.astype(np.uint8)
+        if regions:
+            image[_ignore_mask(pixels.shape[0], pixels.shape[1], regions)] = (200, 210, 255)
+        image[changes] = (255, 0, 0)
+        
+        path = self.diff_path(test, step)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Image.fromarray(image).save(path, "PNG", compress_level=1)
+        ArtifactManifest.record_file(path, "diff", test)
+        return path
+    
+    def compare_many(self, jobs: List[Dict[str, Any]], workers: Optional[int] = None) -> List[VisualResult]:
+        """Compare many screenshots across processes. Each job has test,
+        step, candidate and optionally ignore_regions."""
+        workers = workers or TestConfig.VISUAL_WORKERS
+        if workers <= 1 or len(jobs) <= 1:
+            return [self._run_job(job) for job in jobs]
+        
+        settings = self._settings()
+        chunk = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_compare_job, [(settings, job) for job in jobs], chunksize=chunk))
+    
+    def _run_job(self, job: Dict[str, Any]) -> VisualResult:
+        try:
+            return self.compare(job["test"], job["step"], job["candidate"], job.get("ignore_regions"))
+        except Exception as e:
+            return VisualResult(job["test"], job["step"], "error", job["candidate"],
+                                self.baseline_path(job["test"], job["step"]), reason=str(e))
+    
+    def _settings(self) -> Dict[str, Any]:
+        return {
+            "baseline_dir": self.baseline_dir,
+            "variant": self.variant,
+            "diff_dir": self.diff_dir,
+            "tile_size": self.tile_size,
+            "pixel_threshold": self.pixel_threshold,
+            "max_diff_ratio": self.max_diff_ratio,
+            "update_baselines": self.update_baselines
+        }
+    
+    @staticmethod
+    def jobs_from_store(store: Optional[ArtifactStore] = None) -> List[Dict[str, Any]]:
+        """Latest comparison screenshot of every test and step in the store."""
+        store = store or ArtifactStore()
+        jobs = {}
+        if not os.path.isdir(store.records_dir):
+            return []
+        for filename in sorted(os.listdir(store.records_dir)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(store.records_dir, filename)) as file:
+                    record = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for artifact in record.get("artifacts", []):
+                if artifact.get("kind") != "comparison":
+                    continue
+                jobs[(record["test"], artifact["name"])] = {
+                    "test": record["test"],
+                    "step": artifact["name"],
+                    "candidate": os.path.join(store.root, artifact["path"]),
+                    "ignore_regions": artifact.get("ignore_regions") or []
+                }
+        return list(jobs.values())
+
+
+def _compare_job(arguments) -> VisualResult:
+    settings, job = arguments
+    return VisualRegression(**settings)._run_job(job)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare stored comparison screenshots with their baselines")
+    parser.add_argument("--update", action="store_true", help="Accept the current screenshots as baselines")
+    parser.add_argument("--workers", type=int, default=None, help="Processes to use (default: all cores)")
+    parser.add_argument("--variant", default=None, help="Baseline set to use (default: configured browser)")
+    parser.add_argument("--output", default=os.path.join(TestConfig.REPORTS_DIR, "visual_regression.json"))
+    args = parser.parse_args()
+    
+    regression = VisualRegression(variant=args.variant, update_baselines=args.update or None)
+    jobs = VisualRegression.jobs_from_store()
+    started = time.perf_counter()
+    results = regression.compare_many(jobs, args.workers)
+    elapsed = time.perf_counter() - started
+    
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+        if not result.passed:
+            print(result.summary())
+    
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump({"elapsed": round(elapsed, 3), "counts": counts,
+                   "results": [result.to_dict() for result in results]}, file, indent=2)
+    
+    print(f"Compared {len(results)} screenshots in {elapsed:.2f}s: "
+          + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    sys.exit(1 if counts.get("failed") or counts.get("error") else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
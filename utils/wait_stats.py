@@ -0,0 +1,41 @@
+import threading
+from typing import Dict
+from utils.run_metrics import RunMetrics
+
+
+class WaitStats:
+    """Time spent in explicit waits by the current test.
+    
+    BasePage adds every WebDriverWait it runs; the timing history plugin
+    resets the totals when a test starts and reads them when it ends. The
+    run-wide totals go to RunMetrics.
+    """
+    
+    _lock = threading.Lock()
+    _seconds = 0.0
+    _waits = 0
+    _timeouts = 0
+    
+    @classmethod
+    def add(cls, seconds: float, timed_out: bool = False) -> None:
+        with cls._lock:
+            cls._seconds += seconds
+            cls._waits += 1
+            if timed_out:
+                cls._timeouts += 1
+        RunMetrics.inc("selenium_wait_seconds_total", seconds)
+        RunMetrics.inc("selenium_waits_total")
+        if timed_out:
+            RunMetrics.inc("selenium_wait_timeouts_total")
+    
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._seconds = 0.0
+            cls._waits = 0
+            cls._timeouts = 0
+    
+    @classmethod
+    def snapshot(cls) -> Dict[str, float]:
+        with cls._lock:
+            return {"seconds": cls._seconds, "waits": cls._waits, "timeouts": cls._timeouts}
\ No newline at end of file
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import threading
+import weakref
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+from config.config import TestConfig
+from utils.emulation_profiles import EmulationProfiles
+
+
+_OBSERVER_SCRIPT = """
+(function() {
+    if (window.__pageMetrics) { return; }
+    var metrics = {lcp: null, lcpSize: null, cls: 0, longTasks: 0, longTaskTime: 0, blockingTime: 0};
+    window.__pageMetrics = metrics;
+    if (typeof PerformanceObserver === 'undefined') { return; }
+    var supported = PerformanceObserver.supportedEntryTypes || [];
+    metrics.supported = supported;
+    
+    function observe(type, callback) {
+        if (supported.indexOf(type) === -1) { return; }
+        try {
+            new PerformanceObserver(function(list) { list.getEntries().forEach(callback); })
+                .observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+    
+    observe('largest-contentful-paint', function(entry) {
+        metrics.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+        metrics.lcpSize = entry.size;
+    });
+    observe('layout-shift', function(entry) {
+        if (!entry.hadRecentInput) { metrics.cls += entry.value; }
+    });
+    observe('longtask', function(entry) {
+        metrics.longTasks += 1;
+        metrics.longTaskTime += entry.duration;
+        metrics.blockingTime += Math.max(0, entry.duration - 50);
+    });
+})();
+"""
+
+_COLLECT_SCRIPT = _OBSERVER_SCRIPT + """
+var metrics = window.__pageMetrics;
+var supported = metrics.supported || [];
+var nav = performance.getEntriesByType('navigation')[0];
+var paints = {};
+performance.getEntriesByType('paint').forEach(function(entry) { paints[entry.name] = entry.startTime; });
+
+var resources = performance.getEntriesByType('resource');
+var byType = {};
+var transfer = 0;
+resources.forEach(function(entry) {
+    var type = entry.initiatorType || 'other';
+    if (!byType[type]) { byType[type] = {count: 0, transfer_size: 0, duration: 0}; }
+    byType[type].count += 1;
+    byType[type].transfer_size += entry.transferSize || 0;
+    byType[type].duration += entry.duration;
+    transfer += entry.transferSize || 0;
+});
+var slowest = resources.slice().sort(function(a, b) { return b.duration - a.duration; })
+    .slice(0, arguments[0]).map(function(entry) {
+        return {name: entry.name, type: entry.initiatorType, duration: entry.duration,
+                transfer_size: entry.transferSize || 0};
+    });
+
+function supports(type) { return supported.indexOf(type) !== -1; }
+
+return {
+    navigation: nav ? {
+        type: nav.type,
+        dns: nav.domainLookupEnd - nav.domainLookupStart,
+        connect: nav.connectEnd - nav.connectStart,
+        ttfb: nav.responseStart,
+        response_end: nav.responseEnd,
+        dom_interactive: nav.domInteractive,
+        dom_content_loaded: nav.domContentLoadedEventEnd,
+        load_event_end: nav.loadEventEnd,
+        transfer_size: nav.transferSize || 0,
+        decoded_body_size: nav.decodedBodySize || 0
+    } : null,
+    first_paint: paints['first-paint'] === undefined ? null : paints['first-paint'],
+    first_contentful_paint: paints['first-contentful-paint'] === undefined ? null : paints['first-contentful-paint'],
+    largest_contentful_paint: supports('largest-contentful-paint') ? metrics.lcp : null,
+    largest_contentful_paint_size: supports('largest-contentful-paint') ? metrics.lcpSize : null,
+    cumulative_layout_shift: supports('layout-shift') ? metrics.cls : null,
+    long_tasks: supports('longtask') ? {
+        count: metrics.longTasks,
+        total_duration: metrics.longTaskTime,
+        total_blocking_time: metrics.blockingTime
+    } : null,
+    resources: {
+        count: resources.length,
+        transfer_size: transfer,
+        by_type: byType,
+        slowest: slowest
+    }
+};
+"""
+
+
+class WebVitals:
+    """Browser-side navigation timing and web-vitals capture.
+    
+    All times are milliseconds relative to the navigation start as reported
+    by the browser itself, so they exclude WebDriver round-trips. Metrics
+    a browser does not support are reported as None rather than 0 to keep
+    cross-browser comparisons honest.
+    """
+    
+    SLOWEST_RESOURCES = 10
+    
+    _prepared_drivers = weakref.WeakSet()
+    
+    @staticmethod
+    def prepare(driver) -> bool:
+        # On Chromium the observers are registered before any page script
+        # runs; elsewhere they are installed lazily with buffered entries.
+        if driver in WebVitals._prepared_drivers:
+            return True
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return False
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _OBSERVER_SCRIPT})
+            WebVitals._prepared_drivers.add(driver)
+            return True
+        except WebDriverException:
+            return False
+    
+    @staticmethod
+    def capture(driver) -> Optional[Dict[str, Any]]:
+        try:
+            metrics = driver.execute_script(_COLLECT_SCRIPT, WebVitals.SLOWEST_RESOURCES)
+            url = driver.current_url
+        except WebDriverException as e:
+            print(f"Could not capture page metrics: {e}")
+            return None
+        
+        capabilities = getattr(driver, "capabilities", {}) or {}
+        return {
+            "url": url,
+            "captured_at": datetime.now().isoformat(),
+            "browser": capabilities.get("browserName", "unknown"),
+            "browser_version": capabilities.get("browserVersion", ""),
+            "emulation_profile": EmulationProfiles.active_profile(driver),
+            "metrics": metrics,
+        }
+
+
+class PageMetricsStore:
+    """Collects page metrics for the running test and writes them per test."""
+    
+    _lock = threading.Lock()
+    _current_test: Optional[str] = None
+    _entries: List[Dict[str, Any]] = []
+    
+    @staticmethod
+    def metrics_dir() -> str:
+        return os.path.join(TestConfig.REPORTS_DIR, "page_metrics")
+    
+    @classmethod
+    def begin_test(cls, test_id: str) -> None:
+        with cls._lock:
+            cls._current_test = test_id
+            cls._entries = []
+    
+    @classmethod
+    def record(cls, entry: Dict[str, Any]) -> None:
+        with cls._lock:
+            entry = dict(entry, test=cls._current_test)
+            cls._entries.append(entry)
+    
+    @classmethod
+    def entries(cls) -> List[Dict[str, Any]]:
+        with cls._lock:
+            return list(cls._entries)
+    
+    @classmethod
+    def end_test(cls) -> Optional[str]:
+        with cls._lock:
+            test_id, entries = cls._current_test, cls._entries
+            cls._current_test = None
+            cls._entries = []
+        
+        if not test_id or not entries:
+            return None
+        
+        os.makedirs(cls.metrics_dir(), exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9_.\-\[\]]+", "_", test_id)
+        filepath = os.path.join(cls.metrics_dir(), f"{safe_name}.json")
+        with open(filepath, "w") as file:
+            json.dump({"test": test_id, "navigations": entries}, file, indent=2)
+        return filepath
\ No newline at end of file